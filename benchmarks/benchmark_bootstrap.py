@@ -0,0 +1,91 @@
+"""
+Benchmark: Bootstrap Confidence Intervals
+
+Times percentile bootstrap CIs (accuracy, TPCA, overrun rate) and a paired
+condition comparison over synthetic per-case rows, default 10k resamples
+over 1M cases. Requires NumPy.
+
+It does NOT require an ML model. Rows are synthetic.
+
+Author: Robbie George
+Governed by MRD v1.8 and ACR.
+
+Run from the repository root:
+  python -m benchmarks.benchmark_bootstrap --cases 1000000 --resamples 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+
+import numpy as np
+
+from src.razor.bootstrap import bootstrap_ci, metric_columns, paired_bootstrap
+
+
+def generate_columns(num_cases: int, seed: int):
+    """
+    Baseline rows plus a treatment that fixes ~10% of answers and trims tokens.
+    """
+    rng = np.random.default_rng(seed)
+    correct = rng.random(num_cases) < 0.7
+    tokens = rng.integers(1, 200, num_cases)
+    targets = [None if x < 0.3 else 64 for x in rng.random(num_cases)]
+
+    fixed = correct | (rng.random(num_cases) < 0.1)
+    trimmed = np.maximum(1, tokens - rng.integers(0, 3, num_cases))
+    return metric_columns(correct, tokens, targets), metric_columns(fixed, trimmed, targets)
+
+
+def run_benchmark(num_cases: int, resamples: int, seed: int) -> dict:
+    baseline, treatment = generate_columns(num_cases, seed)
+
+    t0 = time.perf_counter()
+    ci = bootstrap_ci(baseline, resamples, seed=seed)
+    ci_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    paired = paired_bootstrap(baseline, treatment, resamples, seed=seed)
+    paired_s = time.perf_counter() - t0
+
+    return {
+        "num_cases": num_cases,
+        "resamples": resamples,
+        "ci_seconds": ci_s,
+        "paired_seconds": paired_s,
+        "confidence_intervals": ci,
+        "paired_differences": paired,
+    }
+
+
+def print_report(r: dict) -> None:
+    print("\n=== Razor Bootstrap Benchmark ===\n")
+    print(f"Cases:                    {r['num_cases']}")
+    print(f"Resamples:                {r['resamples']}\n")
+    print(f"CI time (s):              {r['ci_seconds']:.2f}")
+    print(f"Paired time (s):          {r['paired_seconds']:.2f}\n")
+    acc = r["confidence_intervals"]["accuracy"]
+    diff = r["paired_differences"]["accuracy"]
+    print(f"Accuracy:                 {acc['estimate']:.4f} [{acc['low']:.4f}, {acc['high']:.4f}]")
+    print(f"Paired accuracy delta:    {diff['estimate']:+.4f} [{diff['low']:+.4f}, {diff['high']:+.4f}]\n")
+
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark vectorized bootstrap CIs.")
+    p.add_argument("--cases", type=int, default=1_000_000)
+    p.add_argument("--resamples", type=int, default=10_000)
+    p.add_argument("--seed", type=int, default=123)
+    p.add_argument("--json", action="store_true", help="Print results as JSON.")
+    args = p.parse_args()
+
+    r = run_benchmark(args.cases, args.resamples, args.seed)
+    if args.json:
+        print(json.dumps(r, indent=2))
+    else:
+        print_report(r)
+
+
+if __name__ == "__main__":
+    main()
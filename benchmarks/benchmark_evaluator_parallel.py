@@ -0,0 +1,121 @@
+"""
+Benchmark: Parallel Evaluator Scaling
+
+Grades a synthetic case set with evaluate_outputs at several worker counts
+(default 1 → 32) and reports throughput and speedup vs the serial path.
+Every parallel report is checked to be byte-identical to the serial one.
+
+It does NOT require an ML model. Cases and outputs are synthetic.
+
+Author: Robbie George
+Governed by MRD v1.8 and ACR.
+
+Run from the repository root:
+  python -m benchmarks.benchmark_evaluator_parallel --cases 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from typing import Dict, List, Tuple
+
+from benchmarks.evaluator import Case, evaluate_outputs
+
+_WORDS = ["alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel", "india", "juliet"]
+
+
+def generate_synthetic_set(num_cases: int, seed: int) -> Tuple[List[Case], Dict[str, str]]:
+    """
+    Mixed exact / contains / numeric cases with ~70% correct outputs.
+    """
+    rng = random.Random(seed)
+    cases: List[Case] = []
+    outputs: Dict[str, str] = {}
+    for i in range(num_cases):
+        cid = f"syn-{i:08d}"
+        mode = ("exact", "contains", "numeric")[i % 3]
+        if mode == "numeric":
+            answer = str(rng.randint(0, 10_000))
+            wrong = str(rng.randint(10_001, 20_000))
+            good, bad = f"The result is {answer}.", f"The result is {wrong}."
+        else:
+            answer = " ".join(rng.choice(_WORDS) for _ in range(2))
+            filler = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(5, 30)))
+            good = answer if mode == "exact" else f"{filler} {answer} {filler}"
+            bad = filler
+        cases.append(
+            Case(
+                id=cid,
+                category=mode.title(),
+                prompt=f"Synthetic prompt {i}",
+                acceptable_answers=[answer],
+                scoring_mode=mode,
+                target_max_tokens=rng.choice([None, 8, 32]),
+            )
+        )
+        outputs[cid] = good if rng.random() < 0.7 else bad
+    return cases, outputs
+
+
+def run_benchmark(num_cases: int, worker_counts: List[int], chunk_size: int, seed: int) -> dict:
+    cases, outputs = generate_synthetic_set(num_cases, seed)
+
+    rows = []
+    serial_bytes = None
+    serial_s = None
+    for workers in worker_counts:
+        t0 = time.perf_counter()
+        report = evaluate_outputs(cases, outputs, workers=workers, chunk_size=chunk_size)
+        elapsed = time.perf_counter() - t0
+
+        encoded = json.dumps(report, indent=2)
+        if serial_bytes is None:
+            serial_bytes, serial_s = encoded, elapsed
+        rows.append(
+            {
+                "workers": workers,
+                "seconds": elapsed,
+                "cases_per_sec": num_cases / elapsed if elapsed else 0.0,
+                "speedup": serial_s / elapsed if elapsed else 0.0,
+                "identical_to_first": encoded == serial_bytes,
+            }
+        )
+
+    return {"num_cases": num_cases, "chunk_size": chunk_size, "runs": rows}
+
+
+def print_report(r: dict) -> None:
+    print("\n=== Razor Evaluator Parallel Scaling ===\n")
+    print(f"Cases:                    {r['num_cases']}")
+    print(f"Chunk size:               {r['chunk_size']}\n")
+    print(f"{'workers':>8} {'seconds':>10} {'cases/sec':>12} {'speedup':>8} {'identical':>10}")
+    for row in r["runs"]:
+        print(
+            f"{row['workers']:>8} {row['seconds']:>10.2f} {row['cases_per_sec']:>12,.0f} "
+            f"{row['speedup']:>8.2f} {str(row['identical_to_first']):>10}"
+        )
+    print()
+
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark evaluator scaling over a process pool.")
+    p.add_argument("--cases", type=int, default=1_000_000)
+    p.add_argument("--workers", default="1,2,4,8,16,32", help="Comma-separated worker counts (first is the reference).")
+    p.add_argument("--chunk-size", type=int, default=4096)
+    p.add_argument("--seed", type=int, default=123)
+    p.add_argument("--json", action="store_true", help="Print results as JSON.")
+    args = p.parse_args()
+
+    worker_counts = [int(w) for w in args.workers.split(",") if w.strip()]
+    r = run_benchmark(args.cases, worker_counts, args.chunk_size, args.seed)
+    if args.json:
+        print(json.dumps(r, indent=2))
+    else:
+        print_report(r)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,344 @@
+"""
+Benchmark: Evaluator Scaling Suite
+
+Generates synthetic cases and outputs at several sizes (default 1k → 1M;
+10M is supported) and measures, per size:
+- tokenization throughput (TokenCounter batches over outputs + prompts)
+- grading throughput (compiled grading plans, cold plan cache)
+- end-to-end evaluation throughput (grade_chunk + summary accumulation)
+- report-write time and size: streamed JSONL at every size; indented JSON
+  and columnar for sizes up to --max-report-cases (rows held in memory)
+- peak RSS (each size runs in a fresh process unless --no-isolate)
+
+The case mix (exact / contains / numeric), answers per case and share of
+correct outputs are configurable; use --answers 128-256 to exercise the
+Aho–Corasick path for contains cases. Generators are lazy, so memory is
+bounded by the chunk size unless report rows are retained.
+
+It does NOT require an ML model. Cases and outputs are synthetic.
+Use --out to write the machine-readable results for regression tracking.
+
+Author: Robbie George
+Governed by MRD v1.8 and ACR.
+
+Run from the repository root:
+  python -m benchmarks.benchmark_evaluator_scaling --sizes 1000,10000,100000,1000000,10000000 --out scaling.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import json
+import multiprocessing
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate, islice
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import resource  # Unix only
+except ImportError:  # pragma: no cover
+    resource = None
+
+from benchmarks.evaluator import (
+    REPORT_FORMATS,
+    REPORT_SUFFIXES,
+    Case,
+    PlanCache,
+    SummaryAccumulator,
+    grade_chunk,
+    write_report,
+)
+from src.razor.tokenizer import TokenCounter
+
+MODES = ("exact", "contains", "numeric")
+_WORDS = ["alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel", "india", "juliet"]
+# Disjoint from _WORDS, so filler never contains an answer by accident.
+_FILLER = ["kilo", "lima", "mike", "november", "oscar", "papa", "quebec", "romeo", "sierra", "tango"]
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """
+    "exact=1,contains=2,numeric=1" -> relative weights per scoring mode.
+    """
+    mix: Dict[str, float] = {}
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        mode, _, weight = part.partition("=")
+        mode = mode.strip()
+        if mode not in MODES:
+            raise ValueError(f"unknown scoring mode in mix: {mode!r}")
+        mix[mode] = float(weight) if weight else 1.0
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError("mix needs at least one positive weight")
+    return mix
+
+
+def parse_range(spec: str) -> Tuple[int, int]:
+    """
+    "3" -> (3, 3); "1-4" -> (1, 4).
+    """
+    lo, _, hi = spec.partition("-")
+    lo_n, hi_n = int(lo), int(hi or lo)
+    if lo_n < 1 or hi_n < lo_n:
+        raise ValueError(f"invalid answer-count range: {spec!r}")
+    return lo_n, hi_n
+
+
+def _phrase(rng: random.Random, j: int) -> str:
+    base = f"{rng.choice(_WORDS)} {rng.choice(_WORDS)}"
+    return base if j == 0 else f"{base} {j}"
+
+
+def generate_cases(
+    num_cases: int,
+    mix: Dict[str, float],
+    answers: Tuple[int, int] = (1, 1),
+    seed: int = 0,
+) -> Iterator[Case]:
+    """
+    Lazily generate `num_cases` cases with scoring modes drawn from `mix`
+    and a uniform number of acceptable answers in the `answers` range.
+    """
+    rng = random.Random(seed)
+    modes = list(mix)
+    cumulative = list(accumulate(mix[m] for m in modes))
+    total = cumulative[-1]
+    for i in range(num_cases):
+        mode = modes[bisect.bisect_right(cumulative, rng.random() * total)]
+        k = rng.randint(*answers)
+        if mode == "numeric":
+            acceptable = [str(rng.randint(0, 10_000) + 10_001 * j) for j in range(k)]
+        else:
+            acceptable = [_phrase(rng, j) for j in range(k)]
+        yield Case(
+            id=f"syn-{i:08d}",
+            category=mode.title(),
+            prompt=f"Synthetic prompt {i}: " + " ".join(rng.choice(_WORDS) for _ in range(rng.randint(4, 24))),
+            acceptable_answers=acceptable,
+            scoring_mode=mode,
+            target_max_tokens=rng.choice([None, 8, 32, 128]),
+        )
+
+
+def generate_output(case: Case, correct: bool, rng: random.Random) -> str:
+    """
+    A model-like output for `case` that grades as `correct`.
+    """
+    answer = rng.choice(case.acceptable_answers)
+    if case.scoring_mode == "numeric":
+        return f"The result is {answer if correct else -1 - rng.randint(0, 10_000)}."
+    filler = " ".join(rng.choice(_FILLER) for _ in range(rng.randint(5, 30)))
+    if not correct:
+        return filler
+    return answer if case.scoring_mode == "exact" else f"{filler} {answer} {filler}"
+
+
+def generate_pairs(
+    num_cases: int,
+    mix: Dict[str, float],
+    answers: Tuple[int, int] = (1, 1),
+    correct_share: float = 0.7,
+    seed: int = 0,
+) -> Iterator[Tuple[Case, str]]:
+    rng = random.Random(seed + 1)
+    for case in generate_cases(num_cases, mix, answers, seed):
+        yield case, generate_output(case, rng.random() < correct_share, rng)
+
+
+def peak_rss_bytes() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # macOS reports bytes, Linux KiB
+
+
+def _per_sec(count: float, seconds: float) -> float:
+    return count / seconds if seconds else 0.0
+
+
+def measure_size(num_cases: int, config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    One size of the suite. Each stage gets a cold TokenCounter / PlanCache
+    so stages do not warm each other.
+    """
+    model = config["model"]
+    tokenize_counter = TokenCounter.for_model(model)
+    grade_plans = PlanCache()
+    counter = TokenCounter.for_model(model)
+    plans = PlanCache()
+    acc = SummaryAccumulator(model=model)
+    retain = num_cases <= config["max_report_cases"]
+    results: List[Dict[str, Any]] = []
+    seconds = dict.fromkeys(("generate", "tokenize", "grade", "evaluate", "jsonl_write"), 0.0)
+    texts = tokens = 0
+
+    pairs = generate_pairs(num_cases, config["mix"], config["answers"], config["correct_share"], config["seed"])
+    with tempfile.TemporaryDirectory() as tmp:
+        jsonl_path = os.path.join(tmp, "report.jsonl")
+        with open(jsonl_path, "w", encoding="utf-8") as jsonl:
+            while True:
+                t0 = time.perf_counter()
+                chunk = list(islice(pairs, config["chunk_size"]))
+                t1 = time.perf_counter()
+                seconds["generate"] += t1 - t0
+                if not chunk:
+                    break
+
+                batch = [out for _, out in chunk] + [case.prompt for case, _ in chunk]
+                counts = tokenize_counter.count_batch(batch)
+                t2 = time.perf_counter()
+                for case, out in chunk:
+                    grade_plans.get(case).grade(out)
+                t3 = time.perf_counter()
+                graded = grade_chunk(chunk, counter, plans)
+                for row, prompt_tokens in graded:
+                    acc.add(row, prompt_tokens)
+                t4 = time.perf_counter()
+                jsonl.write("".join(json.dumps(row) + "\n" for row, _ in graded))
+                t5 = time.perf_counter()
+
+                seconds["tokenize"] += t2 - t1
+                seconds["grade"] += t3 - t2
+                seconds["evaluate"] += t4 - t3
+                seconds["jsonl_write"] += t5 - t4
+                texts += len(batch)
+                tokens += sum(counts)
+                if retain:
+                    results.extend(row for row, _ in graded)
+
+            t0 = time.perf_counter()
+            summary = acc.summary()
+            seconds["evaluate"] += time.perf_counter() - t0
+            jsonl.write(json.dumps({"summary": summary}) + "\n")
+        reports: Dict[str, Optional[Dict[str, Any]]] = {
+            "jsonl": {"seconds": seconds["jsonl_write"], "bytes": os.path.getsize(jsonl_path)},
+        }
+
+        for fmt in config["report_formats"]:
+            if not retain:
+                reports[fmt] = None
+                continue
+            path = os.path.join(tmp, f"report{REPORT_SUFFIXES[fmt]}")
+            t0 = time.perf_counter()
+            write_report({"summary": summary, "results": results}, path, fmt)
+            reports[fmt] = {"seconds": time.perf_counter() - t0, "bytes": os.path.getsize(path)}
+
+    rss = peak_rss_bytes()
+    return {
+        "cases": num_cases,
+        "generate_s": seconds["generate"],
+        "tokenize_s": seconds["tokenize"],
+        "texts_per_sec": _per_sec(texts, seconds["tokenize"]),
+        "tokens_per_sec": _per_sec(tokens, seconds["tokenize"]),
+        "grade_s": seconds["grade"],
+        "grade_cases_per_sec": _per_sec(num_cases, seconds["grade"]),
+        "evaluate_s": seconds["evaluate"],
+        "evaluate_cases_per_sec": _per_sec(num_cases, seconds["evaluate"]),
+        "rows_retained": retain,
+        "reports": reports,
+        "peak_rss_mb": rss / 2 ** 20 if rss is not None else None,
+        "accuracy": summary["accuracy"],
+        "tpca": summary["tpca"],
+    }
+
+
+def run_benchmark(sizes: List[int], config: Dict[str, Any], isolate: bool = True) -> dict:
+    runs = []
+    for n in sizes:
+        if isolate:
+            # A fresh interpreter per size keeps peak RSS attributable to that size.
+            ctx = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+                runs.append(pool.submit(measure_size, n, config).result())
+        else:
+            runs.append(measure_size(n, config))
+
+    return {
+        "benchmark": "evaluator_scaling",
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "tokenizer": TokenCounter.for_model(config["model"]).identity,
+        },
+        "config": {**config, "answers": list(config["answers"]), "isolated": isolate},
+        "runs": runs,
+    }
+
+
+def print_report(r: dict) -> None:
+    c = r["config"]
+    print("\n=== Razor Evaluator Scaling Suite ===\n")
+    print(f"Tokenizer:                {r['environment']['tokenizer']}")
+    print(f"Mode mix:                 {', '.join(f'{m}={w:g}' for m, w in c['mix'].items())}")
+    print(f"Answers per case:         {c['answers'][0]}-{c['answers'][1]}")
+    print(f"Correct share:            {c['correct_share']:.0%}\n")
+    print(
+        f"{'cases':>10} {'tok texts/s':>12} {'grade/s':>11} {'eval/s':>11} "
+        f"{'jsonl s':>8} {'json s':>8} {'colum s':>8} {'RSS MB':>8}"
+    )
+
+    def secs(report: Optional[Dict[str, Any]]) -> str:
+        return f"{report['seconds']:>8.2f}" if report else f"{'-':>8}"
+
+    for run in r["runs"]:
+        reports = run["reports"]
+        rss = f"{run['peak_rss_mb']:>8.0f}" if run["peak_rss_mb"] is not None else f"{'-':>8}"
+        print(
+            f"{run['cases']:>10} {run['texts_per_sec']:>12,.0f} {run['grade_cases_per_sec']:>11,.0f} "
+            f"{run['evaluate_cases_per_sec']:>11,.0f} {secs(reports['jsonl'])} "
+            f"{secs(reports.get('json'))} {secs(reports.get('columnar'))} {rss}"
+        )
+    print(f"\nJSON / columnar reports are written only up to {c['max_report_cases']:,} cases.\n")
+
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark evaluator throughput, memory and report writes by size.")
+    p.add_argument("--sizes", default="1000,10000,100000,1000000", help="Comma-separated case counts.")
+    p.add_argument("--mix", default="exact=1,contains=1,numeric=1", help="Relative weights per scoring mode.")
+    p.add_argument("--answers", default="1", help="Acceptable answers per case: N or MIN-MAX.")
+    p.add_argument("--correct-share", type=float, default=0.7)
+    p.add_argument("--chunk-size", type=int, default=4096)
+    p.add_argument("--model", default="gpt-4", help="Tokenizer model name (tiktoken) if available.")
+    p.add_argument("--report-formats", default="json,columnar", help="In-memory report formats to time.")
+    p.add_argument("--max-report-cases", type=int, default=1_000_000, help="Largest size that retains rows.")
+    p.add_argument("--no-isolate", action="store_true", help="Run every size in this process.")
+    p.add_argument("--seed", type=int, default=123)
+    p.add_argument("--out", default=None, help="Also write the JSON results to this path.")
+    p.add_argument("--json", action="store_true", help="Print results as JSON.")
+    args = p.parse_args()
+
+    config = {
+        "mix": parse_mix(args.mix),
+        "answers": parse_range(args.answers),
+        "correct_share": args.correct_share,
+        "chunk_size": args.chunk_size,
+        "model": args.model,
+        "report_formats": [f.strip() for f in args.report_formats.split(",") if f.strip()],
+        "max_report_cases": args.max_report_cases,
+        "seed": args.seed,
+    }
+    unknown = set(config["report_formats"]) - set(REPORT_FORMATS)
+    if unknown:
+        p.error(f"unknown report formats: {', '.join(sorted(unknown))}")
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    r = run_benchmark(sizes, config, isolate=not args.no_isolate)
+    if args.out:
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(r, f, indent=2)
+    if args.json:
+        print(json.dumps(r, indent=2))
+    else:
+        print_report(r)
+
+
+if __name__ == "__main__":
+    main()
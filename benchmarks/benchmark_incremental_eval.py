@@ -0,0 +1,105 @@
+"""
+Benchmark: Incremental Re-evaluation
+
+Grades a synthetic case set once into a fresh result cache, changes a
+fraction of the outputs (default 1%), and compares:
+- a full regrade without the cache
+- a rerun that loads the cache from disk and regrades only changed pairs
+
+Both reruns must produce the same report.
+
+It does NOT require an ML model. Cases and outputs are synthetic.
+
+Author: Robbie George
+Governed by MRD v1.8 and ACR.
+
+Run from the repository root:
+  python -m benchmarks.benchmark_incremental_eval --cases 1000000 --changed 0.01
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.benchmark_evaluator_parallel import generate_synthetic_set
+from benchmarks.evaluator import ResultCache, evaluate_outputs
+
+
+def run_benchmark(num_cases: int, changed_share: float, seed: int) -> dict:
+    cases, outputs = generate_synthetic_set(num_cases, seed)
+    rng = random.Random(seed + 1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "results.bin")
+
+        t0 = time.perf_counter()
+        cache = ResultCache(path)
+        evaluate_outputs(cases, outputs, result_cache=cache)
+        cache.save()
+        cold_s = time.perf_counter() - t0
+        cache_bytes = os.path.getsize(path)
+
+        changed = dict(outputs)
+        for case in rng.sample(cases, int(num_cases * changed_share)):
+            changed[case.id] = changed[case.id] + " (revised)"
+
+        t0 = time.perf_counter()
+        full = evaluate_outputs(cases, changed)
+        full_s = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        cache = ResultCache(path)
+        incremental = evaluate_outputs(cases, changed, result_cache=cache)
+        cache.save()
+        incremental_s = time.perf_counter() - t0
+
+    stats = cache.get_stats()
+    return {
+        "num_cases": num_cases,
+        "changed_share": changed_share,
+        "cold_seconds": cold_s,
+        "full_rerun_seconds": full_s,
+        "incremental_rerun_seconds": incremental_s,
+        "speedup": full_s / incremental_s if incremental_s else 0.0,
+        "regraded": stats["misses"],
+        "reused": stats["hits"],
+        "cache_bytes": cache_bytes,
+        "identical": full == incremental,
+    }
+
+
+def print_report(r: dict) -> None:
+    print("\n=== Razor Incremental Re-evaluation Benchmark ===\n")
+    print(f"Cases:                    {r['num_cases']}")
+    print(f"Changed share:            {r['changed_share']:.1%}\n")
+    print(f"Cold run + cache (s):     {r['cold_seconds']:.2f}")
+    print(f"Full rerun (s):           {r['full_rerun_seconds']:.2f}")
+    print(f"Incremental rerun (s):    {r['incremental_rerun_seconds']:.2f}")
+    print(f"Speedup:                  {r['speedup']:.2f}x")
+    print(f"Regraded / reused:        {r['regraded']} / {r['reused']}")
+    print(f"Cache size (bytes):       {r['cache_bytes']:,}")
+    print(f"Reports identical:        {r['identical']}\n")
+
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark cached re-evaluation after a partial change.")
+    p.add_argument("--cases", type=int, default=1_000_000)
+    p.add_argument("--changed", type=float, default=0.01, help="Share of outputs changed before the rerun.")
+    p.add_argument("--seed", type=int, default=123)
+    p.add_argument("--json", action="store_true", help="Print results as JSON.")
+    args = p.parse_args()
+
+    r = run_benchmark(args.cases, args.changed, args.seed)
+    if args.json:
+        print(json.dumps(r, indent=2))
+    else:
+        print_report(r)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""
+Benchmark: RazorMemoryBank Operations (wall clock)
+
+benchmark_memory_gate_savings simulates what a memory hit saves; this
+measures what the gate itself costs, per operation, at capacities from
+1k to 10M entries:
+- hit     retrieve() of a stored query
+- miss    retrieve() of an unknown query
+- store   store() refreshing a stored query (moves it to most recent)
+- evict   store() of a new query into a full bank (insert + LRU eviction)
+
+Each operation gets a warmup, then --trials trials of --ops calls. Every
+trial times the whole batch (mean ns/op, reported as the median over
+trials) and then times each call on fresh keys with perf_counter_ns
+(p50 / p95 / p99 / max, timer overhead reported separately). Keys are
+built before timing; SHA-256 hashing of the query is part of every
+operation, as in production. Memory per entry is the tracemalloc
+footprint of filling the bank, taken in a separate untimed phase.
+
+The costs are compared with the assumed inference cost: the break-even
+hit rate is the share of hits at which the gate pays for its own misses.
+
+Author: Robbie George
+Governed by MRD v1.8 and ACR.
+
+Run from the repository root:
+  python -m benchmarks.benchmark_memory_bank_ops --capacities 1000,10000,100000,1000000,10000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Sequence
+
+from src.razor.memory_bank import RazorMemoryBank
+
+OPERATIONS = ("hit", "miss", "store", "evict")
+_CONFIDENCE = 0.99
+
+
+def percentile(sorted_samples: Sequence[int], q: float) -> int:
+    """
+    Nearest-rank percentile (q in [0, 100]) of ascending samples.
+    """
+    if not sorted_samples:
+        return 0
+    rank = max(1, -(-len(sorted_samples) * q // 100))
+    return sorted_samples[int(min(rank, len(sorted_samples))) - 1]
+
+
+def timer_overhead_ns(samples: int = 100_000) -> int:
+    """
+    Median cost of one back-to-back perf_counter_ns pair.
+    """
+    clock = time.perf_counter_ns
+    out = []
+    for _ in range(samples):
+        t0 = clock()
+        out.append(clock() - t0)
+    out.sort()
+    return out[len(out) // 2]
+
+
+def _batch_ns(fn: Callable[[str], Any], keys: Sequence[str]) -> int:
+    clock = time.perf_counter_ns
+    t0 = clock()
+    for k in keys:
+        fn(k)
+    return clock() - t0
+
+
+def _per_call_ns(fn: Callable[[str], Any], keys: Sequence[str]) -> List[int]:
+    clock = time.perf_counter_ns
+    samples = []
+    append = samples.append
+    for k in keys:
+        t0 = clock()
+        fn(k)
+        append(clock() - t0)
+    return samples
+
+
+def fill_bank(capacity: int) -> RazorMemoryBank:
+    bank = RazorMemoryBank(capacity=capacity, stability_threshold=0.95)
+    for i in range(capacity):
+        bank.store(f"query_{i}", "OK", _CONFIDENCE)
+    return bank
+
+
+def measure_capacity(capacity: int, config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Timings and memory for one bank capacity.
+    """
+    ops, warmup, trials = config["ops"], config["warmup"], config["trials"]
+    rng = random.Random(config["seed"])
+
+    memory = None
+    t0 = time.perf_counter()
+    if config["memory"]:
+        tracemalloc.start()
+        bank = fill_bank(capacity)
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        memory = {"bytes": current, "peak_bytes": peak, "bytes_per_entry": current / capacity}
+    else:
+        bank = fill_bank(capacity)
+    fill_s = time.perf_counter() - t0
+
+    # Two key sets per trial: one for the batch timing, one for per-call timing.
+    calls = warmup + 2 * ops * trials
+    stored = [f"query_{rng.randrange(capacity)}" for _ in range(calls)]
+    missing = [f"miss_{i}" for i in range(calls)]
+    fresh = [f"new_{i}" for i in range(calls)]
+    sources = {
+        "hit": (bank.retrieve, stored),
+        "miss": (bank.retrieve, missing),
+        "store": (lambda q: bank.store(q, "OK", _CONFIDENCE), stored),
+        "evict": (lambda q: bank.store(q, "OK", _CONFIDENCE), fresh),  # last: it replaces entries
+    }
+
+    results: Dict[str, Any] = {}
+    for name in OPERATIONS:
+        fn, keys = sources[name]
+        _batch_ns(fn, keys[:warmup])
+        means: List[float] = []
+        samples: List[int] = []
+        pos = warmup
+        for _ in range(trials):
+            means.append(_batch_ns(fn, keys[pos:pos + ops]) / ops)
+            samples.extend(_per_call_ns(fn, keys[pos + ops:pos + 2 * ops]))
+            pos += 2 * ops
+        samples.sort()
+        means.sort()
+        results[name] = {
+            "mean_ns": means[len(means) // 2],
+            "trial_mean_ns": means,
+            "p50_ns": percentile(samples, 50),
+            "p95_ns": percentile(samples, 95),
+            "p99_ns": percentile(samples, 99),
+            "max_ns": samples[-1],
+        }
+
+    # Gate cost on a miss: failed lookup plus storing the new result.
+    miss_path_ns = results["miss"]["mean_ns"] + results["evict"]["mean_ns"]
+    inference_ns = config["ms_per_inference"] * 1e6
+    hit_ns = results["hit"]["mean_ns"]
+    return {
+        "capacity": capacity,
+        "size": bank.get_stats()["size"],
+        "fill_seconds": fill_s,
+        "memory": memory,
+        "operations": results,
+        "miss_path_ns": miss_path_ns,
+        "hit_share_of_inference": hit_ns / inference_ns,
+        "miss_path_share_of_inference": miss_path_ns / inference_ns,
+        # h * hit + (1 - h) * (miss path + inference) = inference
+        "break_even_hit_rate": miss_path_ns / (inference_ns + miss_path_ns - hit_ns),
+    }
+
+
+def run_benchmark(capacities: Sequence[int], config: Dict[str, Any]) -> dict:
+    return {
+        "benchmark": "memory_bank_ops",
+        "config": dict(config),
+        "timer_overhead_ns": timer_overhead_ns(),
+        "runs": [measure_capacity(c, config) for c in capacities],
+    }
+
+
+def print_report(r: dict) -> None:
+    c = r["config"]
+    print("\n=== Razor Memory Bank Operation Costs ===\n")
+    print(f"Ops per trial:            {c['ops']} x {c['trials']} trials (warmup {c['warmup']})")
+    print(f"Timer overhead:           {r['timer_overhead_ns']} ns (included in percentiles)")
+    print(f"Assumed inference:        {c['ms_per_inference']} ms\n")
+    print(f"{'capacity':>10} {'op':>6} {'mean ns':>9} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>10}")
+    for run in r["runs"]:
+        for name in OPERATIONS:
+            o = run["operations"][name]
+            print(
+                f"{run['capacity']:>10} {name:>6} {o['mean_ns']:>9,.0f} {o['p50_ns']:>8,} "
+                f"{o['p95_ns']:>8,} {o['p99_ns']:>8,} {o['max_ns']:>10,}"
+            )
+    print(f"\n{'capacity':>10} {'bytes/entry':>12} {'miss path':>12} {'vs inference':>13} {'break-even hit rate':>20}")
+    for run in r["runs"]:
+        mem = f"{run['memory']['bytes_per_entry']:>12,.0f}" if run["memory"] else f"{'-':>12}"
+        print(
+            f"{run['capacity']:>10} {mem} {run['miss_path_ns'] / 1e3:>10,.1f}us "
+            f"{run['miss_path_share_of_inference']:>13.5%} {run['break_even_hit_rate']:>20.5%}"
+        )
+    print()
+
+
+def main():
+    p = argparse.ArgumentParser(description="Measure wall-clock cost of RazorMemoryBank operations.")
+    p.add_argument("--capacities", default="1000,10000,100000,1000000", help="Comma-separated bank capacities.")
+    p.add_argument("--ops", type=int, default=10_000, help="Timed calls per trial.")
+    p.add_argument("--trials", type=int, default=5)
+    p.add_argument("--warmup", type=int, default=1_000)
+    p.add_argument("--ms-per-inference", type=float, default=600, help="Assumed inference cost to compare with.")
+    p.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc fill (faster at 10M).")
+    p.add_argument("--seed", type=int, default=123)
+    p.add_argument("--out", default=None, help="Also write the JSON results to this path.")
+    p.add_argument("--json", action="store_true", help="Print results as JSON.")
+    args = p.parse_args()
+
+    capacities = [int(x) for x in args.capacities.split(",") if x.strip()]
+    if not capacities or min(capacities) <= 0:
+        p.error("--capacities needs positive values")
+    if args.ops <= 0 or args.trials <= 0 or args.warmup < 0:
+        p.error("--ops and --trials must be > 0 and --warmup >= 0")
+    config = {
+        "ops": args.ops,
+        "trials": args.trials,
+        "warmup": args.warmup,
+        "ms_per_inference": args.ms_per_inference,
+        "memory": not args.no_memory,
+        "seed": args.seed,
+    }
+    r = run_benchmark(capacities, config)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(r, f, indent=2)
+    if args.json:
+        print(json.dumps(r, indent=2))
+    else:
+        print_report(r)
+
+
+if __name__ == "__main__":
+    main()
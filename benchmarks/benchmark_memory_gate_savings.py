@@ -7,6 +7,36 @@ before expensive inference.
 It does NOT require an ML model.
 It simulates "baseline" (always compute) vs "Razor" (memory hit short-circuits).
 
+Workloads:
+- uniform:      flat queries drawn uniformly from query_{i}
+- hierarchical: each parent query decomposes into `fanout` sub-queries drawn
+                from a shared pool; the Razor path runs through RazorController,
+                so shared sub-problems are memoized across parents
+- zipf, temporal, shift, scan, diurnal: skewed / bursty / drifting traffic
+                from src.razor.workloads (NumPy), see --alpha and friends
+- trace:        replay of a JSONL log such as a run's raw/attempts.jsonl
+
+--capacity-curve replaces the single run with a miss-ratio curve: one
+stack-distance pass (src.razor.mrc) gives the LRU hit rate, token savings and
+latency savings for every capacity (SHARDS sampling via --sample-rate).
+
+Latency per inference is the --cost-model estimate for
+--input-tokens-per-inference and --tokens-per-inference; --ms-per-inference
+overrides it.
+
+--queue replaces the constant per-inference latency accounting with a
+discrete-event simulation (src.razor.queueing): requests arrive at --rate,
+wait for one of --servers inference servers and take random service times
+averaging that latency; throughput and p50/p95/p99 latency are
+reported for baseline vs Razor on the same arrivals.
+
+--confidence draws a simulated verifier confidence per query (beta,
+bimodal or per-class; src.razor.confidence) instead of storing every result
+at 0.99, so --threshold decides what is admitted (in the default run,
+--capacity-curve and --queue alike). --threshold-sweep reports
+hit rate, admitted fraction and savings vs expected wrong memory answers for
+a grid of thresholds from one sort of the confidences.
+
 Author: Robbie George
 Governed by MRD v1.8 and ACR.
 
@@ -20,10 +50,26 @@ References:
 from __future__ import annotations
 
 import argparse
+import json
 import random
-from typing import List, Tuple
+import time
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
 
+from src.razor.controller import RazorController, SolveResult
+from src.razor.cost_model import CostModel
 from src.razor.memory_bank import RazorMemoryBank
+from src.razor import queueing, workloads
+from src.razor.confidence import (
+    CONFIDENCE_MODELS,
+    assign_confidences,
+    parse_classes,
+    threshold_grid,
+    threshold_sweep,
+)
+from src.razor.mrc import MissRatioCurve, capacity_grid, miss_ratio_curve, savings_curve
+
+# Confidence of the simulated verified results stored after each miss.
+SIMULATED_CONFIDENCE = 0.99
 
 
 def generate_workload(
@@ -41,6 +87,66 @@ def generate_workload(
     return [random.choice(base) for _ in range(total_queries)]
 
 
+def generate_hierarchical_workload(
+    total_queries: int,
+    unique_queries: int,
+    unique_subproblems: int,
+    fanout: int,
+    seed: int,
+) -> Tuple[List[str], Dict[str, List[str]]]:
+    """
+    Generate parent queries plus a fixed decomposition parent -> sub-queries.
+    - Each parent draws `fanout` distinct sub-queries from a shared pool.
+    - Lower unique_subproblems => more sharing between parents.
+    """
+    random.seed(seed)
+    parents = [f"query_{i}" for i in range(unique_queries)]
+    pool = [f"subquery_{j}" for j in range(unique_subproblems)]
+    k = min(fanout, unique_subproblems)
+    decomposition = {p: random.sample(pool, k) for p in parents}
+    workload = [random.choice(parents) for _ in range(total_queries)]
+    return workload, decomposition
+
+
+def build_workload_ids(args: argparse.Namespace) -> Tuple[Any, int]:
+    """
+    (query id array, unique query count) for a flat --workload from the workload library.
+    """
+    if args.workload == "trace":
+        if not args.trace:
+            raise SystemExit("--workload trace needs --trace PATH")
+        key = args.trace_key.split(",") if "," in args.trace_key else args.trace_key
+        trace = workloads.load_trace(args.trace, key=key)
+        # --total-queries 0 replays the trace once as recorded.
+        return trace.replay(args.total_queries or None), trace.unique
+
+    params = {
+        "zipf": {"alpha": args.alpha},
+        "temporal": {"reuse": args.reuse, "window": args.window, "alpha": args.alpha},
+        "shift": {
+            "working_set": args.working_set,
+            "phases": args.phases,
+            "overlap": args.overlap,
+            "alpha": args.alpha,
+        },
+        "scan": {"scan_length": args.scan_length, "scan_every": args.scan_every, "alpha": args.alpha},
+        "diurnal": {"period": args.period, "amplitude": args.amplitude, "alpha": args.alpha},
+    }[args.workload]
+    ids = workloads.generate(args.workload, args.total_queries, args.unique_queries, seed=args.seed, **params)
+    if args.workload == "scan":
+        # Scanned ids are numbered from unique upward, one per scanned request.
+        return ids, args.unique_queries + int((ids >= args.unique_queries).sum())
+    return ids, args.unique_queries
+
+
+def build_workload(args: argparse.Namespace) -> Tuple[List[str], int]:
+    """
+    (queries, unique query count) for a flat --workload from the workload library.
+    """
+    ids, unique = build_workload_ids(args)
+    return workloads.query_names(ids), unique
+
+
 def estimate_tokens_for_query(q: str) -> int:
     """
     Simple proxy: estimate token cost per query.
@@ -56,8 +162,11 @@ def run_benchmark(
     memory_capacity: int,
     stability_threshold: float,
     assumed_tokens_per_inference: int,
-    assumed_ms_per_inference: int,
+    assumed_ms_per_inference: float,
     seed: int,
+    workload: Optional[Sequence[str]] = None,
+    workload_name: str = "uniform",
+    confidences: Optional[Mapping[str, float]] = None,
 ) -> dict:
     """
     Baseline:
@@ -65,8 +174,13 @@ def run_benchmark(
     Razor:
       - If query is in memory with confidence >= threshold => skip inference.
       - Otherwise "compute" and store a high-confidence result (simulated).
+
+    `workload` replaces the uniform draw (e.g. from build_workload).
+    `confidences` gives each query's verifier confidence (default 0.99).
     """
-    workload = generate_workload(total_queries, unique_queries, seed=seed)
+    if workload is None:
+        workload = generate_workload(total_queries, unique_queries, seed=seed)
+    total_queries = len(workload)
 
     bank = RazorMemoryBank(capacity=memory_capacity, stability_threshold=stability_threshold)
 
@@ -99,8 +213,9 @@ def run_benchmark(
             razor_tokens += assumed_tokens_per_inference
             razor_ms += assumed_ms_per_inference
 
-            # Store simulated verified result with high confidence
-            bank.store(q, solution="OK", confidence=0.99)
+            # Store simulated verified result; the bank rejects it below the threshold
+            conf = confidences[q] if confidences is not None else SIMULATED_CONFIDENCE
+            bank.store(q, solution="OK", confidence=conf)
 
     hit_rate = memory_hits / total_queries if total_queries else 0.0
     avoided = baseline_inferences - razor_inferences
@@ -109,6 +224,7 @@ def run_benchmark(
     ms_savings = baseline_ms - razor_ms
 
     return {
+        "workload": workload_name,
         "total_queries": total_queries,
         "unique_queries": unique_queries,
         "memory_capacity": memory_capacity,
@@ -118,6 +234,7 @@ def run_benchmark(
         "inferences_avoided": avoided,
         "memory_hits": memory_hits,
         "memory_hit_rate": hit_rate,
+        "rejected_results": bank.get_stats()["rejected"],
         "assumed_tokens_per_inference": assumed_tokens_per_inference,
         "baseline_tokens": baseline_tokens,
         "razor_tokens": razor_tokens,
@@ -129,8 +246,348 @@ def run_benchmark(
     }
 
 
+def run_hierarchical_benchmark(
+    total_queries: int,
+    unique_queries: int,
+    unique_subproblems: int,
+    fanout: int,
+    memory_capacity: int,
+    stability_threshold: float,
+    assumed_tokens_per_inference: int,
+    assumed_ms_per_inference: float,
+    seed: int,
+) -> dict:
+    """
+    Baseline:
+      - Every parent request solves all of its sub-queries, then itself.
+    Razor:
+      - RazorController checks memory for the parent, then for each sub-query;
+        only misses reach the (simulated) solver.
+    """
+    workload, decomposition = generate_hierarchical_workload(
+        total_queries, unique_queries, unique_subproblems, fanout, seed=seed
+    )
+
+    bank = RazorMemoryBank(capacity=memory_capacity, stability_threshold=stability_threshold)
+    solver_calls = {"parent": 0, "subproblem": 0}
+
+    def solver(query, sub_results, cancel):
+        solver_calls["parent" if query in decomposition else "subproblem"] += 1
+        # Simulated verified result with high confidence
+        return SolveResult(solution="OK", confidence=0.99, tokens=assumed_tokens_per_inference)
+
+    controller = RazorController(
+        solver,
+        memory_bank=bank,
+        decomposer=lambda q: decomposition.get(q, []),
+    )
+
+    memory_hits = 0
+    subproblem_reuses = 0
+    graph_nodes = set()
+    for q in workload:
+        result = controller.run(q)
+        if result.from_memory:
+            memory_hits += 1
+        subproblem_reuses += result.phase_usage["recursion"]["reused"]
+        graph_nodes |= result.call_graph.nodes()
+
+    per_request = 1 + min(fanout, unique_subproblems)
+    baseline_inferences = total_queries * per_request
+    razor_inferences = solver_calls["parent"] + solver_calls["subproblem"]
+
+    baseline_tokens = baseline_inferences * assumed_tokens_per_inference
+    razor_tokens = razor_inferences * assumed_tokens_per_inference
+    baseline_ms = baseline_inferences * assumed_ms_per_inference
+    razor_ms = razor_inferences * assumed_ms_per_inference
+
+    return {
+        "workload": "hierarchical",
+        "total_queries": total_queries,
+        "unique_queries": unique_queries,
+        "unique_subproblems": unique_subproblems,
+        "fanout": fanout,
+        "memory_capacity": memory_capacity,
+        "stability_threshold": stability_threshold,
+        "baseline_inferences": baseline_inferences,
+        "razor_inferences": razor_inferences,
+        "parent_inferences": solver_calls["parent"],
+        "subproblem_inferences": solver_calls["subproblem"],
+        "inferences_avoided": baseline_inferences - razor_inferences,
+        "memory_hits": memory_hits,
+        "memory_hit_rate": memory_hits / total_queries if total_queries else 0.0,
+        "subproblem_reuses": subproblem_reuses,
+        "call_graph_nodes": len(graph_nodes),
+        "assumed_tokens_per_inference": assumed_tokens_per_inference,
+        "baseline_tokens": baseline_tokens,
+        "razor_tokens": razor_tokens,
+        "token_savings": baseline_tokens - razor_tokens,
+        "assumed_ms_per_inference": assumed_ms_per_inference,
+        "baseline_ms": baseline_ms,
+        "razor_ms": razor_ms,
+        "ms_savings": baseline_ms - razor_ms,
+    }
+
+
+def run_capacity_curve(
+    workload: Sequence[Any],
+    unique_queries: int,
+    stability_threshold: float,
+    assumed_tokens_per_inference: int,
+    assumed_ms_per_inference: float,
+    capacities: Optional[Sequence[int]] = None,
+    points: int = 24,
+    sample_rate: float = 1.0,
+    seed: int = 0,
+    workload_name: str = "uniform",
+    confidences: Optional[Mapping[Any, float]] = None,
+) -> dict:
+    """
+    run_benchmark's savings for every capacity from one stack-distance pass.
+    Exact (hit counts equal run_benchmark's) at sample_rate 1.0.
+
+    Queries below the threshold are never stored, so the bank is an LRU
+    over the admitted queries' requests: the curve comes from that
+    substream, and every rejected request is a miss at any capacity.
+    """
+    t0 = time.perf_counter()
+    admitted: Sequence[Any] = workload
+    if confidences is not None:
+        keys = workload.tolist() if hasattr(workload, "tolist") else workload
+        admitted = [q for q in keys if confidences[q] >= stability_threshold]
+    elif stability_threshold > SIMULATED_CONFIDENCE:
+        admitted = []
+    mrc = miss_ratio_curve(admitted, sample_rate=sample_rate, seed=seed)
+    rejected = len(workload) - len(admitted)
+    if rejected:
+        mrc = MissRatioCurve(len(workload), mrc.cold_misses + rejected, mrc.distances, mrc.counts, sample_rate)
+    elapsed = time.perf_counter() - t0
+    if capacities is None:
+        capacities = capacity_grid(max(mrc.max_useful_capacity, 1), points)
+    return {
+        "workload": workload_name,
+        "total_queries": len(workload),
+        "unique_queries": unique_queries,
+        "stability_threshold": stability_threshold,
+        "sample_rate": sample_rate,
+        "rejected_requests": rejected,
+        "analysis_seconds": elapsed,
+        "cold_misses": mrc.cold_misses,
+        "max_useful_capacity": mrc.max_useful_capacity,
+        "assumed_tokens_per_inference": assumed_tokens_per_inference,
+        "assumed_ms_per_inference": assumed_ms_per_inference,
+        "curve": savings_curve(mrc, capacities, assumed_tokens_per_inference, assumed_ms_per_inference),
+    }
+
+
+def print_capacity_curve(r: dict) -> None:
+    print("\n=== Razor Memory Gate Capacity Curve ===\n")
+    print(f"Workload:                 {r['workload']}")
+    print(f"Total queries:            {r['total_queries']}")
+    print(f"Unique queries:           {r['unique_queries']}")
+    print(f"Stability threshold:      {r['stability_threshold']}")
+    print(f"Rejected requests:        {r['rejected_requests']}")
+    print(f"Sample rate:              {r['sample_rate']:g}{'  (exact)' if r['sample_rate'] == 1.0 else '  (SHARDS)'}")
+    print(f"Analysis time:            {r['analysis_seconds']:.2f} s")
+    print(f"Capacity for max hits:    {r['max_useful_capacity']}\n")
+    print(f"{'capacity':>10} {'hit rate':>9} {'inferences':>12} {'token savings':>15} {'latency savings':>16}")
+    for row in r["curve"]:
+        print(
+            f"{row['memory_capacity']:>10} {row['memory_hit_rate']:>9.2%} {row['razor_inferences']:>12,.0f} "
+            f"{row['token_reduction']:>15.1%} {row['latency_reduction']:>16.1%}"
+        )
+    print()
+
+
+def run_queue_benchmark(
+    workload: Sequence[str],
+    unique_queries: int,
+    memory_capacity: int,
+    stability_threshold: float,
+    servers: int,
+    service_mean_ms: float,
+    rate_per_s: Optional[float] = None,
+    arrival: str = "poisson",
+    service: str = "exponential",
+    service_cv: float = 1.0,
+    gate_ms: float = 0.002,
+    burst_amplitude: float = 0.8,
+    burst_period_ms: float = 10_000.0,
+    seed: int = 123,
+    workload_name: str = "uniform",
+    confidences: Optional[Mapping[str, float]] = None,
+) -> dict:
+    """
+    Baseline vs Razor latency through a pool of `servers` inference servers.
+    rate_per_s defaults to 90% of the pool's capacity (offered load 0.9).
+    `confidences` gives each query's verifier confidence (default 0.99).
+    """
+    if rate_per_s is None:
+        rate_per_s = 0.9 * servers * 1000.0 / service_mean_ms
+    n = len(workload)
+    arrivals = queueing.arrival_times(
+        n, rate_per_s, arrival, seed=seed, burst_amplitude=burst_amplitude, burst_period_ms=burst_period_ms
+    )
+    service_ms = queueing.service_times(n, service_mean_ms, service, cv=service_cv, seed=seed)
+    bank = RazorMemoryBank(capacity=memory_capacity, stability_threshold=stability_threshold)
+    r = queueing.compare(workload, arrivals, service_ms, servers, bank, gate_ms, SIMULATED_CONFIDENCE, confidences)
+    return {
+        "workload": workload_name,
+        "total_queries": n,
+        "unique_queries": unique_queries,
+        "memory_capacity": memory_capacity,
+        "stability_threshold": stability_threshold,
+        "arrival": arrival,
+        "rate_per_s": rate_per_s,
+        "servers": servers,
+        "service": service,
+        "service_mean_ms": service_mean_ms,
+        "service_cv": service_cv if service == "lognormal" else None,
+        "gate_ms": gate_ms,
+        # >= 1 means the baseline queue grows without bound.
+        "offered_load": rate_per_s * service_mean_ms / 1000.0 / servers,
+        **r,
+    }
+
+
+def print_queue_report(r: dict) -> None:
+    print("\n=== Razor Memory Gate Queueing Simulation ===\n")
+    print(f"Workload:                 {r['workload']}")
+    print(f"Total queries:            {r['total_queries']}")
+    print(f"Unique queries:           {r['unique_queries']}")
+    print(f"Memory capacity:          {r['memory_capacity']}")
+    print(f"Arrivals:                 {r['arrival']} at {r['rate_per_s']:.2f} req/s")
+    cv = f", cv {r['service_cv']:g}" if r["service_cv"] is not None else ""
+    print(f"Service:                  {r['service']}, mean {r['service_mean_ms']:g} ms{cv}")
+    print(f"Servers:                  {r['servers']}")
+    print(f"Offered load (baseline):  {r['offered_load']:.2f}")
+    print(f"Memory hit rate:          {r['razor']['memory_hit_rate']:.2%}")
+    print(f"Simulated events:         {r['events']:,} ({r['events_per_sec']:,.0f} events/s)\n")
+    print(f"{'':>10} {'req/s':>9} {'util':>7} {'wait ms':>10} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10}")
+    for name in ("baseline", "razor"):
+        side = r[name]
+        lat = side["latency_ms"]
+        print(
+            f"{name:>10} {side['throughput_per_s']:>9.2f} {side['utilization']:>7.1%} {side['mean_wait_ms']:>10,.1f} "
+            f"{lat['p50']:>10,.1f} {lat['p95']:>10,.1f} {lat['p99']:>10,.1f}"
+        )
+    if r["offered_load"] >= 1.0:
+        print("\nNote: offered load >= 1, so baseline latency grows with the run length.")
+    print()
+
+
+def build_confidences(args: argparse.Namespace, queries: Sequence[str]) -> Optional[Dict[str, float]]:
+    """
+    Per-query verifier confidences for --confidence (None: the fixed 0.99 default).
+    """
+    if args.confidence == "fixed" and args.confidence_value == SIMULATED_CONFIDENCE:
+        return None
+    classes = parse_classes(args.confidence_classes) if args.confidence == "classes" else None
+    return assign_confidences(
+        queries,
+        args.confidence,
+        seed=args.seed,
+        value=args.confidence_value,
+        a=args.beta_a,
+        b=args.beta_b,
+        high_share=args.high_share,
+        classes=classes,
+    )
+
+
+def run_threshold_sweep(
+    workload: Sequence[str],
+    unique_queries: int,
+    memory_capacity: int,
+    confidences: Mapping[str, float],
+    thresholds: Sequence[float],
+    assumed_tokens_per_inference: int,
+    assumed_ms_per_inference: float,
+    workload_name: str = "uniform",
+    confidence_model: str = "fixed",
+) -> dict:
+    """
+    run_benchmark's outcome at every threshold, plus expected wrong memory answers.
+    """
+    t0 = time.perf_counter()
+    rows = threshold_sweep(
+        workload, confidences, thresholds, assumed_tokens_per_inference, assumed_ms_per_inference,
+        capacity=memory_capacity,
+    )
+    return {
+        "workload": workload_name,
+        "total_queries": len(workload),
+        "unique_queries": unique_queries,
+        "memory_capacity": memory_capacity,
+        "confidence_model": confidence_model,
+        "mean_confidence": sum(confidences.values()) / len(confidences) if confidences else 0.0,
+        "assumed_tokens_per_inference": assumed_tokens_per_inference,
+        "assumed_ms_per_inference": assumed_ms_per_inference,
+        "analysis_seconds": time.perf_counter() - t0,
+        "sweep": rows,
+    }
+
+
+def print_threshold_sweep(r: dict) -> None:
+    print("\n=== Razor Memory Gate Threshold Sweep ===\n")
+    print(f"Workload:                 {r['workload']}")
+    print(f"Total queries:            {r['total_queries']}")
+    print(f"Unique queries:           {r['unique_queries']}")
+    print(f"Memory capacity:          {r['memory_capacity']}")
+    print(f"Confidence model:         {r['confidence_model']} (mean {r['mean_confidence']:.3f})")
+    print(f"Analysis time:            {r['analysis_seconds']:.2f} s\n")
+    print(
+        f"{'threshold':>9} {'admitted':>9} {'hit rate':>9} {'token savings':>14} "
+        f"{'wrong hits':>11} {'memory error':>13}"
+    )
+    for row in r["sweep"]:
+        print(
+            f"{row['stability_threshold']:>9.3f} {row['admitted_fraction']:>9.1%} {row['memory_hit_rate']:>9.2%} "
+            f"{row['token_savings']:>14,} {row['expected_wrong_hits']:>11,.1f} {row['memory_error_rate']:>13.3%}"
+        )
+    print()
+
+
+def resolve_ms_per_inference(
+    override: Optional[float],
+    cost_model: CostModel,
+    model: str,
+    input_tokens: int,
+    output_tokens: int,
+) -> float:
+    """
+    Latency per inference: the cost model's estimate for `model`, unless
+    --ms-per-inference overrides it.
+    """
+    if override is not None:
+        return override
+    return cost_model.estimate(model, input_tokens, output_tokens)[1]
+
+
+def add_cost_proxies(r: dict, cost_model: CostModel, model: str, assumed_input_tokens: int) -> dict:
+    """
+    Attach FLOPs proxies (and FPCA) from a per-model cost table.
+    Every served answer is treated as correct (simulated verified results),
+    so FPCA here is FLOPs per answer served.
+    """
+    flops, latency_ms = cost_model.estimate(model, assumed_input_tokens, r["assumed_tokens_per_inference"])
+    served = r["total_queries"]
+
+    r["cost_model"] = cost_model.resolve(model)
+    r["assumed_input_tokens"] = assumed_input_tokens
+    r["flops_per_inference"] = flops
+    r["cost_model_ms_per_inference"] = latency_ms
+    r["baseline_flops"] = r["baseline_inferences"] * flops
+    r["razor_flops"] = r["razor_inferences"] * flops
+    r["flops_savings"] = r["baseline_flops"] - r["razor_flops"]
+    r["baseline_fpca"] = r["baseline_flops"] / served if served else None
+    r["razor_fpca"] = r["razor_flops"] / served if served else None
+    return r
+
+
 def print_report(r: dict) -> None:
     print("\n=== Razor Memory Gate Savings Report ===\n")
+    print(f"Workload:                 {r.get('workload', 'uniform')}")
     print(f"Total queries:            {r['total_queries']}")
     print(f"Unique queries:           {r['unique_queries']}  (lower => more repetition)")
     print(f"Memory capacity:          {r['memory_capacity']}")
@@ -141,7 +598,19 @@ def print_report(r: dict) -> None:
     print(f"Razor inferences:         {r['razor_inferences']}")
     print(f"Inferences avoided:       {r['inferences_avoided']}")
     print(f"Memory hits:              {r['memory_hits']}")
-    print(f"Memory hit rate:          {r['memory_hit_rate']:.2%}\n")
+    print(f"Memory hit rate:          {r['memory_hit_rate']:.2%}")
+    if "rejected_results" in r:
+        print(f"Rejected results:         {r['rejected_results']}")
+    print()
+
+    if r.get("workload") == "hierarchical":
+        print("--- Sub-problem Reuse ---")
+        print(f"Unique sub-problems:      {r['unique_subproblems']}")
+        print(f"Fanout per query:         {r['fanout']}")
+        print(f"Parent inferences:        {r['parent_inferences']}")
+        print(f"Sub-problem inferences:   {r['subproblem_inferences']}")
+        print(f"Sub-problem reuses:       {r['subproblem_reuses']}")
+        print(f"Call graph nodes:         {r['call_graph_nodes']}\n")
 
     print("--- Cost Proxies ---")
     print(f"Assumed tokens/inference: {r['assumed_tokens_per_inference']}")
@@ -149,10 +618,20 @@ def print_report(r: dict) -> None:
     print(f"Razor tokens:             {r['razor_tokens']}")
     print(f"Token savings:            {r['token_savings']}\n")
 
-    print(f"Assumed ms/inference:     {r['assumed_ms_per_inference']}")
-    print(f"Baseline latency (ms):    {r['baseline_ms']}")
-    print(f"Razor latency (ms):       {r['razor_ms']}")
-    print(f"Latency savings (ms):     {r['ms_savings']}\n")
+    print(f"Assumed ms/inference:     {r['assumed_ms_per_inference']:g}")
+    print(f"Baseline latency (ms):    {r['baseline_ms']:.1f}")
+    print(f"Razor latency (ms):       {r['razor_ms']:.1f}")
+    print(f"Latency savings (ms):     {r['ms_savings']:.1f}\n")
+
+    if "cost_model" in r:
+        print(f"Cost model:               {r['cost_model']}")
+        print(f"FLOPs/inference:          {r['flops_per_inference']:.3e}")
+        print(f"Model latency/inference:  {r['cost_model_ms_per_inference']:.1f} ms")
+        print(f"Baseline FLOPs:           {r['baseline_flops']:.3e}")
+        print(f"Razor FLOPs:              {r['razor_flops']:.3e}")
+        if r["razor_fpca"] is not None:
+            print(f"Baseline FPCA:            {r['baseline_fpca']:.3e}")
+            print(f"Razor FPCA:               {r['razor_fpca']:.3e}\n")
 
     if r["baseline_tokens"] > 0:
         pct = (r["token_savings"] / r["baseline_tokens"]) * 100.0
@@ -165,28 +644,233 @@ def print_report(r: dict) -> None:
           "integration placement (memory gate before inference), and verification strategy.\n")
 
 
+def add_workload_arguments(p: argparse.ArgumentParser) -> None:
+    """
+    Workload-library parameters read by build_workload_ids().
+    """
+    g = p.add_argument_group("workload library (zipf, temporal, shift, scan, diurnal, trace)")
+    g.add_argument("--alpha", type=float, default=1.0, help="Zipf skew (0 = uniform).")
+    g.add_argument("--reuse", type=float, default=0.5, help="temporal: probability of repeating a recent query.")
+    g.add_argument("--window", type=int, default=100, help="temporal: how far back repeats reach.")
+    g.add_argument("--working-set", type=int, default=None, help="shift: active ids (default: unique / 10).")
+    g.add_argument("--phases", type=int, default=10, help="shift: number of working-set moves.")
+    g.add_argument("--overlap", type=float, default=0.5, help="shift: share of ids kept between phases.")
+    g.add_argument("--scan-length", type=int, default=1000, help="scan: one-hit queries per scan.")
+    g.add_argument("--scan-every", type=int, default=10000, help="scan: background queries between scans.")
+    g.add_argument("--period", type=int, default=100000, help="diurnal: queries per day/night cycle.")
+    g.add_argument("--amplitude", type=float, default=1.0, help="diurnal: strength of the cycle (0-1).")
+    g.add_argument("--trace", default=None, help="trace: JSONL log to replay (e.g. raw/attempts.jsonl).")
+    g.add_argument(
+        "--trace-key",
+        default="caseId",
+        help="trace: record field(s) identifying a query; comma-separate to combine.",
+    )
+
+
+def add_confidence_arguments(p: argparse.ArgumentParser) -> Any:
+    """
+    Verifier confidence model parameters read by build_confidences(); returns the group.
+    """
+    v = p.add_argument_group("verifier confidence")
+    v.add_argument("--confidence", choices=CONFIDENCE_MODELS, default="fixed", help="Per-query confidence model.")
+    v.add_argument("--confidence-value", type=float, default=SIMULATED_CONFIDENCE, help="fixed: confidence.")
+    v.add_argument("--beta-a", type=float, default=20.0, help="beta: Beta(a, b) shape a.")
+    v.add_argument("--beta-b", type=float, default=1.0, help="beta: Beta(a, b) shape b.")
+    v.add_argument("--high-share", type=float, default=0.8, help="bimodal: share of confident queries.")
+    v.add_argument(
+        "--confidence-classes",
+        default="easy=0.7:40:1,hard=0.3:3:2",
+        help="classes: name=share:a:b entries, comma-separated.",
+    )
+    return v
+
+
+def add_cost_arguments(p: argparse.ArgumentParser) -> None:
+    """
+    Per-inference cost parameters; resolve_cost_arguments() fills in the latency.
+    """
+    p.add_argument("--tokens-per-inference", type=int, default=800)
+    p.add_argument(
+        "--ms-per-inference",
+        type=float,
+        default=None,
+        help="Override the cost model's latency per inference.",
+    )
+    p.add_argument("--cost-model", default="proxy-7b", help="Model name in the cost table (FLOPs proxies).")
+    p.add_argument("--cost-table", default=None, help="Optional JSON per-model cost table.")
+    p.add_argument("--input-tokens-per-inference", type=int, default=200)
+
+
+def resolve_cost_arguments(args: argparse.Namespace) -> CostModel:
+    """
+    The cost model named by add_cost_arguments() flags; sets
+    args.ms_per_inference to its latency unless the flag overrides it.
+    """
+    cost_model = CostModel.from_json(args.cost_table) if args.cost_table else CostModel()
+    args.ms_per_inference = resolve_ms_per_inference(
+        args.ms_per_inference, cost_model, args.cost_model, args.input_tokens_per_inference, args.tokens_per_inference
+    )
+    return cost_model
+
+
 def main():
     p = argparse.ArgumentParser(description="Benchmark Razor memory gate savings (synthetic proxy).")
     p.add_argument("--total-queries", type=int, default=1000)
     p.add_argument("--unique-queries", type=int, default=200)
     p.add_argument("--capacity", type=int, default=10000)
     p.add_argument("--threshold", type=float, default=0.95)
-    p.add_argument("--tokens-per-inference", type=int, default=800)
-    p.add_argument("--ms-per-inference", type=int, default=600)
+    add_cost_arguments(p)
     p.add_argument("--seed", type=int, default=123)
+    p.add_argument(
+        "--workload",
+        choices=["uniform", "hierarchical", *workloads.WORKLOADS[1:], "trace"],
+        default="uniform",
+    )
+    p.add_argument("--unique-subproblems", type=int, default=100)
+    p.add_argument("--fanout", type=int, default=4)
+    add_workload_arguments(p)
+
+    c = p.add_argument_group("capacity curve")
+    c.add_argument("--capacity-curve", action="store_true", help="Savings for every capacity in one pass.")
+    c.add_argument("--curve-capacities", default=None, help="Comma-separated capacities (default: geometric grid).")
+    c.add_argument("--curve-points", type=int, default=24, help="Grid points when --curve-capacities is not set.")
+    c.add_argument("--sample-rate", type=float, default=1.0, help="SHARDS sampling rate (1 = exact).")
+    s = p.add_argument_group("queueing simulation")
+    s.add_argument("--queue", action="store_true", help="Simulate arrivals, servers and tail latency.")
+    s.add_argument("--rate", type=float, default=None, help="Arrivals per second (default: 90%% of capacity).")
+    s.add_argument("--servers", type=int, default=8, help="Inference servers in the pool.")
+    s.add_argument("--arrival", choices=queueing.ARRIVALS, default="poisson")
+    s.add_argument("--service", choices=queueing.SERVICES, default="exponential")
+    s.add_argument("--service-cv", type=float, default=1.0, help="lognormal: coefficient of variation.")
+    s.add_argument("--burst-amplitude", type=float, default=0.8, help="bursty: rate swing (0-1).")
+    s.add_argument("--burst-period-ms", type=float, default=10_000.0, help="bursty: mean length of each period.")
+    s.add_argument("--gate-us", type=float, default=2.0, help="Memory lookup latency per request.")
+    v = add_confidence_arguments(p)
+    v.add_argument("--threshold-sweep", action="store_true", help="Outcome for a grid of thresholds.")
+    v.add_argument("--thresholds", default=None, help="Comma-separated thresholds (default: 0.5-0.99).")
+    v.add_argument("--sweep-points", type=int, default=50, help="Grid points when --thresholds is not set.")
+    p.add_argument("--json", action="store_true", help="Print results as JSON.")
 
     args = p.parse_args()
+    cost_model = resolve_cost_arguments(args)
 
+    if args.capacity_curve:
+        if args.workload == "hierarchical":
+            p.error("--capacity-curve supports flat workloads only")
+        if args.workload == "uniform":
+            ids, unique = generate_workload(args.total_queries, args.unique_queries, args.seed), args.unique_queries
+        else:
+            ids, unique = build_workload_ids(args)
+        capacities = [int(x) for x in args.curve_capacities.split(",")] if args.curve_capacities else None
+        try:
+            confidences = build_confidences(args, ids)
+        except ValueError as e:
+            p.error(str(e))
+        r = run_capacity_curve(
+            ids, unique, args.threshold, args.tokens_per_inference, args.ms_per_inference,
+            capacities=capacities, points=args.curve_points, sample_rate=args.sample_rate,
+            seed=args.seed, workload_name=args.workload, confidences=confidences,
+        )
+        if args.json:
+            print(json.dumps(r, indent=2))
+        else:
+            print_capacity_curve(r)
+        return
+
+    if args.threshold_sweep:
+        if args.workload == "hierarchical":
+            p.error("--threshold-sweep supports flat workloads only")
+        if args.workload == "uniform":
+            queries, unique = generate_workload(args.total_queries, args.unique_queries, args.seed), args.unique_queries
+        else:
+            queries, unique = build_workload(args)
+        try:
+            confidences = build_confidences(args, queries) or assign_confidences(queries, "fixed")
+        except ValueError as e:
+            p.error(str(e))
+        thresholds = (
+            [float(x) for x in args.thresholds.split(",") if x.strip()]
+            if args.thresholds
+            else threshold_grid(0.5, 0.99, args.sweep_points)
+        )
+        r = run_threshold_sweep(
+            queries, unique, args.capacity, confidences, thresholds, args.tokens_per_inference,
+            args.ms_per_inference, workload_name=args.workload, confidence_model=args.confidence,
+        )
+        if args.json:
+            print(json.dumps(r, indent=2))
+        else:
+            print_threshold_sweep(r)
+        return
+
+    if args.queue:
+        if args.workload == "hierarchical":
+            p.error("--queue supports flat workloads only")
+        if args.workload == "uniform":
+            queries, unique = generate_workload(args.total_queries, args.unique_queries, args.seed), args.unique_queries
+        else:
+            queries, unique = build_workload(args)
+        try:
+            confidences = build_confidences(args, queries)
+            r = run_queue_benchmark(
+                queries, unique, args.capacity, args.threshold, args.servers, args.ms_per_inference,
+                rate_per_s=args.rate, arrival=args.arrival, service=args.service, service_cv=args.service_cv,
+                gate_ms=args.gate_us / 1000.0, burst_amplitude=args.burst_amplitude,
+                burst_period_ms=args.burst_period_ms, seed=args.seed, workload_name=args.workload,
+                confidences=confidences,
+            )
+        except ValueError as e:
+            p.error(str(e))
+        if args.json:
+            print(json.dumps(r, indent=2))
+        else:
+            print_queue_report(r)
+        return
+
+    if args.workload == "hierarchical":
+        r = run_hierarchical_benchmark(
+            total_queries=args.total_queries,
+            unique_queries=args.unique_queries,
+            unique_subproblems=args.unique_subproblems,
+            fanout=args.fanout,
+            memory_capacity=args.capacity,
+            stability_threshold=args.threshold,
+            assumed_tokens_per_inference=args.tokens_per_inference,
+            assumed_ms_per_inference=args.ms_per_inference,
+            seed=args.seed,
+        )
+        r = add_cost_proxies(r, cost_model, args.cost_model, args.input_tokens_per_inference)
+        if args.json:
+            print(json.dumps(r, indent=2))
+        else:
+            print_report(r)
+        return
+
+    if args.workload == "uniform":
+        queries, unique = generate_workload(args.total_queries, args.unique_queries, args.seed), args.unique_queries
+    else:
+        queries, unique = build_workload(args)
+    try:
+        confidences = build_confidences(args, queries)
+    except ValueError as e:
+        p.error(str(e))
     r = run_benchmark(
         total_queries=args.total_queries,
-        unique_queries=args.unique_queries,
+        unique_queries=unique,
         memory_capacity=args.capacity,
         stability_threshold=args.threshold,
         assumed_tokens_per_inference=args.tokens_per_inference,
         assumed_ms_per_inference=args.ms_per_inference,
         seed=args.seed,
+        workload=queries,
+        workload_name=args.workload,
+        confidences=confidences,
     )
-    print_report(r)
+    r = add_cost_proxies(r, cost_model, args.cost_model, args.input_tokens_per_inference)
+    if args.json:
+        print(json.dumps(r, indent=2))
+    else:
+        print_report(r)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,373 @@
+"""
+Benchmark: Memory Gate Parameter Sweep
+
+Runs benchmark_memory_gate_savings over a grid of
+  workload x unique queries x memory capacity x stability threshold
+and writes one tidy table (one row per grid point, one column per
+parameter or measure) instead of a shell loop of single runs.
+
+Each (workload, unique queries) stream is generated once in this process
+and placed in shared memory as int64 query ids; grid points fan out over a
+process pool whose workers attach to the segments by name, so a workload is
+never regenerated or pickled per point. Every point replays exactly the
+stream a single benchmark_memory_gate_savings run with the same --seed
+would see, with the same cost flags and defaults (add_cost_arguments), so
+rows match single runs, are identical for any --workers and come in grid
+order.
+
+The stability-threshold axis gates on per-query verifier confidences
+from --confidence (beta, bimodal, classes; see benchmark_memory_gate_savings),
+drawn once per workload and shared alongside its ids. With the default
+fixed 0.99 every threshold up to 0.99 gives the same row and every higher
+one gives no hits.
+
+Flat workloads only (uniform, the workload library, trace); a trace keeps
+its own unique-query count, so it runs once whatever --unique-queries lists.
+
+Author: Robbie George
+Governed by MRD v1.8 and ACR.
+
+Run from the repository root:
+  python -m benchmarks.benchmark_memory_gate_sweep --workloads uniform,zipf,scan --unique-queries 1000,10000 --capacities 100,1000,10000 --thresholds 0.8,0.9,0.95 --confidence beta --beta-a 10 --workers 8 --out sweep.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import product
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from benchmarks.benchmark_memory_gate_savings import (
+    add_confidence_arguments,
+    add_cost_arguments,
+    add_workload_arguments,
+    build_confidences,
+    build_workload_ids,
+    generate_workload,
+    resolve_cost_arguments,
+    run_benchmark,
+)
+from src.razor import workloads
+
+SWEEP_WORKLOADS = ("uniform", *workloads.WORKLOADS[1:], "trace")
+SWEEP_COLUMNS = (
+    "workload",
+    "unique_queries",
+    "memory_capacity",
+    "stability_threshold",
+    "total_queries",
+    "memory_hits",
+    "memory_hit_rate",
+    "rejected_results",
+    "razor_inferences",
+    "inferences_avoided",
+    "token_savings",
+    "ms_savings",
+)
+TABLE_FORMATS = (".csv", ".jsonl")
+
+
+@dataclass
+class SharedWorkload:
+    segment: str         # shared memory name
+    workload: str
+    unique_queries: int
+    length: int          # int64 ids in the segment
+    confidences: Optional[str] = None  # shared memory name of per-request float64 confidences
+
+
+def default_workload_params() -> argparse.Namespace:
+    """
+    Workload-library and confidence-model defaults (--alpha, --confidence,
+    ...) as parsed by the CLI.
+    """
+    p = argparse.ArgumentParser()
+    add_workload_arguments(p)
+    add_confidence_arguments(p)
+    return p.parse_args([])
+
+
+def workload_ids(
+    kind: str,
+    total_queries: int,
+    unique_queries: int,
+    seed: int,
+    params: argparse.Namespace,
+) -> Tuple[Any, int]:
+    """
+    (query ids, unique query count): the stream a single run would replay.
+    """
+    if kind == "uniform":
+        queries = generate_workload(total_queries, unique_queries, seed)
+        return array("q", (int(q.rpartition("_")[2]) for q in queries)), unique_queries
+    ns = argparse.Namespace(**vars(params))
+    ns.workload, ns.total_queries, ns.unique_queries, ns.seed = kind, total_queries, unique_queries, seed
+    return build_workload_ids(ns)
+
+
+def request_confidences(ids: Any, seed: int, params: argparse.Namespace) -> Optional[array]:
+    """
+    Each request's verifier confidence under the --confidence model (drawn
+    per distinct query, as a single run with the same --seed draws them),
+    or None for the fixed 0.99 default.
+    """
+    ns = argparse.Namespace(**vars(params))
+    ns.seed = seed
+    keys = ids.tolist() if hasattr(ids, "tolist") else list(ids)
+    confidences = build_confidences(ns, keys)
+    if confidences is None:
+        return None
+    return array("d", (confidences[q] for q in keys))
+
+
+def _share(ids: Any) -> Tuple[SharedMemory, int]:
+    if hasattr(ids, "astype"):
+        data = ids.astype("<i8").tobytes()
+    else:
+        data = (ids if isinstance(ids, array) else array("q", ids)).tobytes()
+    shm = SharedMemory(create=True, size=max(len(data), 8))
+    shm.buf[:len(data)] = data
+    return shm, len(data) // 8
+
+
+# -----------------------------
+# Worker side
+# -----------------------------
+
+_SEGMENTS: Dict[str, SharedMemory] = {}
+# Query strings and confidences of the last workload this process replayed
+# (grid points arrive grouped by workload).
+_QUERIES: Tuple[Optional[str], List[str], Optional[Dict[str, float]]] = (None, [], None)
+
+
+def _read(segment: str, fmt: str, length: int) -> List[Any]:
+    shm = _SEGMENTS.get(segment)
+    if shm is None:
+        shm = _SEGMENTS[segment] = SharedMemory(name=segment)
+    with shm.buf.cast(fmt) as view:
+        return view[:length].tolist()
+
+
+def _queries(shared: SharedWorkload) -> Tuple[List[str], Optional[Dict[str, float]]]:
+    global _QUERIES
+    if _QUERIES[0] != shared.segment:
+        queries = workloads.query_names(_read(shared.segment, "q", shared.length))
+        confidences = None
+        if shared.confidences is not None:
+            confidences = dict(zip(queries, _read(shared.confidences, "d", shared.length)))
+        _QUERIES = (shared.segment, queries, confidences)
+    return _QUERIES[1], _QUERIES[2]
+
+
+def run_point(
+    shared: SharedWorkload,
+    capacity: int,
+    threshold: float,
+    assumed_tokens_per_inference: int,
+    assumed_ms_per_inference: float,
+) -> Dict[str, Any]:
+    """
+    One grid point: run_benchmark over a shared workload, as a table row.
+    """
+    queries, confidences = _queries(shared)
+    r = run_benchmark(
+        total_queries=shared.length,
+        unique_queries=shared.unique_queries,
+        memory_capacity=capacity,
+        stability_threshold=threshold,
+        assumed_tokens_per_inference=assumed_tokens_per_inference,
+        assumed_ms_per_inference=assumed_ms_per_inference,
+        seed=0,  # unused: the workload is given
+        workload=queries,
+        workload_name=shared.workload,
+        confidences=confidences,
+    )
+    return {k: r[k] for k in SWEEP_COLUMNS}
+
+
+def _run_point(task: tuple) -> Dict[str, Any]:
+    return run_point(*task)
+
+
+# -----------------------------
+# Sweep
+# -----------------------------
+
+def run_sweep(
+    workload_kinds: Sequence[str],
+    unique_queries: Sequence[int],
+    capacities: Sequence[int],
+    thresholds: Sequence[float],
+    total_queries: int,
+    assumed_tokens_per_inference: int,
+    assumed_ms_per_inference: float,
+    seed: int = 123,
+    workers: int = 1,
+    params: Optional[argparse.Namespace] = None,
+) -> dict:
+    """
+    Rows for every grid point, in grid order (workload, unique queries,
+    capacity, threshold), independent of `workers`.
+    """
+    unknown = set(workload_kinds) - set(SWEEP_WORKLOADS)
+    if unknown:
+        raise ValueError(f"unknown sweep workloads: {', '.join(sorted(unknown))}")
+    if not (workload_kinds and unique_queries and capacities and thresholds):
+        raise ValueError("every sweep axis needs at least one value")
+    params = params if params is not None else default_workload_params()
+
+    t0 = time.perf_counter()
+    segments: List[SharedMemory] = []
+    shared: List[SharedWorkload] = []
+    try:
+        for kind in workload_kinds:
+            for unique in unique_queries:
+                ids, actual_unique = workload_ids(kind, total_queries, unique, seed, params)
+                shm, length = _share(ids)
+                segments.append(shm)
+                point = SharedWorkload(shm.name, kind, actual_unique, length)
+                confidences = request_confidences(ids, seed, params)
+                if confidences is not None:
+                    conf_shm, _ = _share(confidences)
+                    segments.append(conf_shm)
+                    point.confidences = conf_shm.name
+                shared.append(point)
+                if kind == "trace":
+                    break  # the trace fixes its own unique-query count
+        generate_s = time.perf_counter() - t0
+
+        tasks = [
+            (w, c, t, assumed_tokens_per_inference, assumed_ms_per_inference)
+            for w, c, t in product(shared, capacities, thresholds)
+        ]
+        t1 = time.perf_counter()
+        if workers <= 1:
+            _SEGMENTS.update({shm.name: shm for shm in segments})
+            try:
+                rows = [_run_point(task) for task in tasks]
+            finally:
+                for shm in segments:
+                    _SEGMENTS.pop(shm.name, None)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                rows = list(pool.map(_run_point, tasks))
+        sweep_s = time.perf_counter() - t1
+    finally:
+        global _QUERIES
+        _QUERIES = (None, [], None)
+        for shm in segments:
+            shm.close()
+            shm.unlink()
+
+    return {
+        "benchmark": "memory_gate_sweep",
+        "config": {
+            "workloads": list(workload_kinds),
+            "unique_queries": list(unique_queries),
+            "capacities": list(capacities),
+            "thresholds": list(thresholds),
+            "total_queries": total_queries,
+            "assumed_tokens_per_inference": assumed_tokens_per_inference,
+            "assumed_ms_per_inference": assumed_ms_per_inference,
+            "confidence": params.confidence,
+            "seed": seed,
+            "workers": workers,
+        },
+        "points": len(rows),
+        "generate_seconds": generate_s,
+        "sweep_seconds": sweep_s,
+        "rows": rows,
+    }
+
+
+def write_table(rows: Sequence[Dict[str, Any]], path: str) -> None:
+    """
+    Write sweep rows as CSV or JSON Lines, chosen by the file suffix.
+    """
+    suffix = os.path.splitext(path)[1].lower()
+    if suffix not in TABLE_FORMATS:
+        raise ValueError(f"unsupported table format {suffix!r} (expected one of {', '.join(TABLE_FORMATS)})")
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        if suffix == ".csv":
+            writer = csv.DictWriter(f, fieldnames=SWEEP_COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
+        else:
+            for row in rows:
+                f.write(json.dumps(row) + "\n")
+
+
+def print_report(r: dict) -> None:
+    c = r["config"]
+    print("\n=== Razor Memory Gate Parameter Sweep ===\n")
+    print(f"Grid points:              {r['points']}")
+    print(f"Total queries per point:  {c['total_queries']}")
+    print(f"Workers:                  {c['workers']}")
+    print(f"Workload generation:      {r['generate_seconds']:.2f} s")
+    print(f"Sweep:                    {r['sweep_seconds']:.2f} s\n")
+    print(f"{'workload':>9} {'unique':>9} {'capacity':>9} {'threshold':>9} {'hit rate':>9} {'avoided':>10} {'token savings':>14}")
+    for row in r["rows"]:
+        print(
+            f"{row['workload']:>9} {row['unique_queries']:>9} {row['memory_capacity']:>9} "
+            f"{row['stability_threshold']:>9g} {row['memory_hit_rate']:>9.2%} "
+            f"{row['inferences_avoided']:>10} {row['token_savings']:>14}"
+        )
+    print()
+
+
+def _ints(spec: str) -> List[int]:
+    return [int(x) for x in spec.split(",") if x.strip()]
+
+
+def main():
+    p = argparse.ArgumentParser(description="Sweep the memory-gate benchmark over a parameter grid.")
+    p.add_argument("--workloads", default="uniform", help=f"Comma-separated: {', '.join(SWEEP_WORKLOADS)}.")
+    p.add_argument("--unique-queries", default="200", help="Comma-separated unique-query counts.")
+    p.add_argument("--capacities", default="100,1000,10000", help="Comma-separated memory capacities.")
+    p.add_argument("--thresholds", default="0.95", help="Comma-separated stability thresholds.")
+    p.add_argument("--total-queries", type=int, default=1000)
+    add_cost_arguments(p)
+    p.add_argument("--seed", type=int, default=123)
+    p.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    p.add_argument("--out", default=None, help="Write the table as .csv or .jsonl.")
+    p.add_argument("--json", action="store_true", help="Print results as JSON.")
+    add_workload_arguments(p)
+    add_confidence_arguments(p)
+    args = p.parse_args()
+    resolve_cost_arguments(args)
+
+    if args.out and os.path.splitext(args.out)[1].lower() not in TABLE_FORMATS:
+        p.error(f"--out must end in one of {', '.join(TABLE_FORMATS)}")
+    try:
+        r = run_sweep(
+            [w.strip() for w in args.workloads.split(",") if w.strip()],
+            _ints(args.unique_queries),
+            _ints(args.capacities),
+            [float(x) for x in args.thresholds.split(",") if x.strip()],
+            total_queries=args.total_queries,
+            assumed_tokens_per_inference=args.tokens_per_inference,
+            assumed_ms_per_inference=args.ms_per_inference,
+            seed=args.seed,
+            workers=args.workers,
+            params=args,
+        )
+    except ValueError as e:
+        p.error(str(e))
+    if args.out:
+        write_table(r["rows"], args.out)
+    if args.json:
+        print(json.dumps(r, indent=2))
+    else:
+        print_report(r)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark: Streaming Metric Accumulators
+
+Measures TPCA / FPCA accumulator throughput at scale:
+- serial update() rate over N observations (default 10M)
+- sharded updates across a process pool, merged from serialized bytes
+- serialized size of a partial result
+
+It does NOT require an ML model. Observations are synthetic.
+
+Author: Robbie George
+Governed by MRD v1.8 and ACR.
+
+Run from the repository root:
+  python -m benchmarks.benchmark_metrics_accumulators --observations 10000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple
+
+from src.razor.metrics import FPCAAccumulator, TPCAAccumulator, merge_all
+
+
+def run_shard(args: Tuple[int, int, int]) -> Tuple[bytes, bytes]:
+    """
+    Update fresh accumulators with `count` synthetic observations.
+    Returns serialized (TPCA, FPCA) partials.
+    """
+    count, seed, flops_per_token = args
+    rng = random.Random(seed)
+    tpca = TPCAAccumulator()
+    fpca = FPCAAccumulator()
+    for _ in range(count):
+        tokens = rng.randint(1, 64)
+        ok = rng.random() < 0.75
+        tpca.update(tokens, ok, 32)
+        fpca.update(tokens * flops_per_token, tokens * 0.02, ok)
+    return tpca.to_bytes(), fpca.to_bytes()
+
+
+def run_benchmark(observations: int, workers: int, seed: int, flops_per_token: int) -> dict:
+    # Serial baseline
+    t0 = time.perf_counter()
+    serial_bytes = run_shard((observations, seed, flops_per_token))
+    serial_s = time.perf_counter() - t0
+
+    # Sharded: split observations, merge serialized partials
+    base, extra = divmod(observations, workers)
+    shards: List[Tuple[int, int, int]] = [
+        (base + (1 if i < extra else 0), seed + 1 + i, flops_per_token) for i in range(workers)
+    ]
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        partials = list(pool.map(run_shard, shards))
+    t_merge = time.perf_counter()
+    tpca = merge_all((TPCAAccumulator.from_bytes(p[0]) for p in partials), TPCAAccumulator())
+    fpca = merge_all((FPCAAccumulator.from_bytes(p[1]) for p in partials), FPCAAccumulator())
+    merge_s = time.perf_counter() - t_merge
+    sharded_s = time.perf_counter() - t0
+
+    return {
+        "observations": observations,
+        "workers": workers,
+        "serial_seconds": serial_s,
+        "serial_updates_per_sec": observations / serial_s if serial_s else 0.0,
+        "sharded_seconds": sharded_s,
+        "sharded_updates_per_sec": observations / sharded_s if sharded_s else 0.0,
+        "merge_seconds": merge_s,
+        "tpca_partial_bytes": len(serial_bytes[0]),
+        "fpca_partial_bytes": len(serial_bytes[1]),
+        "merged_observations": tpca.observations,
+        "merged_tpca": tpca.tpca,
+        "merged_fpca": fpca.fpca,
+    }
+
+
+def print_report(r: dict) -> None:
+    print("\n=== Razor Metric Accumulator Benchmark ===\n")
+    print(f"Observations:             {r['observations']}")
+    print(f"Workers:                  {r['workers']}\n")
+
+    print("--- Serial ---")
+    print(f"Time (s):                 {r['serial_seconds']:.2f}")
+    print(f"Updates/sec:              {r['serial_updates_per_sec']:,.0f}\n")
+
+    print("--- Sharded + merge ---")
+    print(f"Time (s):                 {r['sharded_seconds']:.2f}")
+    print(f"Updates/sec:              {r['sharded_updates_per_sec']:,.0f}")
+    print(f"Merge time (ms):          {r['merge_seconds'] * 1000:.3f}")
+    print(f"Merged observations:      {r['merged_observations']}\n")
+
+    print("--- Serialized partials ---")
+    print(f"TPCA bytes:               {r['tpca_partial_bytes']}")
+    print(f"FPCA bytes:               {r['fpca_partial_bytes']}\n")
+
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark streaming TPCA/FPCA accumulators.")
+    p.add_argument("--observations", type=int, default=10_000_000)
+    p.add_argument("--workers", type=int, default=4)
+    p.add_argument("--flops-per-token", type=int, default=2 * 7_000_000_000)
+    p.add_argument("--seed", type=int, default=123)
+    args = p.parse_args()
+
+    r = run_benchmark(args.observations, args.workers, args.seed, args.flops_per_token)
+    print_report(r)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark: Report Formats (JSON vs Columnar)
+
+Grades a synthetic case set once, then writes the same report as indented
+JSON and as a columnar file, and compares:
+- write time and file size
+- full load time (json.load vs decoding every columnar row)
+- open + one numeric column (zero-copy memory map)
+- a filtered read (one category, incorrect rows only)
+
+The columnar report must decode back to the JSON report exactly.
+
+It does NOT require an ML model. Cases and outputs are synthetic.
+
+Author: Robbie George
+Governed by MRD v1.8 and ACR.
+
+Run from the repository root:
+  python -m benchmarks.benchmark_report_formats --cases 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from benchmarks.benchmark_evaluator_parallel import generate_synthetic_set
+from benchmarks.evaluator import evaluate_outputs, load_columnar_report, read_columnar_report, write_report
+
+
+def _timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t0
+
+
+def run_benchmark(num_cases: int, seed: int) -> dict:
+    cases, outputs = generate_synthetic_set(num_cases, seed)
+    report = evaluate_outputs(cases, outputs)
+    where = {"category": "Numeric", "correct": False}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "report.json")
+        columnar_path = os.path.join(tmp, "report.rzc")
+
+        _, json_write_s = _timed(lambda: write_report(report, json_path))
+        _, columnar_write_s = _timed(lambda: write_report(report, columnar_path, "columnar"))
+
+        def load_json():
+            with open(json_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+
+        loaded_json, json_load_s = _timed(load_json)
+        loaded_columnar, columnar_load_s = _timed(lambda: read_columnar_report(columnar_path))
+
+        def column_sum():
+            with load_columnar_report(columnar_path) as f:
+                return sum(f.raw("tokens").tolist())
+
+        _, column_s = _timed(column_sum)
+
+        def json_filter():
+            return [r for r in load_json()["results"] if r["category"] == "Numeric" and not r["correct"]]
+
+        json_rows, json_filter_s = _timed(json_filter)
+        columnar_rows, columnar_filter_s = _timed(lambda: read_columnar_report(columnar_path, where)["results"])
+
+        return {
+            "num_cases": num_cases,
+            "json": {
+                "bytes": os.path.getsize(json_path),
+                "write_s": json_write_s,
+                "load_s": json_load_s,
+                "filter_s": json_filter_s,
+            },
+            "columnar": {
+                "bytes": os.path.getsize(columnar_path),
+                "write_s": columnar_write_s,
+                "load_s": columnar_load_s,
+                "column_s": column_s,
+                "filter_s": columnar_filter_s,
+            },
+            "filtered_rows": len(columnar_rows),
+            "identical": loaded_columnar == loaded_json and columnar_rows == json_rows,
+        }
+
+
+def print_report(r: dict) -> None:
+    j, c = r["json"], r["columnar"]
+    print("\n=== Razor Report Formats ===\n")
+    print(f"Cases:                    {r['num_cases']}")
+    print(f"Filtered rows:            {r['filtered_rows']}")
+    print(f"Identical:                {r['identical']}\n")
+    print(f"{'':<22} {'json':>12} {'columnar':>12} {'ratio':>8}")
+    print(f"{'size (MB)':<22} {j['bytes'] / 1e6:>12.1f} {c['bytes'] / 1e6:>12.1f} {j['bytes'] / c['bytes']:>8.1f}x")
+    for label, key in [("write (s)", "write_s"), ("full load (s)", "load_s"), ("filtered read (s)", "filter_s")]:
+        ratio = j[key] / c[key] if c[key] else 0.0
+        print(f"{label:<22} {j[key]:>12.3f} {c[key]:>12.3f} {ratio:>8.1f}x")
+    print(f"{'open + tokens sum (s)':<22} {'':>12} {c['column_s']:>12.4f}")
+    print()
+
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark JSON vs columnar evaluator reports.")
+    p.add_argument("--cases", type=int, default=1_000_000)
+    p.add_argument("--seed", type=int, default=123)
+    p.add_argument("--json", action="store_true", help="Print results as JSON.")
+    args = p.parse_args()
+
+    r = run_benchmark(args.cases, args.seed)
+    if args.json:
+        print(json.dumps(r, indent=2))
+    else:
+        print_report(r)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark: Tokenizer Service
+
+Compares token counting throughput of the evaluator's per-text path
+(token_count on every output) with the TokenCounter service (batched
+counting, content-hash memo, vectorized len/4 proxy).
+
+Outputs are synthetic, with a configurable share of exact repeats, which
+is what the memo exploits. tiktoken is used when installed; otherwise
+only the proxy path is measured.
+
+Author: Robbie George
+Governed by MRD v1.8 and ACR.
+
+Run from the repository root:
+  python -m benchmarks.benchmark_tokenizer --texts 1000000 --repeat-share 0.5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from typing import List, Optional
+
+from benchmarks.evaluator import token_count
+from src.razor.tokenizer import TokenCounter, get_encoder
+
+_WORDS = ["alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel", "india", "juliet", "391"]
+
+
+def generate_texts(num_texts: int, repeat_share: float, seed: int) -> List[str]:
+    rng = random.Random(seed)
+    texts: List[str] = []
+    for _ in range(num_texts):
+        if texts and rng.random() < repeat_share:
+            texts.append(rng.choice(texts))
+        else:
+            texts.append(" ".join(rng.choice(_WORDS) for _ in range(rng.randint(1, 60))))
+    return texts
+
+
+def _measure(texts: List[str], encoder, batch_size: int) -> dict:
+    t0 = time.perf_counter()
+    baseline = [token_count(t, encoder=encoder) for t in texts]
+    baseline_s = time.perf_counter() - t0
+
+    counter = TokenCounter("bench", encoder)
+    t0 = time.perf_counter()
+    service: List[int] = []
+    for i in range(0, len(texts), batch_size):
+        service.extend(counter.count_batch(texts[i:i + batch_size]))
+    service_s = time.perf_counter() - t0
+
+    total = sum(baseline)
+    return {
+        "identity": counter.identity,
+        "total_tokens": total,
+        "baseline_seconds": baseline_s,
+        "baseline_tokens_per_sec": total / baseline_s if baseline_s else 0.0,
+        "service_seconds": service_s,
+        "service_tokens_per_sec": total / service_s if service_s else 0.0,
+        "speedup": baseline_s / service_s if service_s else 0.0,
+        "identical": service == baseline,
+        "memo_hit_rate": counter.get_stats()["hit_rate"],
+    }
+
+
+def run_benchmark(num_texts: int, repeat_share: float, batch_size: int, model: Optional[str], seed: int) -> dict:
+    texts = generate_texts(num_texts, repeat_share, seed)
+    runs = [_measure(texts, None, batch_size)]
+    encoder = get_encoder(model) if model else None
+    if encoder is not None:
+        runs.append(_measure(texts, encoder, batch_size))
+    return {
+        "num_texts": num_texts,
+        "repeat_share": repeat_share,
+        "batch_size": batch_size,
+        "tiktoken_available": encoder is not None,
+        "runs": runs,
+    }
+
+
+def print_report(r: dict) -> None:
+    print("\n=== Razor Tokenizer Service Benchmark ===\n")
+    print(f"Texts:                    {r['num_texts']}")
+    print(f"Repeat share:             {r['repeat_share']:.0%}")
+    print(f"Batch size:               {r['batch_size']}\n")
+    for run in r["runs"]:
+        print(f"--- {run['identity']} ---")
+        print(f"Per-text tokens/sec:      {run['baseline_tokens_per_sec']:,.0f}")
+        print(f"Service tokens/sec:       {run['service_tokens_per_sec']:,.0f}")
+        print(f"Speedup:                  {run['speedup']:.2f}x")
+        print(f"Memo hit rate:            {run['memo_hit_rate']:.1%}")
+        print(f"Counts identical:         {run['identical']}\n")
+    if not r["tiktoken_available"]:
+        print("Note: tiktoken not available; only the len/4 proxy was measured.\n")
+
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark batched, memoized token counting.")
+    p.add_argument("--texts", type=int, default=1_000_000)
+    p.add_argument("--repeat-share", type=float, default=0.5, help="Share of texts that repeat an earlier one.")
+    p.add_argument("--batch-size", type=int, default=1024)
+    p.add_argument("--model", default="gpt-4", help="tiktoken model name (skipped if unavailable).")
+    p.add_argument("--seed", type=int, default=123)
+    p.add_argument("--json", action="store_true", help="Print results as JSON.")
+    args = p.parse_args()
+
+    r = run_benchmark(args.texts, args.repeat_share, args.batch_size, args.model, args.seed)
+    if args.json:
+        print(json.dumps(r, indent=2))
+    else:
+        print_report(r)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,33 @@ Robbie’s Razor Evaluator (v0)
 Purpose:
 - Provide a simple, reproducible benchmark harness for labs.
 - Compute: Accuracy, TPCA (Tokens Per Correct Answer), Overrun Rate.
+- Compute: FPCA (FLOPs Per Correct Answer) and latency proxies from a per-model cost table.
 - Optional: token counting via tiktoken if installed; otherwise uses a deterministic proxy.
+- Optional: streaming mode (--stream) for JSONL cases/outputs at any scale; per-case
+  results are written to a JSONL report as they are graded, and only summary
+  accumulators are held in memory.
+- Optional: --workers N grades chunks of cases on a process pool; results are
+  consumed in case order, so reports are byte-identical to the serial path.
+- Token counts go through a TokenCounter: one warm encoder per model, batched
+  encoding per chunk, and a bounded memo for repeated outputs and prompts.
+- Cases are compiled once into grading plans (normalized answer sets, one combined
+  pattern for contains mode); --plan-cache persists plans across invocations.
+- Optional: --result-cache keeps per-pair grades and token counts keyed by
+  (plan, tokenizer, prompt, output) content hashes, so reruns only regrade
+  new or changed pairs.
+- Optional: --matrix grades a whole model x condition x repetition matrix
+  (a directory of <model>__<condition>__r<N>.outputs.json files or a JSON
+  manifest) in one process, writing per-cell reports and aggregate-summary.json.
+- Optional: --bootstrap N adds percentile bootstrap CIs (NumPy), and in matrix
+  mode paired per-case comparisons of each condition against a baseline.
+- Optional: --group-by adds per-group accuracy / TPCA / overrun rates (e.g. by
+  category, scoring_mode or token_bucket) computed in the same pass.
+- Optional: --report-format columnar writes reports as a typed, memory-mappable
+  columnar file (ids as a string blob, categories dictionary-encoded) instead of
+  indented JSON; load_columnar_report() supports filtered reads.
+- Optional: --follow grades a run's attempts.jsonl while it is being written
+  (OnlineEvaluator), printing live per model/condition summaries; the same
+  API accepts events from any iterator or an asyncio queue.
 
 References:
 - Razor Compliance Framework:
@@ -19,11 +45,37 @@ Author: Robbie George
 from __future__ import annotations
 
 import argparse
+import asyncio
+import hashlib
 import json
+import math
 import os
 import re
+import struct
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple
+from typing import IO, Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, Mapping, Optional, Pattern, Sequence, Tuple, Union
+
+# Make `src.razor` importable when run as `python benchmarks/evaluator.py`.
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+from src.razor.bootstrap import bootstrap_ci, cluster_columns, columns_from_results, paired_bootstrap  # noqa: E402
+from src.razor.columnar import ColumnarFile, write_columnar  # noqa: E402
+from src.razor.cost_model import CostModel  # noqa: E402
+from src.razor.matching import WordBoundaryMatcher  # noqa: E402
+from src.razor.tokenizer import TokenCounter, get_encoder, proxy_token_count  # noqa: E402
+from src.razor.metrics import (  # noqa: E402
+    DEFAULT_TOKEN_BUCKETS,
+    FPCAAccumulator,
+    GroupedAccumulator,
+    TPCAAccumulator,
+)
 
 
 # -----------------------------
@@ -31,11 +83,7 @@ from typing import Any, Dict, List, Optional, Tuple
 # -----------------------------
 
 def try_get_tiktoken_encoder(model_name: str):
-    try:
-        import tiktoken  # type: ignore
-        return tiktoken.encoding_for_model(model_name)
-    except Exception:
-        return None
+    return get_encoder(model_name)
 
 
 def token_count(text: str, encoder=None) -> int:
@@ -47,7 +95,7 @@ def token_count(text: str, encoder=None) -> int:
     if encoder is not None:
         return len(encoder.encode(text))
     # Deterministic proxy: ~4 chars per token
-    return max(1, (len(text) + 3) // 4)
+    return proxy_token_count(text)
 
 
 # -----------------------------
@@ -105,24 +153,59 @@ class Case:
     target_max_tokens: Optional[int] = None
 
 
+def case_from_dict(item: Dict[str, Any]) -> Case:
+    return Case(
+        id=item["id"],
+        category=item.get("category", "Uncategorized"),
+        prompt=item["prompt"],
+        acceptable_answers=item.get("acceptable_answers", []),
+        scoring_mode=item.get("scoring_mode", "exact"),
+        target_max_tokens=item.get("target_max_tokens"),
+    )
+
+
 def load_cases(path: str) -> List[Case]:
     with open(path, "r", encoding="utf-8") as f:
         raw = json.load(f)
     cases: List[Case] = []
     for item in raw:
-        cases.append(
-            Case(
-                id=item["id"],
-                category=item.get("category", "Uncategorized"),
-                prompt=item["prompt"],
-                acceptable_answers=item.get("acceptable_answers", []),
-                scoring_mode=item.get("scoring_mode", "exact"),
-                target_max_tokens=item.get("target_max_tokens"),
-            )
-        )
+        cases.append(case_from_dict(item))
     return cases
 
 
+def _iter_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def iter_cases(path: str) -> Iterator[Case]:
+    """
+    Yield cases one at a time: JSONL (one case object per line) is streamed;
+    a .json array is loaded whole.
+    """
+    if path.endswith(".jsonl"):
+        for item in _iter_jsonl(path):
+            yield case_from_dict(item)
+    else:
+        yield from load_cases(path)
+
+
+def iter_outputs(path: str) -> Iterator[Tuple[str, str]]:
+    """
+    Yield (case_id, output): JSONL lines of {"id": ..., "output": ...} are
+    streamed; a .json mapping {case_id: output} is loaded whole.
+    """
+    if path.endswith(".jsonl"):
+        for item in _iter_jsonl(path):
+            yield item["id"], item.get("output") or ""
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            yield from json.load(f).items()
+
+
 def grade_case(case: Case, output: str) -> bool:
     if not case.acceptable_answers:
         # If no answers provided, cannot grade
@@ -140,69 +223,1125 @@ def grade_case(case: Case, output: str) -> bool:
     return is_correct_exact(output, case.acceptable_answers)
 
 
+# -----------------------------
+# Grading plans
+# -----------------------------
+
+_NUMBER_RE = re.compile(r"[-+]?\d+(\.\d+)?")
+_PLAN_CACHE_VERSION = 1
+# Above this many aliases a single Aho–Corasick pass beats regex alternation.
+AHO_CORASICK_MIN_ANSWERS = 128
+
+
+class GradingPlan:
+    """
+    A case's acceptable answers compiled once for repeated grading.
+
+    Semantics match grade_case exactly:
+    - exact:    normalized output in the normalized answer set (O(1))
+    - numeric:  first number in the normalized output in the answer set (O(1))
+    - contains: one combined whole-word alternation over all answers, or an
+                Aho–Corasick scan once there are many aliases
+    - no answers => never correct; unknown modes grade as exact
+    """
+
+    __slots__ = ("mode", "answers", "_pattern")
+
+    def __init__(self, mode: str, answers: FrozenSet[str]):
+        self.mode = mode
+        self.answers = answers
+        self._pattern: Optional[Union[Pattern[str], WordBoundaryMatcher]] = None
+        if mode == "contains" and answers:
+            if len(answers) >= AHO_CORASICK_MIN_ANSWERS:
+                self._pattern = WordBoundaryMatcher(answers)
+            else:
+                alternation = "|".join(re.escape(a) for a in sorted(answers))
+                self._pattern = re.compile(rf"\b(?:{alternation})\b")
+
+    @classmethod
+    def compile(cls, case: Case) -> "GradingPlan":
+        mode = case.scoring_mode.lower().strip()
+        if mode not in ("exact", "numeric", "contains"):
+            mode = "exact"
+        if not case.acceptable_answers:
+            mode = "none"
+        return cls(mode, frozenset(normalize(a) for a in case.acceptable_answers))
+
+    def grade(self, output: str) -> bool:
+        if self.mode == "none":
+            return False
+        out = normalize(output)
+        if self.mode == "exact":
+            return out in self.answers
+        if self.mode == "numeric":
+            m = _NUMBER_RE.search(out)
+            return m is not None and m.group(0) in self.answers
+        return self._pattern.search(out) is not None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"mode": self.mode, "answers": sorted(self.answers)}
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "GradingPlan":
+        return cls(d["mode"], frozenset(d["answers"]))
+
+
+def plan_key(case: Case) -> str:
+    """
+    Content hash of everything that affects grading (mode + answers).
+    """
+    raw = json.dumps([case.scoring_mode, case.acceptable_answers], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class PlanCache:
+    """
+    Bounded in-memory map of compiled plans, optionally backed by a JSON file
+    keyed by plan_key so plans are reused across evaluator invocations.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 100_000):
+        self.path = path
+        self.max_entries = max_entries
+        self._plans: "OrderedDict[Tuple[str, Tuple[str, ...]], Tuple[str, GradingPlan]]" = OrderedDict()
+        self._stored: Dict[str, Dict[str, Any]] = {}
+        # Plans compiled (not loaded) since the last take_compiled(), for pool workers.
+        self._compiled: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+            if raw.get("version") == _PLAN_CACHE_VERSION:
+                self._stored = raw.get("plans", {})
+
+    def get(self, case: Case) -> GradingPlan:
+        return self.entry(case)[1]
+
+    def key(self, case: Case) -> str:
+        """
+        plan_key for a case, without compiling its plan.
+        """
+        cached = self._plans.get((case.scoring_mode, tuple(case.acceptable_answers)))
+        return cached[0] if cached is not None else plan_key(case)
+
+    def entry(self, case: Case) -> Tuple[str, GradingPlan]:
+        """
+        (plan_key, plan) for a case, compiling or loading the plan on a miss.
+        """
+        mem_key = (case.scoring_mode, tuple(case.acceptable_answers))
+        cached = self._plans.get(mem_key)
+        if cached is not None:
+            self._plans.move_to_end(mem_key)
+            return cached
+
+        key = plan_key(case)
+        stored = self._stored.get(key)
+        if stored is not None:
+            plan = GradingPlan.from_dict(stored)
+        else:
+            plan = GradingPlan.compile(case)
+            if self.path:
+                self._stored[key] = self._compiled[key] = plan.to_dict()
+                self._dirty = True
+
+        self._plans[mem_key] = (key, plan)
+        while len(self._plans) > self.max_entries:
+            self._plans.popitem(last=False)
+        return key, plan
+
+    def take_compiled(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Plans compiled since the last call, as {plan_key: plan dict}.
+        """
+        compiled, self._compiled = self._compiled, {}
+        return compiled
+
+    def add_compiled(self, plans: Mapping[str, Dict[str, Any]]) -> None:
+        """
+        Record plans compiled elsewhere (e.g. by pool workers) for save().
+        """
+        if not self.path:
+            return
+        for key, plan in plans.items():
+            if key not in self._stored:
+                self._stored[key] = plan
+                self._dirty = True
+
+    def save(self) -> None:
+        if not self.path or not self._dirty:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"version": _PLAN_CACHE_VERSION, "plans": self._stored}, f)
+        self._dirty = False
+
+
+# -----------------------------
+# Incremental re-evaluation cache
+# -----------------------------
+
+_RESULT_CACHE_MAGIC = b"RZRC"
+_RESULT_CACHE_VERSION = 1
+_RESULT_CACHE_HEADER = struct.Struct("<4sB")
+_RESULT_CACHE_RECORD = struct.Struct("<16s?qq")  # key, correct, tokens, prompt_tokens
+
+CachedGrade = Tuple[bool, int, int]
+
+
+class ResultCache:
+    """
+    Persistent content-addressed map: hash(plan, tokenizer, prompt, output)
+    -> (correct, output tokens, prompt tokens).
+
+    The file is an append-only log of fixed-size records, so save() only
+    writes entries added since the last load or save. A file with a
+    different version is ignored and rewritten; a torn final record (e.g.
+    from an interrupted write) is dropped.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._entries: Dict[bytes, CachedGrade] = {}
+        self._new: Dict[bytes, CachedGrade] = {}
+        self._rewrite = True
+        self.hits = 0
+        self.misses = 0
+        if path and os.path.exists(path):
+            self._load(path)
+
+    def _load(self, path: str) -> None:
+        with open(path, "rb") as f:
+            data = f.read()
+        header = _RESULT_CACHE_HEADER.size
+        if len(data) < header or _RESULT_CACHE_HEADER.unpack_from(data) != (_RESULT_CACHE_MAGIC, _RESULT_CACHE_VERSION):
+            return
+        usable = header + (len(data) - header) // _RESULT_CACHE_RECORD.size * _RESULT_CACHE_RECORD.size
+        for key, ok, tokens, prompt_tokens in _RESULT_CACHE_RECORD.iter_unpack(data[header:usable]):
+            self._entries[key] = (ok, tokens, prompt_tokens)
+        # Appending after a torn record would misalign every later record.
+        self._rewrite = usable != len(data)
+
+    @staticmethod
+    def make_key(plan_key_: str, tokenizer: str, prompt: str, output: str) -> bytes:
+        # Length prefixes keep field boundaries unambiguous.
+        raw = f"{len(plan_key_)}:{plan_key_}{len(tokenizer)}:{tokenizer}{len(prompt)}:{prompt}{output}"
+        return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).digest()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: bytes) -> Optional[CachedGrade]:
+        hit = self._entries.get(key)
+        if hit is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return hit
+
+    def put(self, key: bytes, correct: bool, tokens: int, prompt_tokens: int) -> None:
+        value = (correct, tokens, prompt_tokens)
+        if self._entries.get(key) != value:
+            self._entries[key] = value
+            self._new[key] = value
+
+    def save(self) -> None:
+        if not self.path or (not self._new and not self._rewrite):
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        if self._rewrite:
+            with open(self.path, "wb") as f:
+                f.write(_RESULT_CACHE_HEADER.pack(_RESULT_CACHE_MAGIC, _RESULT_CACHE_VERSION))
+                for key, value in self._entries.items():
+                    f.write(_RESULT_CACHE_RECORD.pack(key, *value))
+        else:
+            with open(self.path, "ab") as f:
+                for key, value in self._new.items():
+                    f.write(_RESULT_CACHE_RECORD.pack(key, *value))
+        self._new.clear()
+        self._rewrite = False
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+        }
+
+
 # -----------------------------
 # Evaluation
 # -----------------------------
 
+GroupBy = Sequence[Sequence[str]]
+
+
+class SummaryAccumulator:
+    """
+    Summary state for one evaluation pass: TPCA counts plus FPCA sums, and
+    optional per-group TPCA counts (one GroupedAccumulator per `group_by` spec).
+
+    FPCA inputs are buffered in chunks of `chunk_size` and reduced with the
+    vectorized cost model, so memory stays bounded for streaming passes.
+    """
+
+    def __init__(
+        self,
+        cost_model: Optional[CostModel] = None,
+        model: str = "gpt-4",
+        chunk_size: int = 65_536,
+        group_by: Optional[GroupBy] = None,
+        token_buckets: Sequence[int] = DEFAULT_TOKEN_BUCKETS,
+    ):
+        self.cost_model = cost_model or CostModel()
+        self.model = model
+        self.chunk_size = chunk_size
+        self.tpca = TPCAAccumulator()
+        self.fpca = FPCAAccumulator()
+        self.groups = [GroupedAccumulator(fields, token_buckets) for fields in group_by or ()]
+        self._input_tokens: List[int] = []
+        self._output_tokens: List[int] = []
+        self._correct: List[bool] = []
+
+    def add(self, result: Dict[str, Any], input_tokens: int) -> None:
+        self.tpca.update(result["tokens"], result["correct"], result["target_max_tokens"])
+        for g in self.groups:
+            g.update(result)
+        self._input_tokens.append(input_tokens)
+        self._output_tokens.append(result["tokens"])
+        self._correct.append(result["correct"])
+        if len(self._correct) >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._correct:
+            return
+        chunk = self.cost_model.accumulate(self.model, self._input_tokens, self._output_tokens, self._correct)
+        self.fpca = self.fpca.merge(chunk)
+        self._input_tokens, self._output_tokens, self._correct = [], [], []
+
+    def summary(self) -> Dict[str, Any]:
+        self.flush()
+        out = {**self.tpca.summary(), "cost_model": self.cost_model.resolve(self.model), **self.fpca.summary()}
+        if self.groups:
+            out["groups"] = {g.name: g.summary() for g in self.groups}
+        return out
+
+
+def _result_row(case: Case, tokens: int, ok: bool) -> Dict[str, Any]:
+    return {
+        "id": case.id,
+        "category": case.category,
+        "tokens": tokens,
+        "correct": ok,
+        "target_max_tokens": case.target_max_tokens,
+        "scoring_mode": case.scoring_mode,
+    }
+
+
+def grade_chunk(
+    chunk: List[Tuple[Case, str]],
+    counter: TokenCounter,
+    plans: Optional[PlanCache] = None,
+) -> List[Tuple[Dict[str, Any], int]]:
+    """
+    Grade a chunk of pairs with one batched token count over all outputs and prompts.
+    """
+    n = len(chunk)
+    counts = counter.count_batch([out for _, out in chunk] + [case.prompt for case, _ in chunk])
+    grade = (lambda case, out: plans.get(case).grade(out)) if plans is not None else grade_case
+    return [
+        (_result_row(case, counts[i], grade(case, out)), counts[n + i])
+        for i, (case, out) in enumerate(chunk)
+    ]
+
+
+def _split_cached(
+    chunk: List[Tuple[Case, str]],
+    counter: TokenCounter,
+    plans: PlanCache,
+    result_cache: Optional[ResultCache],
+) -> Tuple[List[Optional[bytes]], List[Optional[CachedGrade]], List[Tuple[Case, str]]]:
+    """
+    (result-cache keys, cached grades, pairs still to grade) for one chunk.
+    """
+    if result_cache is None:
+        return [None] * len(chunk), [None] * len(chunk), chunk
+    identity = counter.identity
+    keys: List[Optional[bytes]] = [
+        ResultCache.make_key(plans.key(case), identity, case.prompt, out) for case, out in chunk
+    ]
+    cached = [result_cache.get(k) for k in keys]
+    return keys, cached, [pair for pair, hit in zip(chunk, cached) if hit is None]
+
+
+def _join_cached(
+    chunk: List[Tuple[Case, str]],
+    keys: List[Optional[bytes]],
+    cached: List[Optional[CachedGrade]],
+    graded: List[Tuple[Dict[str, Any], int]],
+    result_cache: Optional[ResultCache],
+) -> Iterator[Tuple[Dict[str, Any], int]]:
+    fresh = iter(graded)
+    for (case, _), key, hit in zip(chunk, keys, cached):
+        if hit is None:
+            row, prompt_tokens = next(fresh)
+            if result_cache is not None:
+                result_cache.put(key, row["correct"], row["tokens"], prompt_tokens)
+            yield row, prompt_tokens
+        else:
+            ok, tokens, prompt_tokens = hit
+            yield _result_row(case, tokens, ok), prompt_tokens
+
+
+# -----------------------------
+# Parallel grading (process pool)
+# -----------------------------
+
+_WORKER_COUNTER: Optional[TokenCounter] = None
+_WORKER_PLANS: Optional[PlanCache] = None
+
+
+def _init_worker(tokenizer_model: Optional[str], plan_cache_path: Optional[str] = None) -> None:
+    # Encoders and plans are not shared across processes; each worker loads its own once.
+    # Workers read the on-disk plan cache but never write it: newly compiled
+    # plans go back to the parent with each chunk, which saves them.
+    global _WORKER_COUNTER, _WORKER_PLANS
+    _WORKER_COUNTER = TokenCounter.for_model(tokenizer_model)
+    _WORKER_PLANS = PlanCache(plan_cache_path)
+
+
+def _grade_chunk(
+    chunk: List[Tuple[Case, str]],
+) -> Tuple[List[Tuple[Dict[str, Any], int]], Dict[str, Dict[str, Any]]]:
+    graded = grade_chunk(chunk, _WORKER_COUNTER, _WORKER_PLANS)
+    return graded, _WORKER_PLANS.take_compiled()
+
+
+def _chunked(pairs: Iterable[Tuple[Case, str]], size: int) -> Iterator[List[Tuple[Case, str]]]:
+    chunk: List[Tuple[Case, str]] = []
+    for pair in pairs:
+        chunk.append(pair)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def grade_pairs(
+    pairs: Iterable[Tuple[Case, str]],
+    counter: Optional[TokenCounter] = None,
+    workers: int = 1,
+    chunk_size: int = 1_024,
+    plans: Optional[PlanCache] = None,
+    result_cache: Optional[ResultCache] = None,
+) -> Iterator[Tuple[Dict[str, Any], int]]:
+    """
+    Yield (result row, prompt tokens) for each (case, output) pair, in input order.
+
+    Pairs are graded in chunks so token counting is batched. workers > 1
+    grades chunks on a process pool; workers rebuild the counter from its
+    model name (no encoder => token proxy). At most 2 * workers chunks are
+    in flight, so memory stays bounded for streams.
+
+    With a ResultCache, cached pairs are answered in this process and only
+    misses are graded (and then added to the cache).
+    """
+    counter = counter if counter is not None else TokenCounter()
+    plans = plans if plans is not None else PlanCache()
+    if workers <= 1:
+        for chunk in _chunked(pairs, chunk_size):
+            keys, cached, todo = _split_cached(chunk, counter, plans, result_cache)
+            graded = grade_chunk(todo, counter, plans) if todo else []
+            yield from _join_cached(chunk, keys, cached, graded, result_cache)
+        return
+
+    tokenizer_model = counter.model if counter.encoder is not None else None
+    initargs = (tokenizer_model, plans.path)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as pool:
+        in_flight: deque = deque()
+
+        def drain_one() -> Iterator[Tuple[Dict[str, Any], int]]:
+            chunk, keys, cached, future = in_flight.popleft()
+            graded: List[Tuple[Dict[str, Any], int]] = []
+            if future is not None:
+                graded, compiled = future.result()
+                plans.add_compiled(compiled)
+            return _join_cached(chunk, keys, cached, graded, result_cache)
+
+        for chunk in _chunked(pairs, chunk_size):
+            keys, cached, todo = _split_cached(chunk, counter, plans, result_cache)
+            future = pool.submit(_grade_chunk, todo) if todo else None
+            in_flight.append((chunk, keys, cached, future))
+            if len(in_flight) >= 2 * workers:
+                yield from drain_one()
+        while in_flight:
+            yield from drain_one()
+
+
 def evaluate_outputs(
     cases: List[Case],
     outputs: Dict[str, str],
     encoder=None,
+    cost_model: Optional[CostModel] = None,
+    model: str = "gpt-4",
+    workers: int = 1,
+    chunk_size: int = 1_024,
+    plans: Optional[PlanCache] = None,
+    counter: Optional[TokenCounter] = None,
+    result_cache: Optional[ResultCache] = None,
+    group_by: Optional[GroupBy] = None,
+    token_buckets: Sequence[int] = DEFAULT_TOKEN_BUCKETS,
 ) -> Dict[str, Any]:
     results: List[Dict[str, Any]] = []
-    correct_count = 0
-    total_tokens = 0
-    correct_tokens = 0
-    overruns = 0
-    overrun_den = 0
-
-    for case in cases:
-        out = outputs.get(case.id, "")
-        tokens = token_count(out, encoder=encoder)
-        ok = grade_case(case, out)
-
-        total_tokens += tokens
-        if ok:
-            correct_count += 1
-            correct_tokens += tokens
-
-        if case.target_max_tokens is not None:
-            overrun_den += 1
-            if tokens > case.target_max_tokens:
-                overruns += 1
-
-        results.append(
+    acc = SummaryAccumulator(cost_model, model, group_by=group_by, token_buckets=token_buckets)
+
+    pairs = ((case, outputs.get(case.id, "")) for case in cases)
+    counter = counter if counter is not None else TokenCounter(model, encoder)
+    for result, input_tokens in grade_pairs(pairs, counter, workers, chunk_size, plans, result_cache):
+        # Summaries are rebuilt in case order, so float sums match the serial path bit for bit.
+        acc.add(result, input_tokens)
+        results.append(result)
+
+    return {"summary": acc.summary(), "results": results}
+
+
+def evaluate_stream(
+    cases: Iterable[Case],
+    outputs: Iterable[Tuple[str, str]],
+    results_out: IO[str],
+    encoder=None,
+    cost_model: Optional[CostModel] = None,
+    model: str = "gpt-4",
+    workers: int = 1,
+    chunk_size: int = 1_024,
+    plans: Optional[PlanCache] = None,
+    counter: Optional[TokenCounter] = None,
+    result_cache: Optional[ResultCache] = None,
+    group_by: Optional[GroupBy] = None,
+    token_buckets: Sequence[int] = DEFAULT_TOKEN_BUCKETS,
+) -> Dict[str, Any]:
+    """
+    Constant-memory evaluation.
+
+    `outputs` must follow the order of `cases` (missing outputs are allowed
+    and graded as ""). Each result row is written to `results_out` as one
+    JSON line as soon as it is graded; the summary is returned.
+
+    An output for a case that has already gone by (out of order), or, when
+    `cases` is a sequence, for no case at all, raises ValueError before any
+    later case is graded. Only the ids of cases seen so far are kept.
+    """
+    acc = SummaryAccumulator(cost_model, model, group_by=group_by, token_buckets=token_buckets)
+    known = {case.id for case in cases} if isinstance(cases, Sequence) else None
+    seen = set()
+    pending = iter(outputs)
+
+    def advance() -> Optional[Tuple[str, str]]:
+        item = next(pending, None)
+        if item is not None and (item[0] in seen or (known is not None and item[0] not in known)):
+            problem = "comes after its case" if item[0] in seen else "matches no case"
+            raise ValueError(f"output for case {item[0]!r} {problem}: outputs must follow case order")
+        return item
+
+    nxt = advance()
+
+    def pairs() -> Iterator[Tuple[Case, str]]:
+        nonlocal nxt
+        for case in cases:
+            seen.add(case.id)
+            out = ""
+            if nxt is not None and nxt[0] == case.id:
+                out = nxt[1]
+                nxt = advance()
+            yield case, out
+
+    counter = counter if counter is not None else TokenCounter(model, encoder)
+    for result, input_tokens in grade_pairs(pairs(), counter, workers, chunk_size, plans, result_cache):
+        acc.add(result, input_tokens)
+        results_out.write(json.dumps(result) + "\n")
+
+    if nxt is not None:
+        raise ValueError(
+            f"output for case {nxt[0]!r} was not consumed: outputs must follow case order"
+        )
+    return acc.summary()
+
+
+REPORT_FORMATS = ("json", "columnar")
+REPORT_SUFFIXES = {"json": ".json", "columnar": ".rzc"}
+# Result row fields and their column kinds in columnar reports.
+REPORT_COLUMNS = (
+    ("id", "string"),
+    ("category", "category"),
+    ("tokens", "int64"),
+    ("correct", "bool"),
+    ("target_max_tokens", "opt_int64"),
+    ("scoring_mode", "category"),
+)
+
+
+def write_report(report: Dict[str, Any], out_path: str, report_format: str = "json") -> None:
+    if report_format not in REPORT_FORMATS:
+        raise ValueError(f"unknown report format: {report_format!r}")
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    if report_format == "columnar":
+        write_columnar_report(report, out_path)
+        return
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+
+def write_columnar_report(report: Dict[str, Any], out_path: str) -> None:
+    """
+    {"summary", "results"} report as a columnar file: one typed column per
+    result field, everything else (summary, CIs) in the JSON header.
+    """
+    results = report["results"]
+    columns = {name: (kind, [r[name] for r in results]) for name, kind in REPORT_COLUMNS}
+    write_columnar(out_path, columns, meta={k: v for k, v in report.items() if k != "results"})
+
+
+def load_columnar_report(path: str) -> ColumnarFile:
+    """
+    Memory-mapped columnar report. `.meta["summary"]` holds the summary;
+    `.raw("tokens")` is a zero-copy array; `.select(where={"category": "Math",
+    "correct": False})` decodes only matching rows.
+    """
+    return ColumnarFile(path)
+
+
+def read_columnar_report(path: str, where: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Columnar report back in the JSON report shape, optionally filtered.
+    """
+    with load_columnar_report(path) as f:
+        return {**f.meta, "results": list(f.iter_rows(where))}
+
+
+def write_stream_report(
+    cases: Iterable[Case],
+    outputs: Iterable[Tuple[str, str]],
+    out_path: str,
+    encoder=None,
+    cost_model: Optional[CostModel] = None,
+    model: str = "gpt-4",
+    workers: int = 1,
+    chunk_size: int = 1_024,
+    plans: Optional[PlanCache] = None,
+    counter: Optional[TokenCounter] = None,
+    result_cache: Optional[ResultCache] = None,
+    group_by: Optional[GroupBy] = None,
+    token_buckets: Sequence[int] = DEFAULT_TOKEN_BUCKETS,
+) -> Dict[str, Any]:
+    """
+    JSONL report: one result row per line, then a final {"summary": ...} line.
+    Rows go to a temporary file that replaces `out_path` only on success, so
+    a failed run leaves no partial report.
+    """
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    tmp_path = out_path + ".partial"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            summary = evaluate_stream(
+                cases, outputs, f, encoder=encoder, cost_model=cost_model, model=model,
+                workers=workers, chunk_size=chunk_size, plans=plans, counter=counter,
+                result_cache=result_cache, group_by=group_by, token_buckets=token_buckets,
+            )
+            f.write(json.dumps({"summary": summary}) + "\n")
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, out_path)
+    return summary
+
+
+# -----------------------------
+# Matrix mode (model x condition x repetition)
+# -----------------------------
+
+_CELL_STEM_RE = re.compile(r"^(?P<model>.+)__(?P<condition>.+)__r(?P<repetition>\d+)$")
+
+
+@dataclass
+class MatrixCell:
+    model: str
+    condition: str
+    repetition: int
+    outputs_path: str
+
+    @property
+    def stem(self) -> str:
+        safe_model = re.sub(r"[^A-Za-z0-9._-]", "_", self.model)
+        return f"{safe_model}__{self.condition}__r{self.repetition}"
+
+
+def discover_cells(source: str) -> List[MatrixCell]:
+    """
+    Matrix cells from either
+    - a directory of `<model>__<condition>__r<N>.outputs.json[l]` files
+      (the runner's evaluations/ layout), or
+    - a JSON manifest: a list (or {"cells": [...]}) of
+      {"model", "condition", "repetition", "outputs"}; relative outputs
+      paths are resolved against the manifest's directory.
+    """
+    cells: List[MatrixCell] = []
+    if os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            for suffix in (".outputs.json", ".outputs.jsonl"):
+                if name.endswith(suffix):
+                    stem = name[: -len(suffix)]
+                    m = _CELL_STEM_RE.match(stem)
+                    if m is None:
+                        raise ValueError(f"cannot parse model/condition/repetition from {name!r}")
+                    cells.append(
+                        MatrixCell(m["model"], m["condition"], int(m["repetition"]), os.path.join(source, name))
+                    )
+        return cells
+
+    with open(source, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+    base = os.path.dirname(source)
+    for item in raw["cells"] if isinstance(raw, dict) else raw:
+        cells.append(
+            MatrixCell(
+                model=item["model"],
+                condition=item["condition"],
+                repetition=int(item.get("repetition", 1)),
+                outputs_path=os.path.join(base, item["outputs"]),
+            )
+        )
+    return cells
+
+
+def describe_counts(counts: Dict[int, int]) -> Dict[str, Any]:
+    """
+    count / min / max / mean / median / population std / range of a value histogram.
+    """
+    n = sum(counts.values())
+    if not n:
+        return {
+            "count": 0, "minimum": None, "maximum": None, "mean": None,
+            "median": None, "populationStandardDeviation": None, "observedRange": None,
+        }
+    values = sorted(counts)
+    mean = sum(v * c for v, c in counts.items()) / n
+    variance = sum(c * (v - mean) ** 2 for v, c in counts.items()) / n
+
+    def kth(k: int) -> int:
+        seen = 0
+        for v in values:
+            seen += counts[v]
+            if seen > k:
+                return v
+        return values[-1]
+
+    median = kth(n // 2) if n % 2 else (kth(n // 2 - 1) + kth(n // 2)) / 2
+    return {
+        "count": n,
+        "minimum": values[0],
+        "maximum": values[-1],
+        "mean": mean,
+        "median": median,
+        "populationStandardDeviation": math.sqrt(variance),
+        "observedRange": values[-1] - values[0],
+    }
+
+
+def evaluate_matrix(
+    cases: List[Case],
+    cells: List[MatrixCell],
+    out_dir: str,
+    cost_model: Optional[CostModel] = None,
+    workers: int = 1,
+    chunk_size: int = 1_024,
+    plans: Optional[PlanCache] = None,
+    result_cache: Optional[ResultCache] = None,
+    bootstrap: int = 0,
+    confidence: float = 0.95,
+    seed: int = 0,
+    baseline_condition: Optional[str] = None,
+    group_by: Optional[GroupBy] = None,
+    token_buckets: Sequence[int] = DEFAULT_TOKEN_BUCKETS,
+    report_format: str = "json",
+) -> Dict[str, Any]:
+    """
+    Grade every cell in one process, sharing parsed cases, grading plans and
+    warm encoders (each cell's model doubles as its tokenizer model, as in
+    the runner). Writes `<stem>.report.json` (or `.report.rzc` for columnar
+    reports) per cell to `out_dir` and returns the per (model, condition)
+    aggregate.
+
+    bootstrap > 0 adds CIs to each aggregate and paired comparisons of every
+    condition against `baseline_condition` (default: each model's first
+    condition). Both resample cases, not rows: every drawn case brings all
+    of its repetitions, and comparisons pair conditions on case id.
+
+    With `group_by`, per-cell group counts are merged into each aggregate.
+    """
+    plans = plans if plans is not None else PlanCache()
+    groups: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    # Per-row results are only retained when bootstrapping needs them.
+    rows: Dict[Tuple[str, str], Dict[Tuple[int, str], Dict[str, Any]]] = {}
+    cell_index: List[Dict[str, Any]] = []
+
+    by_model: Dict[str, List[MatrixCell]] = {}
+    for cell in cells:
+        by_model.setdefault(cell.model, []).append(cell)
+
+    for model, model_cells in by_model.items():
+        counter = TokenCounter.for_model(model)
+
+        def pairs() -> Iterator[Tuple[Case, str]]:
+            for cell in model_cells:
+                outputs = dict(iter_outputs(cell.outputs_path))
+                for case in cases:
+                    yield case, outputs.get(case.id, "")
+
+        graded = grade_pairs(pairs(), counter, workers, chunk_size, plans, result_cache)
+        for cell in model_cells:
+            acc = SummaryAccumulator(cost_model, model, group_by=group_by, token_buckets=token_buckets)
+            results: List[Dict[str, Any]] = []
+            for _ in range(len(cases)):
+                result, input_tokens = next(graded)
+                acc.add(result, input_tokens)
+                results.append(result)
+
+            report_path = os.path.join(out_dir, f"{cell.stem}.report{REPORT_SUFFIXES[report_format]}")
+            write_report({"summary": acc.summary(), "results": results}, report_path, report_format)
+            cell_index.append(
+                {
+                    "model": cell.model,
+                    "conditionId": cell.condition,
+                    "repetition": cell.repetition,
+                    "outputsPath": cell.outputs_path,
+                    "reportPath": report_path,
+                }
+            )
+
+            group = groups.setdefault(
+                (cell.model, cell.condition),
+                {"repetitions": 0, "tpca": TPCAAccumulator(), "tokens": {}, "groups": None},
+            )
+            group["repetitions"] += 1
+            group["tpca"] = group["tpca"] + acc.tpca
+            if acc.groups:
+                prev = group["groups"]
+                group["groups"] = acc.groups if prev is None else [a + b for a, b in zip(prev, acc.groups)]
+            for r in results:
+                group["tokens"][r["tokens"]] = group["tokens"].get(r["tokens"], 0) + 1
+            if bootstrap > 0:
+                keyed = rows.setdefault((cell.model, cell.condition), {})
+                keyed.update(((cell.repetition, r["id"]), r) for r in results)
+        # Every row has been consumed; let the pool (if any) shut down now.
+        graded.close()
+
+    aggregates = []
+    for (model, condition), group in groups.items():
+        tpca: TPCAAccumulator = group["tpca"]
+        aggregates.append(
             {
-                "id": case.id,
-                "category": case.category,
-                "tokens": tokens,
-                "correct": ok,
-                "target_max_tokens": case.target_max_tokens,
-                "scoring_mode": case.scoring_mode,
+                "model": model,
+                "conditionId": condition,
+                "repetitionCount": group["repetitions"],
+                "observationCount": tpca.observations,
+                "correctAnswerCount": tpca.correct,
+                "accuracy": tpca.accuracy if tpca.observations else None,
+                "visibleOutputTokens": tpca.total_tokens,
+                "tokensPerCorrectAnswer": tpca.tpca,
+                "expressionOverrunRate": tpca.overrun_rate,
+                "descriptiveStatistics": {
+                    "visibleOutputTokensPerObservation": describe_counts(group["tokens"]),
+                },
             }
         )
+        if group["groups"]:
+            aggregates[-1]["groups"] = {g.name: g.summary() for g in group["groups"]}
+        if bootstrap > 0:
+            aggregates[-1]["confidenceIntervals"] = bootstrap_ci(
+                _case_columns(rows[(model, condition)])[1], bootstrap, confidence, seed
+            )
 
-    n = len(cases)
-    accuracy = (correct_count / n) if n else 0.0
-    tpca = (correct_tokens / correct_count) if correct_count else None  # tokens per correct answer
-    eor = (overruns / overrun_den) if overrun_den else None  # expression overrun rate
-
-    summary = {
-        "num_cases": n,
-        "num_correct": correct_count,
-        "accuracy": accuracy,
-        "tpca": tpca,
-        "expression_overrun_rate": eor,
-        "total_tokens": total_tokens,
+    out = {
+        "aggregationMethod": (
+            f"Descriptive aggregation across repetitions and {len(cases)} cases "
+            "for each model and condition."
+        ),
+        "aggregates": aggregates,
+        "cells": cell_index,
     }
+    if bootstrap > 0:
+        out["comparisons"] = _paired_comparisons(rows, bootstrap, confidence, seed, baseline_condition)
+    return out
 
-    return {"summary": summary, "results": results}
 
+def _case_columns(rows: Dict[Tuple[int, str], Dict[str, Any]]) -> Tuple[List[str], Any]:
+    """
+    (sorted case ids, metric columns summed over each case's repetitions).
+    """
+    return cluster_columns(columns_from_results(rows.values()), [case_id for _, case_id in rows])
 
-def write_report(report: Dict[str, Any], out_path: str) -> None:
-    os.makedirs(os.path.dirname(out_path), exist_ok=True)
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(report, f, indent=2)
+
+def _paired_comparisons(
+    rows: Dict[Tuple[str, str], Dict[Tuple[int, str], Dict[str, Any]]],
+    resamples: int,
+    confidence: float,
+    seed: int,
+    baseline_condition: Optional[str],
+) -> List[Dict[str, Any]]:
+    conditions: Dict[str, List[str]] = {}
+    for model, condition in rows:
+        conditions.setdefault(model, []).append(condition)
+
+    comparisons = []
+    for model, names in conditions.items():
+        baseline = baseline_condition or names[0]
+        if baseline not in names:
+            continue
+        base_ids, base_cols = _case_columns(rows[(model, baseline)])
+        base_index = {case_id: i for i, case_id in enumerate(base_ids)}
+        for condition in names:
+            if condition == baseline:
+                continue
+            treat_ids, treat_cols = _case_columns(rows[(model, condition)])
+            paired = [(base_index[c], i) for i, c in enumerate(treat_ids) if c in base_index]
+            if not paired:
+                continue
+            base_idx, treat_idx = (list(ix) for ix in zip(*paired))
+            comparisons.append(
+                {
+                    "model": model,
+                    "baselineConditionId": baseline,
+                    "conditionId": condition,
+                    "pairedCaseCount": len(paired),
+                    "differences": paired_bootstrap(
+                        base_cols[base_idx], treat_cols[treat_idx], resamples, confidence, seed,
+                    ),
+                }
+            )
+    return comparisons
+
+
+def add_confidence_intervals(
+    report: Dict[str, Any],
+    resamples: int = 10_000,
+    confidence: float = 0.95,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """
+    Attach bootstrap CIs for accuracy / TPCA / overrun rate to report["summary"].
+    """
+    report["summary"]["confidence_intervals"] = bootstrap_ci(
+        columns_from_results(report["results"]), resamples, confidence, seed
+    )
+    return report
+
+
+# -----------------------------
+# Online evaluation (events graded as they arrive)
+# -----------------------------
+
+@dataclass
+class OnlineEvent:
+    case_id: str
+    output: str
+    model: Optional[str] = None  # tokenizer / cost model; the evaluator's model when None
+    condition: Optional[str] = None
+
+
+EventLike = Union[OnlineEvent, Tuple[str, str]]
+
+
+class OnlineEvaluator:
+    """
+    Grades (case_id, output) events as they arrive and keeps a live summary
+    per (model, condition) group, e.g. while a run is still writing
+    attempts.jsonl.
+
+    Events come from submit(), consume() (any iterable, e.g.
+    follow_attempts()) or consume_queue() (an asyncio.Queue). snapshot() is
+    safe to call from another thread for dashboards; `until(evaluator)` on
+    the consume methods is checked after every event for early stopping.
+    Summaries match the batch evaluator for the same rows.
+    """
+
+    def __init__(
+        self,
+        cases: Iterable[Case],
+        cost_model: Optional[CostModel] = None,
+        model: str = "gpt-4",
+        plans: Optional[PlanCache] = None,
+        group_by: Optional[GroupBy] = None,
+        token_buckets: Sequence[int] = DEFAULT_TOKEN_BUCKETS,
+        on_result: Optional[Callable[[Dict[str, Any], OnlineEvent], None]] = None,
+    ):
+        self.cases = {case.id: case for case in cases}
+        self.cost_model = cost_model or CostModel()
+        self.model = model
+        self.plans = plans if plans is not None else PlanCache()
+        self.group_by = group_by
+        self.token_buckets = token_buckets
+        self.on_result = on_result
+        self.events = 0
+        self.unknown_cases = 0
+        self._counters: Dict[str, TokenCounter] = {}
+        self._groups: "OrderedDict[Tuple[str, Optional[str]], SummaryAccumulator]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _counter(self, model: str) -> TokenCounter:
+        counter = self._counters.get(model)
+        if counter is None:
+            counter = self._counters[model] = TokenCounter.for_model(model)
+        return counter
+
+    def submit(self, event: EventLike) -> Optional[Dict[str, Any]]:
+        """
+        Grade one event; returns its result row, or None for unknown case ids.
+        """
+        if not isinstance(event, OnlineEvent):
+            event = OnlineEvent(*event)
+        model = event.model or self.model
+        case = self.cases.get(event.case_id)
+        with self._lock:
+            self.events += 1
+            if case is None:
+                self.unknown_cases += 1
+                return None
+            result, input_tokens = grade_chunk([(case, event.output or "")], self._counter(model), self.plans)[0]
+            acc = self._groups.get((model, event.condition))
+            if acc is None:
+                acc = SummaryAccumulator(
+                    self.cost_model, model, group_by=self.group_by, token_buckets=self.token_buckets
+                )
+                self._groups[(model, event.condition)] = acc
+            acc.add(result, input_tokens)
+        if self.on_result is not None:
+            self.on_result(result, event)
+        return result
+
+    def consume(
+        self,
+        events: Iterable[EventLike],
+        until: Optional[Callable[["OnlineEvaluator"], bool]] = None,
+    ) -> "OnlineEvaluator":
+        for event in events:
+            self.submit(event)
+            if until is not None and until(self):
+                break
+        return self
+
+    async def consume_queue(
+        self,
+        queue: "asyncio.Queue",
+        until: Optional[Callable[["OnlineEvaluator"], bool]] = None,
+    ) -> "OnlineEvaluator":
+        """
+        Grade events from `queue` until a None sentinel (or `until`) ends the stream.
+        """
+        while True:
+            event = await queue.get()
+            try:
+                if event is None:
+                    break
+                self.submit(event)
+            finally:
+                queue.task_done()
+            if until is not None and until(self):
+                break
+        return self
+
+    def summary(self, model: Optional[str] = None, condition: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Live summary of one (model, condition) group, or None before its first event.
+        """
+        with self._lock:
+            acc = self._groups.get((model or self.model, condition))
+            return acc.summary() if acc is not None else None
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "events": self.events,
+                "unknownCases": self.unknown_cases,
+                "groups": [
+                    {"model": model, "conditionId": condition, "summary": acc.summary()}
+                    for (model, condition), acc in self._groups.items()
+                ],
+            }
+
+
+def follow_jsonl(
+    path: str,
+    poll_interval: float = 0.25,
+    idle_timeout: Optional[float] = None,
+    stop: Optional[Callable[[], bool]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Tail-follow a JSONL file that another process is appending to, yielding
+    each record once its line is complete. Waits for the file to appear,
+    restarts from the top if it is truncated, and ends after `idle_timeout`
+    seconds without new lines (None = never) or once `stop()` is true.
+    """
+    pos = 0
+    partial = b""
+    idle_since = time.monotonic()
+    while stop is None or not stop():
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        if size < pos:
+            pos, partial = 0, b""
+        data = b""
+        if size > pos:
+            with open(path, "rb") as f:
+                f.seek(pos)
+                data = f.read(size - pos)
+            pos += len(data)
+        lines = (partial + data).split(b"\n")
+        partial = lines.pop()
+        records = [json.loads(line) for line in lines if line.strip()]
+        if records:
+            idle_since = time.monotonic()
+            yield from records
+            continue
+        if idle_timeout is not None and time.monotonic() - idle_since >= idle_timeout:
+            return
+        time.sleep(poll_interval)
+
+
+def attempt_events(records: Iterable[Dict[str, Any]]) -> Iterator[OnlineEvent]:
+    """
+    Runner attempt records -> events. As in the runner's own evaluation,
+    only successful attempts count; failed (retried) attempts are skipped.
+    """
+    for record in records:
+        if record.get("recordType") != "openai-api-attempt" or record.get("error"):
+            continue
+        status = record.get("httpStatus")
+        if status is not None and not 200 <= status < 300:
+            continue
+        yield OnlineEvent(
+            case_id=record["caseId"],
+            output=record.get("visibleOutput") or "",
+            model=record.get("requestedModel"),
+            condition=record.get("conditionId"),
+        )
+
+
+def follow_attempts(path: str, **follow_kwargs: Any) -> Iterator[OnlineEvent]:
+    """
+    Events from a runner's raw/attempts.jsonl while it is being written.
+    """
+    return attempt_events(follow_jsonl(path, **follow_kwargs))
+
+
+def print_online_progress(snapshot: Dict[str, Any]) -> None:
+    print(f"[{snapshot['events']} events, {snapshot['unknownCases']} unknown cases]")
+    for g in snapshot["groups"]:
+        s = g["summary"]
+        tpca = "N/A" if s["tpca"] is None else f"{s['tpca']:.2f}"
+        print(f"  {g['model']}/{g['conditionId']}: n={s['num_cases']} accuracy {s['accuracy']:.2%}, TPCA {tpca}")
 
 
 def print_summary(summary: Dict[str, Any]) -> None:
@@ -218,27 +1357,193 @@ def print_summary(summary: Dict[str, Any]) -> None:
         print(f"Expression overrun rate:{summary['expression_overrun_rate']:.2%}")
     else:
         print("Expression overrun rate:N/A (no token targets set)")
-    print(f"Total tokens (all):     {summary['total_tokens']}\n")
+    print(f"Total tokens (all):     {summary['total_tokens']}")
+    if "fpca" in summary:
+        print(f"Cost model:             {summary['cost_model']}")
+        if summary["fpca"] is not None:
+            print(f"FPCA (FLOPs/correct):   {summary['fpca']:.3e}")
+            print(f"Latency/correct (ms):   {summary['latency_per_correct_ms']:.1f}")
+        else:
+            print("FPCA (FLOPs/correct):   N/A (no correct answers)")
+        print(f"Total FLOPs (all):      {summary['total_flops']:.3e}")
+    for name, groups in summary.get("groups", {}).items():
+        print(f"\n--- By {name} ---")
+        for key, g in groups.items():
+            tpca = "N/A" if g["tpca"] is None else f"{g['tpca']:.2f}"
+            overrun = "N/A" if g["expression_overrun_rate"] is None else f"{g['expression_overrun_rate']:.2%}"
+            print(f"{key:<24}n={g['num_cases']:<8} acc={g['accuracy']:.2%}  tpca={tpca}  overrun={overrun}")
+    if "confidence_intervals" in summary:
+        print()
+        labels = {"accuracy": "Accuracy", "tpca": "TPCA", "expression_overrun_rate": "Overrun rate"}
+        for metric, ci in summary["confidence_intervals"].items():
+            if ci["estimate"] is not None:
+                print(f"{labels[metric] + ' CI:':<24}[{ci['low']:.4g}, {ci['high']:.4g}]")
+    print()
 
 
 def main():
     p = argparse.ArgumentParser(description="Robbie’s Razor Evaluator (v0).")
     p.add_argument("--cases", default="benchmarks/cases/razor_eval_v0.json", help="Path to JSON cases file.")
-    p.add_argument("--outputs", required=True, help="Path to JSON outputs mapping {case_id: model_output}.")
+    p.add_argument("--outputs", default=None, help="Path to JSON outputs mapping {case_id: model_output}.")
     p.add_argument("--model", default="gpt-4", help="Tokenizer model name (tiktoken) if available.")
     p.add_argument("--report-out", default="benchmarks/reports/latest.json", help="Where to write the JSON report.")
+    p.add_argument(
+        "--report-format",
+        choices=REPORT_FORMATS,
+        default="json",
+        help="json (indented) or columnar (typed binary, memory-mappable; not with --stream).",
+    )
+    p.add_argument("--cost-table", default=None, help="Optional JSON per-model cost table for FPCA proxies.")
+    p.add_argument(
+        "--stream",
+        action="store_true",
+        help="Constant-memory mode: JSONL cases/outputs (outputs in case order), JSONL report.",
+    )
+    p.add_argument("--workers", type=int, default=1, help="Grade on a process pool of N workers.")
+    p.add_argument(
+        "--chunk-size",
+        type=int,
+        default=1024,
+        help="Cases per batched token count; also the unit of work handed to each of --workers.",
+    )
+    p.add_argument("--plan-cache", default=None, help="JSON file of compiled grading plans, reused across runs.")
+    p.add_argument(
+        "--result-cache",
+        default=None,
+        help="Binary cache of per-pair grades; reruns only regrade new or changed pairs.",
+    )
+    p.add_argument(
+        "--matrix",
+        default=None,
+        help="Directory of <model>__<condition>__r<N>.outputs.json files, or a JSON manifest of cells.",
+    )
+    p.add_argument("--matrix-out", default="benchmarks/reports/matrix", help="Output directory for --matrix.")
+    p.add_argument("--bootstrap", type=int, default=0, help="Bootstrap resamples for CIs (0 = off; needs NumPy).")
+    p.add_argument("--confidence", type=float, default=0.95, help="CI level for --bootstrap.")
+    p.add_argument("--seed", type=int, default=0, help="Random seed for --bootstrap.")
+    p.add_argument("--baseline-condition", default=None, help="Baseline for paired comparisons in --matrix mode.")
+    p.add_argument("--follow", default=None, help="Tail-follow a runner attempts.jsonl and grade it live.")
+    p.add_argument(
+        "--follow-idle-timeout",
+        type=float,
+        default=60.0,
+        help="Stop --follow after this many seconds without new attempts.",
+    )
+    p.add_argument("--progress-every", type=float, default=5.0, help="Seconds between live --follow summaries.")
+    p.add_argument(
+        "--group-by",
+        action="append",
+        default=None,
+        help="Comma-separated group fields (category, scoring_mode, token_bucket, target_max_tokens); repeatable.",
+    )
+    p.add_argument(
+        "--token-buckets",
+        default=",".join(str(e) for e in DEFAULT_TOKEN_BUCKETS),
+        help="Comma-separated bucket edges for the token_bucket group field.",
+    )
     args = p.parse_args()
+    if not args.outputs and not args.matrix and not args.follow:
+        p.error("one of --outputs, --matrix or --follow is required")
+    if args.bootstrap and args.stream:
+        p.error("--bootstrap needs per-case rows in memory and cannot be combined with --stream")
+    if args.report_format != "json" and args.stream:
+        p.error("--stream writes JSONL reports; --report-format columnar is not supported with it")
+    group_by = [[f.strip() for f in spec.split(",") if f.strip()] for spec in args.group_by or ()]
+    token_buckets = [int(e) for e in args.token_buckets.split(",") if e.strip()]
+    groups = {"group_by": group_by, "token_buckets": token_buckets}
+
+    cost_model = CostModel.from_json(args.cost_table) if args.cost_table else CostModel()
+    plans = PlanCache(args.plan_cache)
+    result_cache = ResultCache(args.result_cache) if args.result_cache else None
+
+    if args.follow:
+        online = OnlineEvaluator(load_cases(args.cases), cost_model=cost_model, model=args.model, plans=plans, **groups)
+        last_print = time.monotonic()
+
+        def progress(ev: OnlineEvaluator) -> bool:
+            nonlocal last_print
+            if time.monotonic() - last_print >= args.progress_every:
+                last_print = time.monotonic()
+                print_online_progress(ev.snapshot())
+            return False
 
-    cases = load_cases(args.cases)
-    with open(args.outputs, "r", encoding="utf-8") as f:
-        outputs = json.load(f)
+        print(f"\nFollowing {args.follow} (stops after {args.follow_idle_timeout:g}s without new attempts)...")
+        online.consume(follow_attempts(args.follow, idle_timeout=args.follow_idle_timeout), until=progress)
+        snapshot = online.snapshot()
+        write_report(snapshot, args.report_out)
+        plans.save()
+        print_online_progress(snapshot)
+        print(f"Live summary written to: {args.report_out}\n")
+        return
+
+    if args.matrix:
+        cells = discover_cells(args.matrix)
+        aggregate = evaluate_matrix(
+            load_cases(args.cases), cells, args.matrix_out, cost_model=cost_model,
+            workers=args.workers, chunk_size=args.chunk_size, plans=plans, result_cache=result_cache,
+            bootstrap=args.bootstrap, confidence=args.confidence, seed=args.seed,
+            baseline_condition=args.baseline_condition, report_format=args.report_format, **groups,
+        )
+        aggregate_path = os.path.join(args.matrix_out, "aggregate-summary.json")
+        write_report(aggregate, aggregate_path)
+        plans.save()
+        if result_cache is not None:
+            result_cache.save()
+        print(f"\nGraded {len(cells)} cells into {len(aggregate['aggregates'])} model/condition groups.")
+        for a in aggregate["aggregates"]:
+            accuracy = "N/A" if a["accuracy"] is None else f"{a['accuracy']:.2%}"
+            tpca = "N/A" if a["tokensPerCorrectAnswer"] is None else f"{a['tokensPerCorrectAnswer']:.2f}"
+            print(f"  {a['model']}/{a['conditionId']}: accuracy {accuracy}, TPCA {tpca}")
+        for c in aggregate.get("comparisons", []):
+            d = c["differences"]["accuracy"]
+            if d["estimate"] is not None:
+                print(
+                    f"  {c['model']}: {c['conditionId']} - {c['baselineConditionId']} accuracy "
+                    f"{d['estimate']:+.2%} [{d['low']:+.2%}, {d['high']:+.2%}]"
+                )
+        print(f"Aggregate written to: {aggregate_path}\n")
+        return
+
+    counter = TokenCounter.for_model(args.model)
+
+    if args.stream:
+        summary = write_stream_report(
+            iter_cases(args.cases),
+            iter_outputs(args.outputs),
+            args.report_out,
+            cost_model=cost_model,
+            model=args.model,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            plans=plans,
+            counter=counter,
+            result_cache=result_cache,
+            **groups,
+        )
+    else:
+        cases = load_cases(args.cases)
+        with open(args.outputs, "r", encoding="utf-8") as f:
+            outputs = json.load(f)
+
+        report = evaluate_outputs(
+            cases, outputs, cost_model=cost_model, model=args.model,
+            workers=args.workers, chunk_size=args.chunk_size, plans=plans, counter=counter,
+            result_cache=result_cache, **groups,
+        )
+        if args.bootstrap:
+            add_confidence_intervals(report, args.bootstrap, args.confidence, args.seed)
+        write_report(report, args.report_out, args.report_format)
+        summary = report["summary"]
 
-    encoder = try_get_tiktoken_encoder(args.model)
-    report = evaluate_outputs(cases, outputs, encoder=encoder)
-    write_report(report, args.report_out)
-    print_summary(report["summary"])
+    plans.save()
+    if result_cache is not None:
+        result_cache.save()
+    print_summary(summary)
     print(f"Report written to: {args.report_out}\n")
-    if encoder is None:
+    if result_cache is not None:
+        stats = result_cache.get_stats()
+        print(f"Result cache: {stats['hits']} reused, {stats['misses']} graded ({stats['entries']} entries)\n")
+    if counter.encoder is None:
         print("Note: tiktoken not available; using deterministic token proxy (len(text)/4).\n")
 
 
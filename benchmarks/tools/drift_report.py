@@ -0,0 +1,88 @@
+"""
+Drift Report for Robbie’s Razor benchmark runs
+
+Streams an attempts.jsonl file (one attempt record per line) and reports,
+per model and condition, how often answers to the same case disagree
+across repetitions:
+
+- inconsistency rate (1 - modal answer share, averaged over cases)
+- flip rate (answer changes between consecutive repetitions)
+- answer entropy (bits)
+- share of cases with more than one distinct answer
+
+and, per model, how each condition's answers to the same cases differ from
+a baseline condition (--baseline-condition, default: the first seen):
+
+- total variation distance between the answer distributions
+- share of cases whose modal answer changed
+
+Records are consumed one line at a time; memory is bounded by the number of
+(model, condition, case) keys, not by the file size, and --max-keys caps
+those keys.
+
+Usage (from the repository root):
+  python -m benchmarks.tools.drift_report --attempts results/v0.1.0/runs/<run>/raw/attempts.jsonl
+
+Author: Robbie George
+Governed by MRD v1.8 and ACR.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+
+from src.razor.metrics import DriftTracker
+
+
+def build_tracker(attempts_path: str, max_distinct: int = 16, max_keys: int = 1_000_000) -> DriftTracker:
+    tracker = DriftTracker(max_distinct=max_distinct, max_keys=max_keys)
+    with open(attempts_path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                tracker.update_attempt(json.loads(line))
+    return tracker
+
+
+def main():
+    p = argparse.ArgumentParser(description="Per-model/condition answer drift from attempts.jsonl.")
+    p.add_argument("--attempts", required=True, help="Path to attempts.jsonl.")
+    p.add_argument("--max-distinct", type=int, default=16, help="Distinct answers tracked per case before overflow.")
+    p.add_argument(
+        "--max-keys", type=int, default=1_000_000, help="(model, condition, case) keys tracked before dropping."
+    )
+    p.add_argument(
+        "--baseline-condition", default=None, help="Condition compared against (default: each model's first)."
+    )
+    p.add_argument("--json", action="store_true", help="Print the summary as JSON.")
+    args = p.parse_args()
+
+    tracker = build_tracker(args.attempts, args.max_distinct, args.max_keys)
+    summary = tracker.summary()
+    cross = tracker.cross_condition_summary(args.baseline_condition)
+
+    if args.json:
+        print(json.dumps({"within_condition": summary, "cross_condition": cross}, indent=2))
+        return
+
+    print("\n=== Razor Drift Report ===\n")
+    for group, s in summary.items():
+        print(f"{group}")
+        print(f"  Cases / observations:   {s['cases']} / {s['observations']}")
+        print(f"  Inconsistency rate:     {s['inconsistency_rate']:.2%}")
+        print(f"  Flip rate:              {s['flip_rate']:.2%}")
+        print(f"  Entropy (bits):         {s['entropy_bits']:.3f}")
+        print(f"  Unstable case share:    {s['unstable_case_share']:.2%}\n")
+    for pair, s in cross.items():
+        print(f"{pair}")
+        print(f"  Shared cases:           {s['cases']}")
+        print(f"  Total variation:        {s['total_variation']:.3f}")
+        print(f"  Modal answer changed:   {s['modal_change_share']:.2%}")
+        print(f"  Drifted case share:     {s['drifted_case_share']:.2%}\n")
+    if tracker.dropped:
+        print(f"Note: {tracker.dropped} observations of keys beyond --max-keys were not tracked.\n")
+
+
+if __name__ == "__main__":
+    main()
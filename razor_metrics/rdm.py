@@ -38,3 +38,52 @@ def compute_rdm(steps):
         "RDM": rdm,
         "RDM_star": rdm_star,
     }
+
+
+class OnlineRDM:
+    """
+    Streaming equivalent of compute_rdm: update() one step at a time and read
+    result() at any point. Keeps only the previous embedding and running sums,
+    so memory is O(1) per run regardless of run length.
+
+    Steps without an embedding contribute delta_t = 0 and leave the previous
+    embedding in place.
+    """
+
+    def __init__(self):
+        self._prev = None
+        self._seen = 0
+        self.D_T = 0.0
+        self.C_T = 0.0
+        self._boundary_sum = 0.0
+        self._n = 0
+
+    def update(self, step):
+        emb = step.get("embedding")
+        self._seen += 1
+        if self._seen == 1:
+            self._prev = emb
+            return
+
+        if emb is not None and self._prev is not None:
+            delta = float(cosine_distance(self._prev, emb))
+        else:
+            delta = 0.0
+        if emb is not None:
+            self._prev = emb
+
+        self.D_T += delta
+        self.C_T += float(step["cost"])
+        self._boundary_sum += boundary_score({**step, "delta_t": delta})
+        self._n += 1
+
+    def result(self):
+        A = self._boundary_sum / self._n if self._n else float("nan")
+        rdm = self.D_T / max(self.C_T, 1e-9)
+        return {
+            "D_T": self.D_T,
+            "C_T": self.C_T,
+            "A": A,
+            "RDM": rdm,
+            "RDM_star": rdm * (1 - A),
+        }
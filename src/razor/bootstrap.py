@@ -0,0 +1,188 @@
+"""
+Razor Bootstrap Confidence Intervals
+
+Purpose:
+- Percentile bootstrap CIs for accuracy, TPCA and expression overrun rate
+- Paired comparisons between two conditions over the same cases
+
+All three metrics are ratios of column sums over per-case rows
+(1, correct, correct * tokens, overrun-eligible, overrun), so a resample
+only needs those sums. Rows are collapsed to their distinct values, and
+each resample is drawn as multinomial counts over the distinct rows (the
+exact bootstrap distribution). The cost is O(resamples * distinct rows),
+not O(resamples * cases), so 10k resamples over a million cases take
+seconds. Paired rows collapse less well; when most rows are distinct the
+resample falls back to index draws, which is O(resamples * cases).
+
+Repeated measurements of the same case (repetitions) are not independent:
+cluster_columns() sums each case's rows into one, so resampling the summed
+rows draws whole cases and carries all of their repetitions along (a
+cluster bootstrap), and paired comparisons line up on case alone.
+
+Requires NumPy.
+
+Author: Robbie George
+Governed by MRD v1.8 and the Authorship Conservation Rule (ACR).
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+METRICS = ("accuracy", "tpca", "expression_overrun_rate")
+_WIDTH = 5  # ones, correct, correct_tokens, eligible, overrun
+# Multinomial draws cost ~10x an index draw per row, so they pay off only
+# when rows collapse to under a tenth as many distinct values.
+_MULTINOMIAL_RATIO = 10
+# Upper bound on the (resamples x distinct rows) weight block held at once.
+_MAX_WEIGHTS = 1 << 24
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("bootstrap confidence intervals require NumPy")
+
+
+def metric_columns(
+    correct: Sequence[bool],
+    tokens: Sequence[int],
+    target_max_tokens: Sequence[Optional[int]],
+):
+    """
+    (n, 5) int64 array of per-case additive terms behind the three metrics.
+    """
+    _require_numpy()
+    ok = np.asarray(correct, dtype=np.int64)
+    tok = np.asarray(tokens, dtype=np.int64)
+    eligible = np.array([t is not None for t in target_max_tokens], dtype=np.int64)
+    limit = np.array([t if t is not None else 0 for t in target_max_tokens], dtype=np.int64)
+    overrun = eligible * (tok > limit)
+    return np.stack([np.ones_like(ok), ok, ok * tok, eligible, overrun], axis=1)
+
+
+def columns_from_results(results: Iterable[Dict[str, Any]]):
+    """
+    metric_columns() from evaluator result rows.
+    """
+    rows = list(results)
+    return metric_columns(
+        [r["correct"] for r in rows],
+        [r["tokens"] for r in rows],
+        [r["target_max_tokens"] for r in rows],
+    )
+
+
+def cluster_columns(columns, clusters: Sequence[Hashable]) -> Tuple[List[Any], Any]:
+    """
+    (sorted cluster labels, columns summed per cluster) for rows labelled by
+    `clusters` (e.g. case ids across repetitions).
+    """
+    _require_numpy()
+    if len(clusters) != columns.shape[0]:
+        raise ValueError("clusters must label every row")
+    labels, inverse = np.unique(np.asarray(clusters), return_inverse=True)
+    out = np.zeros((len(labels), columns.shape[1]), dtype=columns.dtype)
+    np.add.at(out, inverse.reshape(-1), columns)
+    return labels.tolist(), out
+
+
+def resample_sums(columns, resamples: int, seed: int = 0, batch_size: int = 256):
+    """
+    (resamples, k) column sums of bootstrap resamples of the rows of `columns`.
+    """
+    _require_numpy()
+    if resamples <= 0:
+        raise ValueError("resamples must be > 0")
+    n = columns.shape[0]
+    out = np.zeros((resamples, columns.shape[1]), dtype=np.float64)
+    if n == 0:
+        return out
+    distinct, inverse, counts = np.unique(columns, axis=0, return_inverse=True, return_counts=True)
+    inverse = inverse.reshape(-1)
+    k = distinct.shape[0]
+    values = distinct.astype(np.float64)
+    rng = np.random.default_rng(seed)
+    batch_size = max(1, min(batch_size, _MAX_WEIGHTS // k))
+    for start in range(0, resamples, batch_size):
+        size = min(batch_size, resamples - start)
+        if k * _MULTINOMIAL_RATIO < n:
+            # Few distinct rows: draw counts per distinct row directly.
+            weights = rng.multinomial(n, counts / n, size=size)
+        else:
+            # Mostly distinct rows: a binomial per row costs more than drawing indices.
+            weights = np.stack([np.bincount(inverse[rng.integers(0, n, n)], minlength=k) for _ in range(size)])
+        out[start:start + size] = weights @ values
+    return out
+
+
+def _ratios(sums) -> Dict[str, Any]:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return {
+            "accuracy": sums[:, 1] / sums[:, 0],
+            "tpca": sums[:, 2] / sums[:, 1],
+            "expression_overrun_rate": sums[:, 4] / sums[:, 3],
+        }
+
+
+def _interval(estimate: float, samples, confidence: float) -> Dict[str, Optional[float]]:
+    finite = samples[np.isfinite(samples)]
+    alpha = (1.0 - confidence) / 2.0
+    if not np.isfinite(estimate) or finite.size == 0:
+        return {"estimate": None, "low": None, "high": None}
+    low, high = np.quantile(finite, [alpha, 1.0 - alpha])
+    return {"estimate": float(estimate), "low": float(low), "high": float(high)}
+
+
+def bootstrap_ci(
+    columns,
+    resamples: int = 10_000,
+    confidence: float = 0.95,
+    seed: int = 0,
+) -> Dict[str, Dict[str, Optional[float]]]:
+    """
+    {metric: {"estimate", "low", "high"}} for one set of per-case rows.
+    Undefined metrics (e.g. TPCA with no correct answers) are None.
+    """
+    if not 0.0 < confidence < 1.0:
+        raise ValueError("confidence must be in (0, 1)")
+    point = _ratios(columns.sum(axis=0, dtype=np.float64)[None, :])
+    boot = _ratios(resample_sums(columns, resamples, seed))
+    return {m: _interval(point[m][0], boot[m], confidence) for m in METRICS}
+
+
+def paired_bootstrap(
+    baseline,
+    treatment,
+    resamples: int = 10_000,
+    confidence: float = 0.95,
+    seed: int = 0,
+) -> Dict[str, Dict[str, Optional[float]]]:
+    """
+    CIs for treatment - baseline on each metric. Row i of both column
+    arrays must describe the same case (and repetition); rows are
+    resampled jointly so case difficulty cancels out.
+    """
+    if not 0.0 < confidence < 1.0:
+        raise ValueError("confidence must be in (0, 1)")
+    if baseline.shape != treatment.shape:
+        raise ValueError("paired rows must have the same shape")
+    joint = np.concatenate([baseline, treatment], axis=1)
+    total = joint.sum(axis=0, dtype=np.float64)[None, :]
+    sums = resample_sums(joint, resamples, seed)
+
+    point_a, point_b = _ratios(total[:, :_WIDTH]), _ratios(total[:, _WIDTH:])
+    boot_a, boot_b = _ratios(sums[:, :_WIDTH]), _ratios(sums[:, _WIDTH:])
+    out = {}
+    for m in METRICS:
+        diff = boot_b[m] - boot_a[m]
+        interval = _interval(point_b[m][0] - point_a[m][0], diff, confidence)
+        # Share of resamples where the treatment metric is higher than the baseline.
+        finite = diff[np.isfinite(diff)]
+        interval["share_positive"] = float(np.mean(finite > 0)) if finite.size else None
+        out[m] = interval
+    return out
@@ -0,0 +1,271 @@
+"""
+Razor Columnar Files
+
+Purpose:
+- Compact typed column storage for large result tables (e.g. evaluator
+  reports with millions of rows)
+- Memory-mapped, zero-copy loading of numeric columns
+- Filtered reads without materializing the whole table
+
+Layout (little-endian):
+  b"RZCF" | u8 version | 3 pad bytes | u64 header length | JSON header
+  | padding to 8 bytes | column blobs, each 8-byte aligned
+
+The JSON header holds the row count, free-form metadata and, per column,
+its kind, blob offset (relative to the data start) and, for category
+columns, the string dictionary. Column kinds:
+- "int64"     signed 64-bit integers
+- "bool"      one byte per row
+- "opt_int64" 64-bit integers, None stored as INT64_MIN
+- "category"  uint32 codes into a string dictionary (few distinct values)
+- "string"    int64 offsets (rows + 1) followed by UTF-8 bytes
+
+Writing uses only the stdlib. Loading returns NumPy views when NumPy is
+installed and memoryviews otherwise.
+
+Author: Robbie George
+Governed by MRD v1.8 and the Authorship Conservation Rule (ACR).
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import struct
+from array import array
+from itertools import accumulate
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+MAGIC = b"RZCF"
+VERSION = 1
+INT64_NONE = -(2 ** 63)
+KINDS = ("int64", "bool", "opt_int64", "category", "string")
+
+_PREFIX = struct.Struct("<4sB3xQ")
+_TYPECODES = {"int64": "q", "bool": "B", "opt_int64": "q", "category": "I"}
+_DTYPES = {"int64": "<i8", "bool": "u1", "opt_int64": "<i8", "category": "<u4"}
+
+Column = Tuple[str, Sequence[Any]]  # (kind, values)
+
+
+def _align(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def _encode(kind: str, values: Sequence[Any]) -> Tuple[bytes, Dict[str, Any]]:
+    if kind == "int64":
+        return array("q", values).tobytes(), {}
+    if kind == "bool":
+        return array("B", (1 if v else 0 for v in values)).tobytes(), {}
+    if kind == "opt_int64":
+        return array("q", (INT64_NONE if v is None else v for v in values)).tobytes(), {}
+    if kind == "category":
+        dictionary: Dict[str, int] = {}
+        codes = array("I", (dictionary.setdefault(v, len(dictionary)) for v in values))
+        return codes.tobytes(), {"dictionary": list(dictionary)}
+    if kind == "string":
+        encoded = [v.encode("utf-8") for v in values]
+        offsets = array("q", [0])
+        offsets.extend(accumulate(len(b) for b in encoded))
+        return offsets.tobytes() + b"".join(encoded), {}
+    raise ValueError(f"unknown column kind: {kind!r}")
+
+
+def write_columnar(path: str, columns: Mapping[str, Column], meta: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Write equal-length columns {name: (kind, values)} plus JSON-able metadata.
+    """
+    lengths = {len(values) for _, values in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError("all columns must have the same length")
+    rows = lengths.pop() if lengths else 0
+
+    blobs: List[bytes] = []
+    specs: List[Dict[str, Any]] = []
+    offset = 0
+    for name, (kind, values) in columns.items():
+        blob, extra = _encode(kind, values)
+        specs.append({"name": name, "kind": kind, "offset": offset, "nbytes": len(blob), **extra})
+        blobs.append(blob)
+        offset = _align(offset + len(blob))
+
+    header = json.dumps(
+        {"version": VERSION, "rows": rows, "meta": meta or {}, "columns": specs}, ensure_ascii=False
+    ).encode("utf-8")
+    data_start = _align(_PREFIX.size + len(header))
+
+    with open(path, "wb") as f:
+        f.write(_PREFIX.pack(MAGIC, VERSION, len(header)))
+        f.write(header)
+        f.write(b"\0" * (data_start - _PREFIX.size - len(header)))
+        for blob in blobs:
+            f.write(blob)
+            f.write(b"\0" * (_align(len(blob)) - len(blob)))
+
+
+class ColumnarFile:
+    """
+    Memory-mapped reader for files written by write_columnar().
+
+    raw(name) returns a zero-copy view (codes for category columns, bytes
+    for bool columns); column(name) decodes to Python values; select()
+    reads only rows matching `where`.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            self._file.close()
+            raise ValueError(f"not a columnar file: {path}")
+        magic, version, header_len = _PREFIX.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"not a columnar file: {path}")
+        if version != VERSION:
+            self.close()
+            raise ValueError(f"unsupported columnar version: {version}")
+        header = json.loads(bytes(self._mm[_PREFIX.size:_PREFIX.size + header_len]))
+        self.rows: int = header["rows"]
+        self.meta: Dict[str, Any] = header["meta"]
+        self._specs: Dict[str, Dict[str, Any]] = {c["name"]: c for c in header["columns"]}
+        self._data_start = _align(_PREFIX.size + header_len)
+
+    def __enter__(self) -> "ColumnarFile":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        # Views handed out by raw() keep the map alive; release ours only.
+        try:
+            self._mm.close()
+        except BufferError:
+            pass
+        self._file.close()
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._specs)
+
+    def kind(self, name: str) -> str:
+        return self._spec(name)["kind"]
+
+    def dictionary(self, name: str) -> List[str]:
+        return self._spec(name)["dictionary"]
+
+    def _spec(self, name: str) -> Dict[str, Any]:
+        spec = self._specs.get(name)
+        if spec is None:
+            raise KeyError(f"no column {name!r} in {self.path}")
+        return spec
+
+    def raw(self, name: str):
+        """
+        Zero-copy fixed-width view of a column (string columns: their offsets).
+        """
+        spec = self._spec(name)
+        start = self._data_start + spec["offset"]
+        kind = "int64" if spec["kind"] == "string" else spec["kind"]
+        count = self.rows + 1 if spec["kind"] == "string" else self.rows
+        if np is not None:
+            return np.frombuffer(self._mm, dtype=_DTYPES[kind], count=count, offset=start)
+        width = array(_TYPECODES[kind]).itemsize
+        return memoryview(self._mm)[start:start + count * width].cast(_TYPECODES[kind])
+
+    def _strings(self, name: str, indices: Optional[Sequence[int]]) -> List[str]:
+        spec = self._spec(name)
+        offsets = self.raw(name)
+        base = self._data_start + spec["offset"] + (self.rows + 1) * 8
+        idx = range(self.rows) if indices is None else indices
+        mm = self._mm
+        return [
+            mm[base + int(offsets[i]):base + int(offsets[i + 1])].decode("utf-8") for i in idx
+        ]
+
+    def column(self, name: str, indices: Optional[Sequence[int]] = None) -> List[Any]:
+        """
+        Decoded values of a column, optionally only at `indices`.
+        """
+        kind = self.kind(name)
+        if kind == "string":
+            return self._strings(name, indices)
+        raw = self.raw(name)
+        values = raw.tolist() if indices is None else [raw[int(i)] for i in indices]
+        if kind == "bool":
+            return [bool(v) for v in values]
+        if kind == "opt_int64":
+            return [None if v == INT64_NONE else int(v) for v in values]
+        if kind == "category":
+            dictionary = self.dictionary(name)
+            return [dictionary[v] for v in values]
+        return [int(v) for v in values]
+
+    def _encode_value(self, name: str, value: Any) -> Optional[int]:
+        kind = self.kind(name)
+        if kind == "category":
+            try:
+                return self.dictionary(name).index(value)
+            except ValueError:
+                return None  # never matches
+        if kind == "opt_int64" and value is None:
+            return INT64_NONE
+        if kind == "bool":
+            return 1 if value else 0
+        return value
+
+    def indices(self, where: Optional[Mapping[str, Any]] = None) -> List[int]:
+        """
+        Row indices matching every {column: value or collection of values}.
+        """
+        if not where:
+            return list(range(self.rows))
+        if np is not None:
+            mask = np.ones(self.rows, dtype=bool)
+            for name, wanted in where.items():
+                allowed = wanted if isinstance(wanted, (list, tuple, set, frozenset)) else [wanted]
+                if self.kind(name) == "string":
+                    values = np.array(self._strings(name, None), dtype=object)
+                    mask &= np.isin(values, list(allowed))
+                    continue
+                codes = [c for c in (self._encode_value(name, v) for v in allowed) if c is not None]
+                mask &= np.isin(self.raw(name), codes)
+            return np.flatnonzero(mask).tolist()
+
+        keep = range(self.rows)
+        for name, wanted in where.items():
+            allowed = wanted if isinstance(wanted, (list, tuple, set, frozenset)) else [wanted]
+            if self.kind(name) == "string":
+                values = self._strings(name, None)
+                allowed_set = set(allowed)
+                keep = [i for i in keep if values[i] in allowed_set]
+                continue
+            raw = self.raw(name)
+            codes = {c for c in (self._encode_value(name, v) for v in allowed) if c is not None}
+            keep = [i for i in keep if raw[i] in codes]
+        return list(keep)
+
+    def select(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        where: Optional[Mapping[str, Any]] = None,
+    ) -> Dict[str, List[Any]]:
+        """
+        {column: decoded values} for rows matching `where`.
+        """
+        idx = None if not where else self.indices(where)
+        return {name: self.column(name, idx) for name in (columns or self.columns)}
+
+    def iter_rows(self, where: Optional[Mapping[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        data = self.select(where=where)
+        names = list(data)
+        for values in zip(*(data[n] for n in names)):
+            yield dict(zip(names, values))
@@ -0,0 +1,214 @@
+"""
+Razor Verifier Confidence Models and Threshold Sweeps
+
+Purpose:
+- Simulated verifier confidence per query instead of a constant 0.99, so
+  the memory bank's stability_threshold actually gates what is stored
+- Hit rate, admitted fraction and savings vs risk for every threshold at once
+
+Confidence models (one draw per distinct query; the same query always
+gets the same answer and confidence):
+- fixed    every query at `value`
+- beta     Beta(a, b)
+- bimodal  a `high_share` of confident queries from Beta(*high), the rest
+           from Beta(*low)
+- classes  query classes with their own share and Beta(a, b), e.g.
+           "easy=0.7:40:1,hard=0.3:3:2"
+
+A query whose confidence is below the threshold is never stored, so the
+bank acts as an LRU over the requests of admitted queries only. With room
+for every admitted query (no evictions), admitted query q contributes
+requests(q) - 1 hits: sorting the queries by confidence once and taking
+prefix sums answers every threshold with a binary search. When the
+capacity is smaller, each threshold replays its admitted requests through
+LRU stack distances (src.razor.mrc), which is exact but O(n log n) per
+threshold.
+
+Risk assumes a calibrated verifier: a stored answer with confidence c is
+wrong with probability 1 - c, so every hit on it serves 1 - c expected
+wrong answers.
+
+Author: Robbie George
+Governed by MRD v1.8 and the Authorship Conservation Rule (ACR).
+"""
+
+from __future__ import annotations
+
+import random
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass
+from itertools import accumulate
+from typing import Any, Dict, Hashable, List, Mapping, Optional, Sequence, Tuple
+
+from .mrc import stack_distances
+
+CONFIDENCE_MODELS = ("fixed", "beta", "bimodal", "classes")
+
+
+@dataclass
+class ConfidenceClass:
+    name: str
+    share: float
+    a: float
+    b: float
+
+
+def parse_classes(spec: str) -> List[ConfidenceClass]:
+    """
+    "easy=0.7:40:1,hard=0.3:3:2" -> classes of (share, Beta(a, b)).
+    """
+    classes = []
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        name, _, params = part.partition("=")
+        try:
+            share, a, b = (float(x) for x in params.split(":"))
+        except ValueError:
+            raise ValueError(f"bad confidence class {part!r} (expected name=share:a:b)")
+        classes.append(ConfidenceClass(name.strip(), share, a, b))
+    _check_classes(classes)
+    return classes
+
+
+def _check_classes(classes: Sequence[ConfidenceClass]) -> None:
+    if not classes or sum(c.share for c in classes) <= 0:
+        raise ValueError("confidence classes need at least one positive share")
+    for c in classes:
+        if c.share < 0 or c.a <= 0 or c.b <= 0:
+            raise ValueError(f"confidence class {c.name!r} needs share >= 0 and a, b > 0")
+
+
+def sample_confidences(
+    n: int,
+    model: str = "fixed",
+    seed: int = 0,
+    value: float = 0.99,
+    a: float = 20.0,
+    b: float = 1.0,
+    high_share: float = 0.8,
+    high: Tuple[float, float] = (40.0, 1.0),
+    low: Tuple[float, float] = (2.0, 3.0),
+    classes: Optional[Sequence[ConfidenceClass]] = None,
+) -> List[float]:
+    """
+    n confidences in [0, 1] from the named model (see CONFIDENCE_MODELS).
+    """
+    rng = random.Random(f"confidence-{seed}")
+    if model == "fixed":
+        if not 0.0 <= value <= 1.0:
+            raise ValueError("value must be in [0, 1]")
+        return [value] * n
+    if model == "beta":
+        if a <= 0 or b <= 0:
+            raise ValueError("beta parameters must be > 0")
+        return [rng.betavariate(a, b) for _ in range(n)]
+    if model == "bimodal":
+        if not 0.0 <= high_share <= 1.0:
+            raise ValueError("high_share must be in [0, 1]")
+        classes = [ConfidenceClass("high", high_share, *high), ConfidenceClass("low", 1.0 - high_share, *low)]
+    elif model != "classes":
+        raise ValueError(f"unknown confidence model: {model!r} (expected one of {', '.join(CONFIDENCE_MODELS)})")
+    if classes is None:
+        raise ValueError("the classes model needs classes")
+    _check_classes(classes)
+    cum = list(accumulate(c.share for c in classes))
+    out = []
+    for _ in range(n):
+        c = classes[min(bisect_left(cum, rng.random() * cum[-1]), len(classes) - 1)]
+        out.append(rng.betavariate(c.a, c.b))
+    return out
+
+
+def assign_confidences(queries: Sequence[Hashable], model: str = "fixed", seed: int = 0, **params: Any) -> Dict[Hashable, float]:
+    """
+    {query: confidence} for every distinct query, drawn in first-seen order.
+    """
+    distinct = list(dict.fromkeys(queries.tolist() if hasattr(queries, "tolist") else queries))
+    return dict(zip(distinct, sample_confidences(len(distinct), model, seed, **params)))
+
+
+def threshold_grid(low: float = 0.5, high: float = 0.99, points: int = 50) -> List[float]:
+    """
+    Evenly spaced thresholds from low to high (inclusive).
+    """
+    if points < 2:
+        return [high]
+    step = (high - low) / (points - 1)
+    return [round(low + k * step, 6) for k in range(points)]
+
+
+def _row(
+    threshold: float,
+    total: int,
+    hits: int,
+    admitted_queries: int,
+    admitted_inferences: int,
+    wrong: float,
+    tokens_per_inference: int,
+    ms_per_inference: float,
+) -> Dict[str, Any]:
+    inferences = total - hits
+    return {
+        "stability_threshold": threshold,
+        "admitted_queries": admitted_queries,
+        # share of inference results that cleared the threshold and were stored
+        "admitted_fraction": admitted_inferences / inferences if inferences else 0.0,
+        "memory_hits": hits,
+        "memory_hit_rate": hits / total if total else 0.0,
+        "razor_inferences": inferences,
+        "token_savings": hits * tokens_per_inference,
+        "token_reduction": hits / total if total else 0.0,
+        "ms_savings": hits * ms_per_inference,
+        "expected_wrong_hits": wrong,
+        # expected share of memory answers that are wrong
+        "memory_error_rate": wrong / hits if hits else 0.0,
+    }
+
+
+def threshold_sweep(
+    queries: Sequence[Hashable],
+    confidences: Mapping[Hashable, float],
+    thresholds: Sequence[float],
+    tokens_per_inference: int,
+    ms_per_inference: float,
+    capacity: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Memory-gate outcome for each stability threshold over one workload,
+    matching a RazorMemoryBank run with the same per-query confidences.
+    capacity None means unbounded.
+    """
+    keys = queries.tolist() if hasattr(queries, "tolist") else list(queries)
+    total = len(keys)
+    requests = Counter(keys)
+
+    # Sort once, ascending by confidence; suffix sums are "everything at or above".
+    ranked = sorted(requests, key=lambda q: confidences[q])
+    conf = [confidences[q] for q in ranked]
+    repeats = [requests[q] - 1 for q in ranked]
+    wrong = [(requests[q] - 1) * (1.0 - confidences[q]) for q in ranked]
+    hits_above = list(accumulate(reversed(repeats)))[::-1] + [0]
+    wrong_above = list(accumulate(reversed(wrong)))[::-1] + [0.0]
+
+    rows = []
+    for t in thresholds:
+        first = bisect_left(conf, t)
+        admitted = len(ranked) - first
+        if capacity is None or capacity >= admitted:
+            # No evictions: every repeat of an admitted query hits.
+            row = _row(t, total, hits_above[first], admitted, admitted, wrong_above[first],
+                       tokens_per_inference, ms_per_inference)
+        else:
+            sub = [q for q in keys if confidences[q] >= t]
+            hits = 0
+            wrong_hits = 0.0
+            for q, d in zip(sub, stack_distances(sub)):
+                if 0 <= d < capacity:
+                    hits += 1
+                    wrong_hits += 1.0 - confidences[q]
+            row = _row(t, total, hits, admitted, len(sub) - hits, wrong_hits,
+                       tokens_per_inference, ms_per_inference)
+        rows.append(row)
+    return rows
@@ -10,6 +10,530 @@ Purpose:
 This module represents the control layer that binds
 Razor-aligned components into a coherent reasoning loop.
 
+Budgets:
+- Each phase may carry a per-request PhaseBudget (tokens, wall-clock ms,
+  recursion depth, call count). None means unbounded.
+- Usage is inclusive: tokens and time spent inside a nested phase also count
+  against every enclosing phase (e.g. sub-query expression counts toward the
+  recursion budget that spawned it).
+- Exhausting a token / wall-clock / call budget cancels the request
+  cooperatively: the shared CancellationToken is set and the controller stops
+  at the next phase boundary. Before each solver call the token is armed with
+  the earliest wall-clock deadline of the active phases, so a solver polling
+  it (token.cancelled / token.check()) sees the budget run out mid-call.
+- Exceeding max_depth is a throttle, not a failure: the sub-query is answered
+  directly instead of being decomposed further.
+
+Sub-problem reuse:
+- Sub-queries are canonicalized and memoized through the memory bank, so a
+  verified sub-result is shared by every parent, across requests.
+- Within one request, unverified sub-results are memoized as well, so a
+  sub-problem shared by several parents (a diamond in the call DAG) is solved once.
+- A sub-query that is already on the current resolution path (one of its own
+  ancestors) would close a cycle: it is skipped. Each request's parent ->
+  child edges are returned as ControllerResult.call_graph and dropped with
+  the request, so a long-lived controller keeps no per-edge state.
+
+Negative caching:
+- If the memory bank carries a NegativeCache, a query that recently failed
+  verification is not re-inferred: it is short-circuited (no solution) or,
+  when a fallback solver is configured, routed to that cheaper solver.
+
+Tracing:
+- With a trace_sink, every resolved (sub-)query emits a StepRecord
+  (embedding, cost, memory_similarity, violations, progress) as it happens,
+  so run metrics can be scored online instead of from buffered runs.
+
 Author: Robbie George
 Governed by MRD v1.8 and the Authorship Conservation Rule (ACR).
 """
+
+from __future__ import annotations
+
+import itertools
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from .memory_bank import RazorMemoryBank
+from .trace import StepRecord, TraceSink
+
+
+PHASES: Tuple[str, ...] = ("compression", "expression", "memory", "recursion")
+
+
+@dataclass
+class PhaseBudget:
+    max_tokens: Optional[int] = None
+    max_wall_ms: Optional[float] = None
+    max_depth: Optional[int] = None
+    max_calls: Optional[int] = None
+
+
+@dataclass
+class PhaseUsage:
+    tokens: int = 0
+    wall_ms: float = 0.0
+    calls: int = 0
+    max_depth: int = 0
+    throttled: int = 0
+    reused: int = 0
+    cycles: int = 0
+    negative_hits: int = 0
+    exhausted: Optional[str] = None  # name of the limit that tripped, if any
+
+
+@dataclass
+class SolveResult:
+    solution: Optional[str]
+    confidence: float
+    tokens: int = 0
+
+
+@dataclass
+class ControllerResult:
+    query: str
+    solution: Optional[str]
+    confidence: float
+    from_memory: bool
+    negative_hit: bool
+    terminated_early: bool
+    stop_reason: Optional[str]
+    phase_usage: Dict[str, Dict[str, Any]]
+    call_graph: "CallGraph"
+
+
+class BudgetExceeded(RuntimeError):
+    def __init__(self, phase: str, limit: str):
+        super().__init__(f"{phase}.{limit}")
+        self.phase = phase
+        self.limit = limit
+
+
+class CancellationToken:
+    """
+    Cooperative cancellation flag shared by every phase of one request.
+
+    An armed deadline (clock time) cancels the token as soon as it passes,
+    which is how a solver polling the token learns its phase's wall-clock
+    budget ran out while it was still running.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter) -> None:
+        self._cancelled = False
+        self.phase: Optional[str] = None
+        self.limit: Optional[str] = None
+        self._clock = clock
+        self._deadline: Optional[float] = None
+        self._deadline_phase: Optional[str] = None
+
+    @property
+    def cancelled(self) -> bool:
+        if not self._cancelled and self._deadline is not None and self._clock() > self._deadline:
+            self.cancel(self._deadline_phase or "request", "max_wall_ms")
+        return self._cancelled
+
+    def arm(self, deadline: Optional[float], phase: Optional[str] = None) -> None:
+        """
+        Cancel once the clock passes `deadline`, charged to `phase`; None disarms.
+        """
+        self._deadline = deadline
+        self._deadline_phase = phase
+
+    def cancel(self, phase: str, limit: str) -> None:
+        if self._cancelled:
+            return
+        self._cancelled = True
+        self.phase = phase
+        self.limit = limit
+
+    def check(self) -> None:
+        if self.cancelled:
+            raise BudgetExceeded(self.phase or "request", self.limit or "cancelled")
+
+
+class BudgetTracker:
+    """
+    Per-request accounting of phase usage against PhaseBudgets.
+    """
+
+    def __init__(
+        self,
+        budgets: Optional[Dict[str, PhaseBudget]] = None,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        unknown = set(budgets or {}) - set(PHASES)
+        if unknown:
+            raise ValueError(f"unknown phase(s) in budgets: {sorted(unknown)}")
+
+        self.budgets: Dict[str, PhaseBudget] = dict(budgets or {})
+        self.usage: Dict[str, PhaseUsage] = {p: PhaseUsage() for p in PHASES}
+        self.token = CancellationToken(clock)
+        self._clock = clock
+
+        # Wall time is measured on the outermost entry of each phase only,
+        # so nested re-entry (recursion inside recursion) is not double counted.
+        self._active: Dict[str, int] = {p: 0 for p in PHASES}
+        self._started: Dict[str, float] = {}
+
+    def _trip(self, phase: str, limit: str) -> None:
+        self.usage[phase].exhausted = limit
+        self.token.cancel(phase, limit)
+        raise BudgetExceeded(phase, limit)
+
+    def elapsed_ms(self, phase: str) -> float:
+        ms = self.usage[phase].wall_ms
+        if self._active[phase]:
+            ms += (self._clock() - self._started[phase]) * 1000.0
+        return ms
+
+    @contextmanager
+    def deadline(self) -> Iterator[CancellationToken]:
+        """
+        Arm the token with the earliest wall-clock deadline among the active
+        phases for the duration of a solver call, then disarm it.
+        """
+        now = self._clock()
+        deadline: Optional[float] = None
+        owner: Optional[str] = None
+        for p in PHASES:
+            budget = self.budgets.get(p)
+            if budget is None or budget.max_wall_ms is None or not self._active[p]:
+                continue
+            at = now + (budget.max_wall_ms - self.elapsed_ms(p)) / 1000.0
+            if deadline is None or at < deadline:
+                deadline, owner = at, p
+        self.token.arm(deadline, owner)
+        try:
+            yield self.token
+        finally:
+            self.token.arm(None)
+            if self.token.limit == "max_wall_ms" and self.token.phase in self.usage:
+                self.usage[self.token.phase].exhausted = "max_wall_ms"
+
+    def check(self) -> None:
+        """
+        Cancellation point: raises if the request was cancelled or any active
+        phase has run past its wall-clock budget.
+        """
+        self.token.check()
+        for phase in PHASES:
+            budget = self.budgets.get(phase)
+            if (
+                budget is not None
+                and budget.max_wall_ms is not None
+                and self._active[phase]
+                and self.elapsed_ms(phase) > budget.max_wall_ms
+            ):
+                self._trip(phase, "max_wall_ms")
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[PhaseUsage]:
+        self.check()
+
+        usage = self.usage[name]
+        budget = self.budgets.get(name)
+        usage.calls += 1
+        if budget is not None and budget.max_calls is not None and usage.calls > budget.max_calls:
+            self._trip(name, "max_calls")
+
+        if self._active[name] == 0:
+            self._started[name] = self._clock()
+        self._active[name] += 1
+        try:
+            yield usage
+        finally:
+            self._active[name] -= 1
+            if self._active[name] == 0:
+                usage.wall_ms += (self._clock() - self._started.pop(name)) * 1000.0
+
+        self.check()
+
+    def remaining_tokens(self, phase: str) -> Optional[int]:
+        """
+        Tokens still available to `phase`, taking every active enclosing
+        phase's budget into account. None means unbounded.
+        """
+        remaining: Optional[int] = None
+        for p in PHASES:
+            if p != phase and not self._active[p]:
+                continue
+            budget = self.budgets.get(p)
+            if budget is None or budget.max_tokens is None:
+                continue
+            left = max(0, budget.max_tokens - self.usage[p].tokens)
+            remaining = left if remaining is None else min(remaining, left)
+        return remaining
+
+    def require_tokens(self, phase: str) -> None:
+        """
+        Stop before spending compute when `phase` has no tokens left.
+        """
+        if self.remaining_tokens(phase) == 0:
+            self._trip(phase, "max_tokens")
+
+    def charge_tokens(self, phase: str, tokens: int) -> None:
+        """
+        Charge tokens to `phase` and every active enclosing phase.
+        """
+        charged = [p for p in PHASES if p == phase or self._active[p]]
+        for p in charged:
+            self.usage[p].tokens += tokens
+        for p in charged:
+            budget = self.budgets.get(p)
+            if budget is not None and budget.max_tokens is not None and self.usage[p].tokens > budget.max_tokens:
+                self._trip(p, "max_tokens")
+
+    def allow_depth(self, depth: int) -> bool:
+        """
+        Recursion throttle: returns False (and records the throttle) when
+        `depth` would exceed the recursion phase's max_depth.
+        """
+        usage = self.usage["recursion"]
+        budget = self.budgets.get("recursion")
+        if budget is not None and budget.max_depth is not None and depth > budget.max_depth:
+            usage.throttled += 1
+            return False
+        usage.max_depth = max(usage.max_depth, depth)
+        return True
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        out: Dict[str, Dict[str, Any]] = {}
+        for p in PHASES:
+            budget = self.budgets.get(p)
+            out[p] = {**asdict(self.usage[p]), "budget": asdict(budget) if budget is not None else None}
+        return out
+
+
+class CallGraph:
+    """
+    Sub-problem call DAG (parent key -> child keys) of one request.
+    """
+
+    def __init__(self) -> None:
+        self._children: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._children)
+
+    def nodes(self) -> Set[str]:
+        return set(self._children)
+
+    def children(self, key: str) -> Set[str]:
+        return set(self._children.get(key, ()))
+
+    def reaches(self, src: str, dst: str) -> bool:
+        seen: Set[str] = set()
+        stack = [src]
+        while stack:
+            node = stack.pop()
+            if node == dst:
+                return True
+            if node in seen:
+                continue
+            seen.add(node)
+            stack.extend(self._children.get(node, ()))
+        return False
+
+    def add_edge(self, parent: str, child: str) -> None:
+        """
+        Record parent -> child. The controller only adds edges to children
+        that are not ancestors of `parent`, which keeps the graph acyclic.
+        """
+        self._children.setdefault(parent, set()).add(child)
+        self._children.setdefault(child, set())
+
+
+@dataclass
+class _RequestState:
+    tracker: BudgetTracker
+    memo: Dict[str, SolveResult]
+    stack: Set[str]  # keys on the current resolution path (ancestors)
+    graph: CallGraph
+    run_id: int = 0
+    steps: int = 0
+
+
+# Solver contract: (canonical query, [(sub_query, sub_solution), ...], cancellation token) -> SolveResult
+Solver = Callable[[str, Sequence[Tuple[str, str]], CancellationToken], SolveResult]
+Decomposer = Callable[[str], List[str]]
+Embedder = Callable[[str], List[float]]
+
+
+def canonicalize_query(query: str) -> str:
+    """
+    Compression phase default: case-fold and collapse whitespace so trivially
+    different phrasings share one memory key.
+    """
+    return " ".join((query or "").split()).lower()
+
+
+class RazorController:
+    """
+    Reference control loop binding a solver to the Razor memory bank under
+    per-phase budgets.
+
+    Model-agnostic: the solver and optional decomposer are plain callables.
+    """
+
+    def __init__(
+        self,
+        solver: Solver,
+        memory_bank: Optional[RazorMemoryBank] = None,
+        decomposer: Optional[Decomposer] = None,
+        fallback: Optional[Solver] = None,
+        budgets: Optional[Dict[str, PhaseBudget]] = None,
+        canonicalize: Callable[[str], str] = canonicalize_query,
+        clock: Callable[[], float] = time.perf_counter,
+        trace_sink: Optional[TraceSink] = None,
+        embedder: Optional[Embedder] = None,
+    ):
+        self.solver = solver
+        self.memory_bank = memory_bank if memory_bank is not None else RazorMemoryBank()
+        self.decomposer = decomposer
+        self.fallback = fallback
+        self.budgets: Dict[str, PhaseBudget] = dict(budgets or {})
+        self.canonicalize = canonicalize
+        self.clock = clock
+        self.trace_sink = trace_sink
+        self.embedder = embedder
+        self._run_ids = itertools.count()
+
+        # Validate phase names once, up front.
+        BudgetTracker(self.budgets, clock)
+
+    def run(self, query: str) -> ControllerResult:
+        tracker = BudgetTracker(self.budgets, self.clock)
+
+        solution: Optional[str] = None
+        confidence = 0.0
+        source = "solver"
+        stop_reason: Optional[str] = None
+
+        state = _RequestState(
+            tracker=tracker, memo={}, stack=set(), graph=CallGraph(), run_id=next(self._run_ids)
+        )
+        try:
+            result, source = self._solve(query, 0, state)
+            solution, confidence = result.solution, result.confidence
+        except BudgetExceeded as exc:
+            stop_reason = str(exc)
+            self._emit(state, self.canonicalize(query), 0, "budget", cost=0, violations=1, progress=0.0)
+
+        return ControllerResult(
+            query=query,
+            solution=solution,
+            confidence=confidence,
+            from_memory=source == "memory",
+            negative_hit=source in ("negative", "fallback"),
+            terminated_early=stop_reason is not None,
+            stop_reason=stop_reason,
+            phase_usage=tracker.report(),
+            call_graph=state.graph,
+        )
+
+    def _emit(
+        self,
+        state: _RequestState,
+        key: str,
+        depth: int,
+        source: str,
+        cost: float,
+        violations: int,
+        progress: float,
+    ) -> None:
+        if self.trace_sink is None:
+            return
+        self.trace_sink.emit(
+            StepRecord(
+                run_id=state.run_id,
+                step=state.steps,
+                query=key,
+                source=source,
+                depth=depth,
+                cost=cost,
+                memory_similarity=1.0 if source in ("memory", "memo") else 0.0,
+                violations=violations,
+                progress=progress,
+                embedding=list(self.embedder(key)) if self.embedder is not None else None,
+            )
+        )
+        state.steps += 1
+
+    def _solve(self, query: str, depth: int, state: _RequestState) -> Tuple[SolveResult, str]:
+        """
+        Returns (result, source) where source is one of
+        "memory", "memo", "negative", "fallback", "solver".
+        """
+        key, result, source = self._resolve(query, depth, state)
+        self._emit(
+            state,
+            key,
+            depth,
+            source,
+            cost=result.tokens if source in ("solver", "fallback") else 0,
+            violations=0,
+            progress=1.0 if result.solution is not None else 0.0,
+        )
+        return result, source
+
+    def _resolve(self, query: str, depth: int, state: _RequestState) -> Tuple[str, SolveResult, str]:
+        tracker = state.tracker
+        recursion = tracker.usage["recursion"]
+
+        with tracker.phase("compression"):
+            key = self.canonicalize(query)
+
+        if key in state.memo:
+            recursion.reused += 1
+            return key, state.memo[key], "memo"
+
+        with tracker.phase("memory"):
+            cached, conf = self.memory_bank.retrieve(key)
+            negative = cached is None and self.memory_bank.is_negative(key)
+        if cached is not None:
+            if depth > 0:
+                recursion.reused += 1
+            return key, SolveResult(solution=cached, confidence=conf, tokens=0), "memory"
+
+        solver, source = self.solver, "solver"
+        if negative:
+            tracker.usage["memory"].negative_hits += 1
+            if self.fallback is None:
+                result = SolveResult(solution=None, confidence=0.0, tokens=0)
+                state.memo[key] = result
+                return key, result, "negative"
+            solver, source = self.fallback, "fallback"
+
+        sub_results: List[Tuple[str, str]] = []
+        if self.decomposer is not None and source == "solver":
+            state.stack.add(key)
+            try:
+                with tracker.phase("recursion"):
+                    if tracker.allow_depth(depth + 1):
+                        for sub in self.decomposer(key):
+                            tracker.check()
+                            sub_key = self.canonicalize(sub)
+                            if sub_key in state.stack:
+                                recursion.cycles += 1
+                                continue
+                            state.graph.add_edge(key, sub_key)
+                            sub_result, _ = self._solve(sub_key, depth + 1, state)
+                            if sub_result.solution is not None:
+                                sub_results.append((sub_key, sub_result.solution))
+            finally:
+                state.stack.discard(key)
+
+        with tracker.phase("expression"):
+            tracker.require_tokens("expression")
+            with tracker.deadline() as token:
+                result = solver(key, sub_results, token)
+            tracker.charge_tokens("expression", result.tokens)
+
+        with tracker.phase("memory"):
+            if result.solution is not None:
+                self.memory_bank.store(key, result.solution, result.confidence)
+
+        state.memo[key] = result
+        return key, result, source
@@ -0,0 +1,139 @@
+"""
+Razor Cost Model (FPCA proxies)
+
+Purpose:
+- Estimate FLOPs and latency per request from input / output token counts
+- Per-model cost tables (built-in illustrative proxies or JSON files)
+- Vectorized evaluation over whole result sets (NumPy if installed)
+
+Proxy rules:
+- FLOPs   ~= 2 * active_params * (input_tokens + output_tokens)
+- latency ~= overhead_ms + prefill_ms_per_token * input_tokens
+                         + decode_ms_per_token * output_tokens
+
+The built-in table is illustrative, not measured. Supply a JSON table for
+real hardware / provider numbers:
+
+  {"my-model": {"active_params": 8e9, "prefill_ms_per_token": 0.1,
+                "decode_ms_per_token": 12.0, "overhead_ms": 80.0}}
+
+Author: Robbie George
+Governed by MRD v1.8 and the Authorship Conservation Rule (ACR).
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+from .metrics import FPCAAccumulator
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+
+@dataclass(frozen=True)
+class ModelCost:
+    active_params: float
+    prefill_ms_per_token: float
+    decode_ms_per_token: float
+    overhead_ms: float = 0.0
+
+    def flops(self, input_tokens: int, output_tokens: int) -> float:
+        return 2.0 * self.active_params * (input_tokens + output_tokens)
+
+    def latency_ms(self, input_tokens: int, output_tokens: int) -> float:
+        return (
+            self.overhead_ms
+            + self.prefill_ms_per_token * input_tokens
+            + self.decode_ms_per_token * output_tokens
+        )
+
+
+DEFAULT_COST_TABLE: Dict[str, ModelCost] = {
+    "proxy-1b": ModelCost(active_params=1e9, prefill_ms_per_token=0.05, decode_ms_per_token=5.0, overhead_ms=50.0),
+    "proxy-7b": ModelCost(active_params=7e9, prefill_ms_per_token=0.1, decode_ms_per_token=15.0, overhead_ms=100.0),
+    "proxy-70b": ModelCost(active_params=70e9, prefill_ms_per_token=0.5, decode_ms_per_token=40.0, overhead_ms=200.0),
+}
+
+DEFAULT_MODEL = "proxy-7b"
+
+
+class CostModel:
+    """
+    Looks up a model's cost row and turns token counts into FLOPs / latency.
+    Unknown model names fall back to `default`.
+    """
+
+    def __init__(self, table: Optional[Dict[str, ModelCost]] = None, default: str = DEFAULT_MODEL):
+        self.table: Dict[str, ModelCost] = dict(DEFAULT_COST_TABLE if table is None else table)
+        if default not in self.table:
+            raise ValueError(f"default model {default!r} not in cost table")
+        self.default = default
+
+    @classmethod
+    def from_json(cls, path: str, default: Optional[str] = None) -> "CostModel":
+        with open(path, "r", encoding="utf-8") as f:
+            raw = json.load(f)
+        table = {name: ModelCost(**row) for name, row in raw.items()}
+        if not table:
+            raise ValueError(f"empty cost table: {path}")
+        return cls(table, default=default or next(iter(table)))
+
+    def resolve(self, model: str) -> str:
+        return model if model in self.table else self.default
+
+    def lookup(self, model: str) -> ModelCost:
+        return self.table[self.resolve(model)]
+
+    def estimate(self, model: str, input_tokens: int, output_tokens: int) -> Tuple[float, float]:
+        """
+        (flops, latency_ms) for a single request.
+        """
+        row = self.lookup(model)
+        return row.flops(input_tokens, output_tokens), row.latency_ms(input_tokens, output_tokens)
+
+    def estimate_batch(self, model: str, input_tokens: Sequence[int], output_tokens: Sequence[int]):
+        """
+        (flops, latency_ms) arrays for a whole result set.
+        Returns NumPy arrays when NumPy is installed, otherwise lists.
+        """
+        row = self.lookup(model)
+        if np is not None:
+            inp = np.asarray(input_tokens, dtype=np.float64)
+            out = np.asarray(output_tokens, dtype=np.float64)
+            flops = 2.0 * row.active_params * (inp + out)
+            latency = row.overhead_ms + row.prefill_ms_per_token * inp + row.decode_ms_per_token * out
+            return flops, latency
+        flops_list = [row.flops(i, o) for i, o in zip(input_tokens, output_tokens)]
+        latency_list = [row.latency_ms(i, o) for i, o in zip(input_tokens, output_tokens)]
+        return flops_list, latency_list
+
+    def accumulate(
+        self,
+        model: str,
+        input_tokens: Sequence[int],
+        output_tokens: Sequence[int],
+        correct: Sequence[bool],
+    ) -> FPCAAccumulator:
+        """
+        FPCA accumulator for a whole result set in one vectorized pass.
+        """
+        flops, latency = self.estimate_batch(model, input_tokens, output_tokens)
+        if np is not None:
+            mask = np.asarray(correct, dtype=bool)
+            return FPCAAccumulator(
+                observations=int(mask.size),
+                correct=int(mask.sum()),
+                total_flops=float(flops.sum()),
+                correct_flops=float(flops[mask].sum()),
+                total_latency_ms=float(latency.sum()),
+                correct_latency_ms=float(latency[mask].sum()),
+            )
+        acc = FPCAAccumulator()
+        for f, l, ok in zip(flops, latency, correct):
+            acc.update(f, l, bool(ok))
+        return acc
@@ -0,0 +1,116 @@
+"""
+Razor Multi-Pattern Matching
+
+Purpose:
+- Whole-word search for many alternative answers in a single pass
+- Used by contains-mode grading when a case carries many aliases
+
+WordBoundaryMatcher is an Aho–Corasick automaton whose matches are filtered
+by the same rule as the regex \\b<pattern>\\b: a match is accepted only if
+there is a word boundary at both its start and its end, where "word"
+characters are those matched by re's \\w (alphanumerics and underscore).
+
+Build cost is O(total pattern length); each search is one linear scan of
+the text, independent of the number of patterns.
+
+Author: Robbie George
+Governed by MRD v1.8 and the Authorship Conservation Rule (ACR).
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+
+def is_word_char(ch: str) -> bool:
+    """
+    Same character class as re's \\w for str patterns.
+    """
+    return ch.isalnum() or ch == "_"
+
+
+def _boundary(text: str, pos: int) -> bool:
+    before = pos > 0 and is_word_char(text[pos - 1])
+    after = pos < len(text) and is_word_char(text[pos])
+    return before != after
+
+
+class WordBoundaryMatcher:
+    """
+    Aho–Corasick matcher accepting only whole-word occurrences.
+
+    search(text) is equivalent to
+      any(re.search(rf"\\b{re.escape(p)}\\b", text) for p in patterns)
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: FrozenSet[str] = frozenset(patterns)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Lengths of every pattern ending at a node, including via fail links.
+        self._out: List[Tuple[int, ...]] = [()]
+        self._has_empty = "" in self.patterns
+
+        own: List[set] = [set()]
+        for pattern in self.patterns:
+            if not pattern:
+                continue
+            node = 0
+            for ch in pattern:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    own.append(set())
+                node = nxt
+            own[node].add(len(pattern))
+
+        # Breadth-first so every fail target is finished before it is used.
+        self._out = [()] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        for child in queue:
+            self._out[child] = tuple(sorted(own[child], reverse=True))
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = tuple(sorted(own[child] | set(self._out[self._fail[child]]), reverse=True))
+                queue.append(child)
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def search(self, text: str) -> Optional[Tuple[int, int]]:
+        """
+        (start, end) of the first whole-word match by end position (longest
+        at that end), or None.
+        """
+        if self._has_empty:
+            # \b\b matches wherever any boundary exists, i.e. at any word char.
+            for i in range(len(text) + 1):
+                if _boundary(text, i):
+                    return i, i
+
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for j, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            lengths = out[node]
+            if lengths and _boundary(text, j + 1):
+                end = j + 1
+                for length in lengths:
+                    if _boundary(text, end - length):
+                        return end - length, end
+        return None
+
+    def matches(self, text: str) -> bool:
+        return self.search(text) is not None
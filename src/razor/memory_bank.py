@@ -5,6 +5,8 @@ Purpose:
 - Confidence-gated storage of verified results
 - LRU eviction
 - Safe retrieval with stability threshold
+- Optional negative cache: results that fail the threshold are remembered
+  for an exponentially growing TTL so callers can skip re-inferring them
 - No external dependencies
 
 References:
@@ -22,8 +24,8 @@ from __future__ import annotations
 import hashlib
 import time
 from dataclasses import dataclass
-from typing import Deque, Dict, Optional, Tuple
-from collections import deque
+from typing import Callable, Deque, Dict, Optional, Tuple
+from collections import OrderedDict, deque
 
 
 @dataclass
@@ -34,6 +36,93 @@ class MemoryEntry:
     access_count: int = 0
 
 
+@dataclass
+class NegativeEntry:
+    failures: int
+    expires_at: float
+    confidence: float
+
+
+class NegativeCache:
+    """
+    Bounded store of recently unverifiable queries.
+
+    Each consecutive failure doubles (by `backoff`) the TTL, capped at max_ttl.
+    Expired entries are kept (until LRU eviction) so the failure count, and
+    therefore the backoff, survives expiry.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 10_000,
+        base_ttl: float = 60.0,
+        max_ttl: float = 3600.0,
+        backoff: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if capacity <= 0:
+            raise ValueError("capacity must be > 0")
+        if base_ttl <= 0 or max_ttl < base_ttl:
+            raise ValueError("require 0 < base_ttl <= max_ttl")
+        if backoff < 1.0:
+            raise ValueError("backoff must be >= 1")
+
+        self.capacity = capacity
+        self.base_ttl = base_ttl
+        self.max_ttl = max_ttl
+        self.backoff = backoff
+        self._clock = clock
+
+        self._entries: "OrderedDict[str, NegativeEntry]" = OrderedDict()
+        self._hits = 0
+        self._failures = 0
+
+    def record_failure(self, key: str, confidence: float) -> float:
+        """
+        Record a failed verification for `key`. Returns the TTL applied.
+        """
+        entry = self._entries.pop(key, None)
+        failures = 1 if entry is None else entry.failures + 1
+        ttl = min(self.max_ttl, self.base_ttl * self.backoff ** (failures - 1))
+
+        self._entries[key] = NegativeEntry(
+            failures=failures,
+            expires_at=self._clock() + ttl,
+            confidence=confidence,
+        )
+        self._failures += 1
+
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+        return ttl
+
+    def is_negative(self, key: str) -> bool:
+        """
+        True if `key` failed verification and its TTL has not expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None or self._clock() >= entry.expires_at:
+            return False
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return True
+
+    def clear(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "capacity": self.capacity,
+            "hits": self._hits,
+            "failures": self._failures,
+        }
+
+    @property
+    def entries(self) -> "OrderedDict[str, NegativeEntry]":
+        return self._entries
+
+
 class RazorMemoryBank:
     """
     Stable memory store with confidence-based consolidation and LRU eviction.
@@ -42,7 +131,12 @@ class RazorMemoryBank:
     Model-agnostic.
     """
 
-    def __init__(self, capacity: int = 10_000, stability_threshold: float = 0.95):
+    def __init__(
+        self,
+        capacity: int = 10_000,
+        stability_threshold: float = 0.95,
+        negative_cache: Optional[NegativeCache] = None,
+    ):
         if capacity <= 0:
             raise ValueError("capacity must be > 0")
         if not (0.0 <= stability_threshold <= 1.0):
@@ -51,8 +145,12 @@ class RazorMemoryBank:
         self.capacity = capacity
         self.stability_threshold = stability_threshold
 
-        self._entries: Dict[str, MemoryEntry] = {}
-        self._lru: Deque[str] = deque()  # least-recently used is leftmost
+        # Insertion order is recency order: least-recently used first, so
+        # every LRU update and eviction is O(1).
+        self._entries: "OrderedDict[str, MemoryEntry]" = OrderedDict()
+
+        self.negative_cache = negative_cache
+        self._rejected = 0
 
     def _hash_query(self, query: str) -> str:
         return hashlib.sha256(query.encode("utf-8")).hexdigest()
@@ -60,11 +158,19 @@ class RazorMemoryBank:
     def store(self, query: str, solution: str, confidence: float) -> None:
         """
         Store (query -> solution) only if confidence >= stability_threshold.
+        Rejected results are counted and, if a negative cache is attached,
+        recorded there.
         """
+        key = self._hash_query(query)
+
         if confidence < self.stability_threshold:
+            self._rejected += 1
+            if self.negative_cache is not None:
+                self.negative_cache.record_failure(key, confidence)
             return
 
-        key = self._hash_query(query)
+        if self.negative_cache is not None:
+            self.negative_cache.clear(key)
         now = time.time()
 
         self._entries[key] = MemoryEntry(
@@ -74,16 +180,11 @@ class RazorMemoryBank:
         )
 
         # Maintain LRU
-        try:
-            self._lru.remove(key)
-        except ValueError:
-            pass
-        self._lru.append(key)
+        self._entries.move_to_end(key)
 
         # Evict if over capacity
-        while len(self._entries) > self.capacity and self._lru:
-            oldest = self._lru.popleft()
-            self._entries.pop(oldest, None)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
 
     def retrieve(self, query: str) -> Tuple[Optional[str], float]:
         """
@@ -95,17 +196,25 @@ class RazorMemoryBank:
             return None, 0.0
 
         entry.access_count += 1
-
-        try:
-            self._lru.remove(key)
-        except ValueError:
-            pass
-        self._lru.append(key)
+        self._entries.move_to_end(key)
 
         return entry.solution, entry.confidence
 
+    def is_negative(self, query: str) -> bool:
+        """
+        True if `query` recently failed verification (negative cache hit).
+        """
+        if self.negative_cache is None:
+            return False
+        return self.negative_cache.is_negative(self._hash_query(query))
+
     def get_stats(self) -> Dict[str, int]:
-        return {"size": len(self._entries), "capacity": self.capacity}
+        stats = {"size": len(self._entries), "capacity": self.capacity, "rejected": self._rejected}
+        if self.negative_cache is not None:
+            neg = self.negative_cache.get_stats()
+            stats["negative_size"] = neg["size"]
+            stats["negative_hits"] = neg["hits"]
+        return stats
 
     @property
     def entries(self) -> Dict[str, MemoryEntry]:
@@ -113,5 +222,8 @@ class RazorMemoryBank:
 
     @property
     def lru_queue(self) -> Deque[str]:
-        return self._lru
+        """
+        Snapshot of keys, least-recently used first.
+        """
+        return deque(self._entries)
 
@@ -10,6 +10,516 @@ Purpose:
 These metrics support R0–R5 compliance scoring
 as defined in the Robbie’s Razor Compliance Framework.
 
+Accumulators:
+- update() is O(1) per observation
+- merge() is associative and commutative, so shards (threads, processes,
+  machines) can each keep a private accumulator and combine at the end
+- to_bytes() / from_bytes() give a compact fixed-size encoding for shipping
+  partial results between workers
+
+Accumulators are not locked; give each thread its own and merge.
+
+Groups:
+- GroupedAccumulator keeps one TPCAAccumulator per group of result rows
+  (e.g. per category, scoring mode or output-token bucket) and merges
+  group by group.
+
+Drift:
+- DriftTracker keeps, per (model, condition, case), a bounded distribution
+  of hashed normalized answers across repetitions, and reports
+  inconsistency (1 - modal share), flip rate and answer entropy online.
+  At most `max_keys` keys are tracked; observations of later keys are
+  counted as dropped.
+- Across conditions, the same (model, case) is compared by the total
+  variation distance between its answer distributions under a baseline
+  condition and each other condition, plus whether the modal answer moved.
+
 Author: Robbie George
 Governed by MRD v1.8 and the Authorship Conservation Rule (ACR).
 """
+
+from __future__ import annotations
+
+import hashlib
+import math
+import re
+import struct
+from bisect import bisect_right
+from dataclasses import asdict, dataclass, field, fields
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, TypeVar
+
+_VERSION = 1
+
+A = TypeVar("A", "TPCAAccumulator", "FPCAAccumulator")
+
+
+@dataclass
+class TPCAAccumulator:
+    """
+    Running counts behind accuracy, TPCA and expression overrun rate.
+    """
+
+    observations: int = 0
+    correct: int = 0
+    total_tokens: int = 0
+    correct_tokens: int = 0
+    overrun_eligible: int = 0
+    overruns: int = 0
+
+    _FORMAT = struct.Struct("<B6q")
+
+    def update(self, tokens: int, correct: bool, target_max_tokens: Optional[int] = None) -> None:
+        self.observations += 1
+        self.total_tokens += tokens
+        if correct:
+            self.correct += 1
+            self.correct_tokens += tokens
+        if target_max_tokens is not None:
+            self.overrun_eligible += 1
+            if tokens > target_max_tokens:
+                self.overruns += 1
+
+    def merge(self, other: "TPCAAccumulator") -> "TPCAAccumulator":
+        return TPCAAccumulator(*(getattr(self, f.name) + getattr(other, f.name) for f in fields(self)))
+
+    __add__ = merge
+
+    @property
+    def accuracy(self) -> float:
+        return (self.correct / self.observations) if self.observations else 0.0
+
+    @property
+    def tpca(self) -> Optional[float]:
+        return (self.correct_tokens / self.correct) if self.correct else None
+
+    @property
+    def overrun_rate(self) -> Optional[float]:
+        return (self.overruns / self.overrun_eligible) if self.overrun_eligible else None
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summary in the evaluator report schema.
+        """
+        return {
+            "num_cases": self.observations,
+            "num_correct": self.correct,
+            "accuracy": self.accuracy,
+            "tpca": self.tpca,
+            "expression_overrun_rate": self.overrun_rate,
+            "total_tokens": self.total_tokens,
+        }
+
+    def to_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, int]) -> "TPCAAccumulator":
+        return cls(**d)
+
+    def to_bytes(self) -> bytes:
+        return self._FORMAT.pack(_VERSION, *(getattr(self, f.name) for f in fields(self)))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "TPCAAccumulator":
+        version, *values = cls._FORMAT.unpack(data)
+        if version != _VERSION:
+            raise ValueError(f"unsupported accumulator version: {version}")
+        return cls(*values)
+
+
+@dataclass
+class FPCAAccumulator:
+    """
+    Running sums behind FLOPs / latency per correct answer.
+    """
+
+    observations: int = 0
+    correct: int = 0
+    total_flops: float = 0.0
+    correct_flops: float = 0.0
+    total_latency_ms: float = 0.0
+    correct_latency_ms: float = 0.0
+
+    _FORMAT = struct.Struct("<B2q4d")
+
+    def update(self, flops: float, latency_ms: float, correct: bool) -> None:
+        self.observations += 1
+        self.total_flops += flops
+        self.total_latency_ms += latency_ms
+        if correct:
+            self.correct += 1
+            self.correct_flops += flops
+            self.correct_latency_ms += latency_ms
+
+    def merge(self, other: "FPCAAccumulator") -> "FPCAAccumulator":
+        return FPCAAccumulator(*(getattr(self, f.name) + getattr(other, f.name) for f in fields(self)))
+
+    __add__ = merge
+
+    @property
+    def fpca(self) -> Optional[float]:
+        return (self.correct_flops / self.correct) if self.correct else None
+
+    @property
+    def latency_per_correct_ms(self) -> Optional[float]:
+        return (self.correct_latency_ms / self.correct) if self.correct else None
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "fpca": self.fpca,
+            "latency_per_correct_ms": self.latency_per_correct_ms,
+            "total_flops": self.total_flops,
+            "total_latency_ms": self.total_latency_ms,
+        }
+
+    def to_dict(self) -> Dict[str, float]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, float]) -> "FPCAAccumulator":
+        return cls(**d)
+
+    def to_bytes(self) -> bytes:
+        return self._FORMAT.pack(_VERSION, *(getattr(self, f.name) for f in fields(self)))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "FPCAAccumulator":
+        version, *values = cls._FORMAT.unpack(data)
+        if version != _VERSION:
+            raise ValueError(f"unsupported accumulator version: {version}")
+        return cls(*values)
+
+
+def merge_all(accumulators: Iterable[A], start: A) -> A:
+    """
+    Fold any number of partial accumulators into `start` (an empty one).
+    """
+    out = start
+    for acc in accumulators:
+        out = out.merge(acc)
+    return out
+
+
+# -----------------------------
+# Grouped accumulation
+# -----------------------------
+
+GROUP_FIELDS = ("category", "scoring_mode", "token_bucket", "target_max_tokens")
+DEFAULT_TOKEN_BUCKETS = (4, 16, 64, 256)
+
+
+def token_bucket(tokens: int, edges: Sequence[int] = DEFAULT_TOKEN_BUCKETS) -> str:
+    """
+    Label of the half-open bucket [edges[i-1], edges[i]) holding `tokens`,
+    e.g. "4-15" or "256+".
+    """
+    i = bisect_right(edges, tokens)
+    if i == len(edges):
+        return f"{edges[-1]}+"
+    low = edges[i - 1] if i else 0
+    return f"{low}-{edges[i] - 1}"
+
+
+class GroupedAccumulator:
+    """
+    TPCA counts per group of evaluator result rows.
+
+    `fields` name the row attributes that form a group key (any of
+    GROUP_FIELDS); several fields group by their combination, joined
+    with "/". Accumulators with the same fields and buckets merge group
+    by group, so workers can each keep their own.
+    """
+
+    def __init__(self, fields: Sequence[str], token_edges: Sequence[int] = DEFAULT_TOKEN_BUCKETS):
+        if not fields:
+            raise ValueError("at least one group field is required")
+        unknown = [f for f in fields if f not in GROUP_FIELDS]
+        if unknown:
+            raise ValueError(f"unknown group field(s): {', '.join(unknown)}")
+        if list(token_edges) != sorted(set(token_edges)) or not token_edges:
+            raise ValueError("token_edges must be strictly increasing and non-empty")
+        self.fields = tuple(fields)
+        self.token_edges = tuple(token_edges)
+        self.groups: Dict[str, TPCAAccumulator] = {}
+
+    @property
+    def name(self) -> str:
+        return "+".join(self.fields)
+
+    def key(self, row: Mapping[str, Any]) -> str:
+        parts = []
+        for f in self.fields:
+            if f == "token_bucket":
+                parts.append(token_bucket(row["tokens"], self.token_edges))
+            else:
+                parts.append(str(row[f]))
+        return "/".join(parts)
+
+    def update(self, row: Mapping[str, Any]) -> None:
+        key = self.key(row)
+        acc = self.groups.get(key)
+        if acc is None:
+            acc = self.groups[key] = TPCAAccumulator()
+        acc.update(row["tokens"], row["correct"], row["target_max_tokens"])
+
+    def merge(self, other: "GroupedAccumulator") -> "GroupedAccumulator":
+        if (self.fields, self.token_edges) != (other.fields, other.token_edges):
+            raise ValueError("cannot merge accumulators with different group fields or buckets")
+        out = GroupedAccumulator(self.fields, self.token_edges)
+        out.groups = dict(self.groups)
+        for key, acc in other.groups.items():
+            out.groups[key] = out.groups[key] + acc if key in out.groups else acc
+        return out
+
+    __add__ = merge
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, GroupedAccumulator):
+            return NotImplemented
+        return (self.fields, self.token_edges, self.groups) == (other.fields, other.token_edges, other.groups)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        return {key: self.groups[key].summary() for key in sorted(self.groups)}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "fields": list(self.fields),
+            "token_edges": list(self.token_edges),
+            "groups": {key: acc.to_dict() for key, acc in self.groups.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "GroupedAccumulator":
+        out = cls(d["fields"], d["token_edges"])
+        out.groups = {key: TPCAAccumulator.from_dict(acc) for key, acc in d["groups"].items()}
+        return out
+
+
+# -----------------------------
+# Drift and inconsistency
+# -----------------------------
+
+DriftKey = Tuple[str, str, str]  # (model, condition, case)
+
+
+def answer_fingerprint(answer: str) -> int:
+    """
+    64-bit hash of a whitespace/case-normalized answer.
+    """
+    norm = re.sub(r"\s+", " ", (answer or "").strip().lower())
+    return int.from_bytes(hashlib.blake2b(norm.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+@dataclass
+class AnswerDistribution:
+    """
+    Bounded answer histogram for one (model, condition, case).
+
+    At most `max_distinct` answers are tracked individually; later distinct
+    answers fall into a single overflow bucket, so entropy is a lower bound
+    once overflow > 0.
+    """
+
+    max_distinct: int = 16
+    observations: int = 0
+    counts: Dict[int, int] = field(default_factory=dict)
+    overflow: int = 0
+    modal_count: int = 0
+    flips: int = 0
+    last: Optional[int] = None
+    _clogc: float = 0.0  # sum of c * log2(c) over buckets
+
+    def _bump(self, c: int, modal: bool = True) -> None:
+        # c -> c + 1 in some bucket: keep sum(c log c) current in O(1)
+        self._clogc += (c + 1) * math.log2(c + 1) - (c * math.log2(c) if c else 0.0)
+        if modal:
+            self.modal_count = max(self.modal_count, c + 1)
+
+    def update(self, fingerprint: int) -> None:
+        self.observations += 1
+        if self.last is not None and fingerprint != self.last:
+            self.flips += 1
+        self.last = fingerprint
+
+        c = self.counts.get(fingerprint)
+        if c is not None:
+            self.counts[fingerprint] = c + 1
+            self._bump(c)
+        elif len(self.counts) < self.max_distinct:
+            self.counts[fingerprint] = 1
+            self._bump(0)
+        else:
+            # The overflow bucket mixes answers, so it never counts as the mode.
+            self._bump(self.overflow, modal=False)
+            self.overflow += 1
+
+    @property
+    def distinct(self) -> int:
+        return len(self.counts) + (1 if self.overflow else 0)
+
+    @property
+    def inconsistency(self) -> float:
+        return 1.0 - self.modal_count / self.observations if self.observations else 0.0
+
+    @property
+    def flip_rate(self) -> float:
+        return self.flips / (self.observations - 1) if self.observations > 1 else 0.0
+
+    @property
+    def entropy_bits(self) -> float:
+        n = self.observations
+        if n == 0:
+            return 0.0
+        return max(0.0, math.log2(n) - self._clogc / n)
+
+    @property
+    def modal_answer(self) -> Optional[int]:
+        """
+        Fingerprint of the most frequent tracked answer (ties: first tracked).
+        """
+        return max(self.counts, key=self.counts.get) if self.counts else None
+
+    def total_variation(self, other: "AnswerDistribution") -> float:
+        """
+        Total variation distance between the two answer distributions, in
+        [0, 1]. Overflow buckets mix answers and never count as overlapping,
+        so with overflow the distance is an upper bound.
+        """
+        n, m = self.observations, other.observations
+        if not n or not m:
+            return 0.0
+        # Shared mass scaled by n * m, in integers so identical shapes give exactly 0.
+        overlap = sum(min(c * m, other.counts[f] * n) for f, c in self.counts.items() if f in other.counts)
+        return (n * m - overlap) / (n * m)
+
+
+class DriftTracker:
+    """
+    Streaming drift / inconsistency tracker across repetitions and conditions.
+
+    Memory is O(max_keys * max_distinct); answers are stored as 64-bit
+    hashes. Once `max_keys` (model, condition, case) keys are tracked, new
+    keys are not: their observations only increment `dropped`, and
+    update() returns None for them.
+    """
+
+    def __init__(self, max_distinct: int = 16, max_keys: int = 1_000_000):
+        if max_distinct <= 0:
+            raise ValueError("max_distinct must be > 0")
+        if max_keys <= 0:
+            raise ValueError("max_keys must be > 0")
+        self.max_distinct = max_distinct
+        self.max_keys = max_keys
+        self.dropped = 0
+        self._dists: Dict[DriftKey, AnswerDistribution] = {}
+
+    def update(self, model: str, condition: str, case_id: str, answer: str) -> Optional[AnswerDistribution]:
+        key = (model, condition, case_id)
+        dist = self._dists.get(key)
+        if dist is None:
+            if len(self._dists) >= self.max_keys:
+                self.dropped += 1
+                return None
+            dist = AnswerDistribution(max_distinct=self.max_distinct)
+            self._dists[key] = dist
+        dist.update(answer_fingerprint(answer))
+        return dist
+
+    def update_attempt(self, record: Dict[str, Any]) -> Optional[AnswerDistribution]:
+        """
+        Consume one attempts.jsonl record (requestedModel, conditionId,
+        caseId, visibleOutput). Errored attempts are skipped.
+        """
+        if record.get("error") or "visibleOutput" not in record:
+            return None
+        return self.update(
+            record.get("requestedModel", ""),
+            record.get("conditionId", ""),
+            record["caseId"],
+            record.get("visibleOutput") or "",
+        )
+
+    def get(self, model: str, condition: str, case_id: str) -> Optional[AnswerDistribution]:
+        return self._dists.get((model, condition, case_id))
+
+    @property
+    def distributions(self) -> Dict[DriftKey, AnswerDistribution]:
+        return self._dists
+
+    def condition_drift(
+        self, model: str, case_id: str, baseline: str, condition: str
+    ) -> Optional[float]:
+        """
+        Total variation distance between a case's answers under `baseline`
+        and under `condition` (None unless both were observed).
+        """
+        a = self._dists.get((model, baseline, case_id))
+        b = self._dists.get((model, condition, case_id))
+        if a is None or b is None:
+            return None
+        return a.total_variation(b)
+
+    def cross_condition_summary(self, baseline: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Per model and condition vs `baseline` (default: each model's first
+        condition seen), over the cases observed under both: mean total
+        variation distance, share of cases whose modal answer changed, and
+        share of cases with any drift (distance > 0).
+        """
+        conditions: Dict[str, List[str]] = {}
+        cases: Dict[Tuple[str, str], List[str]] = {}
+        for model, condition, case_id in self._dists:
+            names = conditions.setdefault(model, [])
+            if condition not in names:
+                names.append(condition)
+            cases.setdefault((model, condition), []).append(case_id)
+
+        out: Dict[str, Dict[str, Any]] = {}
+        for model, names in sorted(conditions.items()):
+            base = baseline or names[0]
+            if base not in names:
+                continue
+            for condition in names:
+                if condition == base:
+                    continue
+                distances = []
+                moved = 0
+                for case_id in cases[(model, condition)]:
+                    a = self._dists.get((model, base, case_id))
+                    if a is None:
+                        continue
+                    b = self._dists[(model, condition, case_id)]
+                    distances.append(a.total_variation(b))
+                    moved += a.modal_answer != b.modal_answer
+                k = len(distances)
+                if not k:
+                    continue
+                out[f"{model}/{base}->{condition}"] = {
+                    "cases": k,
+                    "total_variation": sum(distances) / k,
+                    "modal_change_share": moved / k,
+                    "drifted_case_share": sum(1 for d in distances if d > 0) / k,
+                }
+        return out
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per (model, condition): mean inconsistency, mean flip rate, mean
+        entropy, and the share of cases with more than one distinct answer.
+        """
+        groups: Dict[Tuple[str, str], list] = {}
+        for (model, condition, _), dist in self._dists.items():
+            groups.setdefault((model, condition), []).append(dist)
+
+        out: Dict[str, Dict[str, Any]] = {}
+        for (model, condition), dists in sorted(groups.items()):
+            k = len(dists)
+            out[f"{model}/{condition}"] = {
+                "cases": k,
+                "observations": sum(d.observations for d in dists),
+                "inconsistency_rate": sum(d.inconsistency for d in dists) / k,
+                "flip_rate": sum(d.flip_rate for d in dists) / k,
+                "entropy_bits": sum(d.entropy_bits for d in dists) / k,
+                "unstable_case_share": sum(1 for d in dists if d.distinct > 1) / k,
+            }
+        return out
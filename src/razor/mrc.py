@@ -0,0 +1,247 @@
+"""
+Razor Miss-Ratio Curves (LRU stack-distance analysis)
+
+Purpose:
+- LRU hit rate of RazorMemoryBank for every capacity from one pass over a
+  workload, instead of one simulation per --capacity value
+- Token / latency savings as curves over capacity
+
+RazorMemoryBank is an LRU cache, so (Mattson et al.) a request hits at
+capacity c exactly when its stack distance, the number of distinct other
+queries since the previous request for the same query, is below c. Stack
+distances come from a Fenwick (binary indexed) tree over request times
+holding a 1 at each query's most recent request: the distance is the
+count of 1s strictly between the previous and the current request.
+O(n log n) for n requests.
+
+For very large workloads, sample_rate < 1 uses SHARDS fixed-rate spatial
+sampling (Waldspurger et al., FAST '15): only queries whose hash falls
+under the rate are tracked, distances and counts are scaled by 1 / rate,
+and the count shortfall against the expected sample size is credited to
+distance 0 (SHARDS_adj). A rate of 0.01 tracks ~1% of requests.
+
+Stdlib only; NumPy id arrays are hashed vectorized when NumPy is installed.
+
+Author: Robbie George
+Governed by MRD v1.8 and the Authorship Conservation Rule (ACR).
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from itertools import accumulate
+from typing import Any, Dict, Hashable, List, Sequence
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+_MASK64 = (1 << 64) - 1
+_SAMPLE_BITS = 24  # hash space for the sampling threshold
+
+
+def _mix64(x: int) -> int:
+    """
+    splitmix64 finalizer: a well-spread 64-bit hash of an integer.
+    """
+    x = (x + 0x9E3779B97F4A7C15) & _MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
+
+
+def _mix64_array(ids):
+    with np.errstate(over="ignore"):
+        x = ids.astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return x ^ (x >> np.uint64(31))
+
+
+def shards_sample(ids: Sequence[Hashable], sample_rate: float, seed: int = 0) -> List[Hashable]:
+    """
+    The subsequence of requests whose query is spatially sampled at
+    `sample_rate`. The decision depends only on the query (and seed), so a
+    sampled query keeps all of its requests.
+    """
+    if not 0.0 < sample_rate <= 1.0:
+        raise ValueError("sample_rate must be in (0, 1]")
+    if sample_rate == 1.0:
+        return list(ids.tolist() if hasattr(ids, "tolist") else ids)
+    threshold = int(sample_rate * (1 << _SAMPLE_BITS))
+    shift = 64 - _SAMPLE_BITS
+    salt = _mix64(seed)
+
+    if np is not None and isinstance(ids, np.ndarray) and ids.dtype.kind in "iu":
+        h = _mix64_array(ids.astype(np.uint64) ^ np.uint64(salt))
+        return ids[(h >> np.uint64(shift)) < threshold].tolist()
+
+    # Arbitrary hashables: intern to dense ints first (hash() of str is salted per process).
+    index: Dict[Hashable, int] = {}
+    keep: Dict[int, bool] = {}
+    out: List[Hashable] = []
+    for key in ids:
+        i = index.setdefault(key, len(index))
+        sampled = keep.get(i)
+        if sampled is None:
+            sampled = keep[i] = (_mix64(i ^ salt) >> shift) < threshold
+        if sampled:
+            out.append(key)
+    return out
+
+
+def stack_distances(ids: Sequence[Hashable]) -> List[int]:
+    """
+    LRU stack distance of every request (-1 for a query's first request).
+    A request hits an LRU cache of capacity c iff 0 <= distance < c.
+    """
+    keys = ids.tolist() if hasattr(ids, "tolist") else list(ids)
+    n = len(keys)
+    tree = [0] * (n + 1)  # Fenwick tree over request times, 1-based
+    last: Dict[Hashable, int] = {}
+    out = [-1] * n
+    for t, key in enumerate(keys):
+        p = last.get(key)
+        if p is not None:
+            # Most-recent markers in times (p, t): prefix(t) - prefix(p + 1).
+            s = 0
+            i = t
+            while i > 0:
+                s += tree[i]
+                i &= i - 1
+            i = p + 1
+            while i > 0:
+                s -= tree[i]
+                i &= i - 1
+            out[t] = s
+            i = p + 1
+            while i <= n:
+                tree[i] -= 1
+                i += i & -i
+        i = t + 1
+        while i <= n:
+            tree[i] += 1
+            i += i & -i
+        last[key] = t
+    return out
+
+
+@dataclass
+class MissRatioCurve:
+    """
+    Stack-distance histogram of a workload; hits(c) for any capacity c.
+    Counts are scaled to the full workload when sampled.
+    """
+
+    references: int
+    cold_misses: float
+    distances: List[int]  # sorted distinct (scaled) stack distances
+    counts: List[float]   # (scaled) requests at each distance
+    sample_rate: float = 1.0
+    _cumulative: List[float] = field(default_factory=list, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._cumulative = [0.0, *accumulate(self.counts)]
+
+    def hits(self, capacity: int) -> float:
+        if capacity <= 0:
+            return 0.0
+        h = self._cumulative[bisect_left(self.distances, capacity)]
+        return min(max(h, 0.0), float(self.references))
+
+    def hit_rate(self, capacity: int) -> float:
+        return self.hits(capacity) / self.references if self.references else 0.0
+
+    def miss_ratio(self, capacity: int) -> float:
+        return 1.0 - self.hit_rate(capacity) if self.references else 0.0
+
+    @property
+    def max_useful_capacity(self) -> int:
+        """
+        Smallest capacity reaching the maximum hit rate (only cold misses left).
+        """
+        return self.distances[-1] + 1 if self.distances else 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "references": self.references,
+            "cold_misses": self.cold_misses,
+            "sample_rate": self.sample_rate,
+            "distances": self.distances,
+            "counts": self.counts,
+        }
+
+
+def miss_ratio_curve(ids: Sequence[Hashable], sample_rate: float = 1.0, seed: int = 0) -> MissRatioCurve:
+    """
+    One pass over `ids` (query ids or strings) -> MissRatioCurve.
+    sample_rate < 1 uses SHARDS; 1.0 is exact.
+    """
+    references = len(ids)
+    sampled = shards_sample(ids, sample_rate, seed)
+    scale = 1.0 / sample_rate
+    hist: Dict[int, float] = {}
+    cold = 0
+    for d in stack_distances(sampled):
+        if d < 0:
+            cold += 1
+        else:
+            scaled = int(d * scale)
+            hist[scaled] = hist.get(scaled, 0.0) + scale
+    if sample_rate < 1.0 and references:
+        # SHARDS_adj: credit the gap between expected and actual sample size to the hottest bucket.
+        hist[0] = hist.get(0, 0.0) + (references * sample_rate - len(sampled)) * scale
+    distances = sorted(hist)
+    return MissRatioCurve(references, cold * scale, distances, [hist[d] for d in distances], sample_rate)
+
+
+def capacity_grid(max_capacity: int, points: int = 32) -> List[int]:
+    """
+    Roughly geometric capacities 1 .. max_capacity (distinct, ascending).
+    """
+    if max_capacity < 1:
+        return []
+    if points < 2:
+        return [max_capacity]
+    ratio = max_capacity ** (1.0 / (points - 1))
+    grid = {max(1, round(ratio ** k)) for k in range(points)}
+    grid.add(max_capacity)
+    return sorted(grid)
+
+
+def savings_curve(
+    mrc: MissRatioCurve,
+    capacities: Sequence[int],
+    tokens_per_inference: int,
+    ms_per_inference: float,
+    cost_per_hit_tokens: int = 0,
+    cost_per_hit_ms: float = 0.0,
+) -> List[Dict[str, Any]]:
+    """
+    Memory-gate savings per capacity: every hit skips one inference.
+    Field names follow benchmark_memory_gate_savings.
+    """
+    rows = []
+    total = mrc.references
+    for c in capacities:
+        hits = mrc.hits(c)
+        inferences = total - hits
+        baseline_tokens = total * tokens_per_inference
+        razor_tokens = inferences * tokens_per_inference + hits * cost_per_hit_tokens
+        baseline_ms = total * ms_per_inference
+        razor_ms = inferences * ms_per_inference + hits * cost_per_hit_ms
+        rows.append(
+            {
+                "memory_capacity": c,
+                "memory_hit_rate": hits / total if total else 0.0,
+                "memory_hits": hits,
+                "razor_inferences": inferences,
+                "token_savings": baseline_tokens - razor_tokens,
+                "token_reduction": (baseline_tokens - razor_tokens) / baseline_tokens if baseline_tokens else 0.0,
+                "ms_savings": baseline_ms - razor_ms,
+                "latency_reduction": (baseline_ms - razor_ms) / baseline_ms if baseline_ms else 0.0,
+            }
+        )
+    return rows
@@ -0,0 +1,248 @@
+"""
+Razor Queueing Simulation (discrete-event, M/G/c)
+
+Purpose:
+- Latency distributions under concurrency instead of a constant cost per
+  inference: arrival processes, a fixed pool of inference servers, FIFO
+  queueing and random service times
+- The memory bank as the gate in front of the pool: hits answer after the
+  gate latency, misses queue for a server and store their result when the
+  inference completes
+
+Events are processed in time order: before an arrival at time t every
+inference finished by t is stored, so a repeat of a query still in flight
+misses (and queues) just as it would in production. Because service starts
+follow arrival order (FIFO), the next start is max(ready time, earliest
+free server): a heap of server free times plus a heap of pending stores,
+O(log servers) per request, which keeps the loop at millions of events per
+minute in pure Python.
+
+Arrival processes (rate in requests per second):
+- poisson   exponential inter-arrival times
+- constant  evenly spaced arrivals
+- bursty    Markov-modulated Poisson: exponentially long periods alternate
+            between rate * (1 + amplitude) and rate * (1 - amplitude)
+
+Service-time distributions (mean in ms):
+- constant, exponential, lognormal (coefficient of variation `cv`)
+
+Times are in milliseconds. No external dependencies.
+
+Author: Robbie George
+Governed by MRD v1.8 and the Authorship Conservation Rule (ACR).
+"""
+
+from __future__ import annotations
+
+import math
+import random
+import time
+from heapq import heappop, heappush, heapreplace
+from typing import Any, Dict, Hashable, List, Mapping, Optional, Sequence
+
+from .memory_bank import RazorMemoryBank
+
+ARRIVALS = ("poisson", "constant", "bursty")
+SERVICES = ("constant", "exponential", "lognormal")
+
+
+def arrival_times(
+    n: int,
+    rate_per_s: float,
+    process: str = "poisson",
+    seed: int = 0,
+    burst_amplitude: float = 0.8,
+    burst_period_ms: float = 10_000.0,
+) -> List[float]:
+    """
+    n ascending arrival times (ms) at a mean of `rate_per_s` requests per second.
+    """
+    if rate_per_s <= 0:
+        raise ValueError("rate_per_s must be > 0")
+    rate = rate_per_s / 1000.0  # per ms
+    rng = random.Random(f"arrivals-{seed}")
+    out: List[float] = []
+    t = 0.0
+    if process == "constant":
+        return [i / rate for i in range(n)]
+    if process == "poisson":
+        expo = rng.expovariate
+        for _ in range(n):
+            t += expo(rate)
+            out.append(t)
+        return out
+    if process == "bursty":
+        if not 0.0 <= burst_amplitude < 1.0:
+            raise ValueError("burst_amplitude must be in [0, 1)")
+        if burst_period_ms <= 0:
+            raise ValueError("burst_period_ms must be > 0")
+        rates = (rate * (1.0 + burst_amplitude), rate * (1.0 - burst_amplitude))
+        state = 0
+        switch = rng.expovariate(1.0 / burst_period_ms)
+        while len(out) < n:
+            step = rng.expovariate(rates[state]) if rates[state] > 0 else math.inf
+            if t + step >= switch:
+                # Memoryless: restart the draw at the switch under the new rate.
+                t = switch
+                state ^= 1
+                switch = t + rng.expovariate(1.0 / burst_period_ms)
+                continue
+            t += step
+            out.append(t)
+        return out
+    raise ValueError(f"unknown arrival process: {process!r} (expected one of {', '.join(ARRIVALS)})")
+
+
+def service_times(
+    n: int,
+    mean_ms: float,
+    distribution: str = "exponential",
+    cv: float = 1.0,
+    seed: int = 0,
+) -> List[float]:
+    """
+    n service times (ms) with the given mean; `cv` applies to lognormal.
+    """
+    if mean_ms <= 0:
+        raise ValueError("mean_ms must be > 0")
+    rng = random.Random(f"service-{seed}")
+    if distribution == "constant":
+        return [float(mean_ms)] * n
+    if distribution == "exponential":
+        return [rng.expovariate(1.0 / mean_ms) for _ in range(n)]
+    if distribution == "lognormal":
+        if cv <= 0:
+            raise ValueError("cv must be > 0")
+        sigma = math.sqrt(math.log1p(cv * cv))
+        mu = math.log(mean_ms) - sigma * sigma / 2.0
+        return [rng.lognormvariate(mu, sigma) for _ in range(n)]
+    raise ValueError(f"unknown service distribution: {distribution!r} (expected one of {', '.join(SERVICES)})")
+
+
+def latency_summary(latencies: List[float]) -> Dict[str, float]:
+    """
+    Mean and nearest-rank p50 / p95 / p99 / max (sorts `latencies` in place).
+    """
+    if not latencies:
+        return {"mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    latencies.sort()
+    n = len(latencies)
+
+    def pct(q: float) -> float:
+        return latencies[max(0, math.ceil(n * q / 100.0) - 1)]
+
+    return {
+        "mean": math.fsum(latencies) / n,
+        "p50": pct(50),
+        "p95": pct(95),
+        "p99": pct(99),
+        "max": latencies[-1],
+    }
+
+
+def simulate(
+    queries: Sequence[Hashable],
+    arrivals: Sequence[float],
+    service_ms: Sequence[float],
+    servers: int,
+    bank: Optional[RazorMemoryBank] = None,
+    gate_ms: float = 0.0,
+    confidence: float = 0.99,
+    confidences: Optional[Mapping[Hashable, float]] = None,
+) -> Dict[str, Any]:
+    """
+    Run requests through `servers` FIFO inference servers. Request i arrives
+    at arrivals[i] (ascending) and, if it reaches a server, takes
+    service_ms[i]. With a bank, every request first pays `gate_ms`; hits end
+    there, and misses store their result on completion, at the query's
+    entry in `confidences` when given and at `confidence` otherwise.
+    """
+    if servers < 1:
+        raise ValueError("servers must be >= 1")
+    n = len(queries)
+    if len(arrivals) != n or len(service_ms) != n:
+        raise ValueError("queries, arrivals and service_ms must have the same length")
+
+    free = [0.0] * servers   # heap of times at which each server frees up
+    pending: List[Any] = []  # heap of (finish, request) not yet stored
+    latencies = [0.0] * n
+    wait = 0.0
+    busy = 0.0
+    end = 0.0
+    hits = 0
+    stores = 0
+
+    for i in range(n):
+        t = arrivals[i]
+        if bank is not None:
+            while pending and pending[0][0] <= t:
+                _, j = heappop(pending)
+                q = queries[j]
+                bank.store(q, "OK", confidences[q] if confidences is not None else confidence)
+                stores += 1
+            cached, conf = bank.retrieve(queries[i])
+            if cached is not None and conf >= bank.stability_threshold:
+                hits += 1
+                latencies[i] = gate_ms
+                if t + gate_ms > end:
+                    end = t + gate_ms
+                continue
+            ready = t + gate_ms
+        else:
+            ready = t
+
+        s = service_ms[i]
+        start = free[0] if free[0] > ready else ready
+        finish = start + s
+        heapreplace(free, finish)
+        if bank is not None:
+            heappush(pending, (finish, i))
+        wait += start - ready
+        busy += s
+        latencies[i] = finish - t
+        if finish > end:
+            end = finish
+
+    inferences = n - hits
+    span_ms = end - arrivals[0] if n else 0.0
+    return {
+        "requests": n,
+        "inferences": inferences,
+        "memory_hits": hits,
+        "memory_hit_rate": hits / n if n else 0.0,
+        # arrival, departure, and service start for each inference (plus stores)
+        "events": 2 * n + inferences + stores,
+        "makespan_ms": span_ms,
+        "throughput_per_s": n / span_ms * 1000.0 if span_ms > 0 else 0.0,
+        "utilization": busy / (servers * span_ms) if span_ms > 0 else 0.0,
+        "mean_wait_ms": wait / inferences if inferences else 0.0,
+        "latency_ms": latency_summary(latencies),
+    }
+
+
+def compare(
+    queries: Sequence[Hashable],
+    arrivals: Sequence[float],
+    service_ms: Sequence[float],
+    servers: int,
+    bank: RazorMemoryBank,
+    gate_ms: float = 0.0,
+    confidence: float = 0.99,
+    confidences: Optional[Mapping[Hashable, float]] = None,
+) -> Dict[str, Any]:
+    """
+    Baseline (every request infers) vs Razor (memory-gated) on the same
+    arrivals and per-request service times.
+    """
+    t0 = time.perf_counter()
+    baseline = simulate(queries, arrivals, service_ms, servers)
+    razor = simulate(queries, arrivals, service_ms, servers, bank, gate_ms, confidence, confidences)
+    elapsed = time.perf_counter() - t0
+    events = baseline["events"] + razor["events"]
+    return {
+        "baseline": baseline,
+        "razor": razor,
+        "events": events,
+        "sim_seconds": elapsed,
+        "events_per_sec": events / elapsed if elapsed > 0 else 0.0,
+    }
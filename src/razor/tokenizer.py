@@ -0,0 +1,148 @@
+"""
+Razor Tokenizer Service
+
+Purpose:
+- One warm encoder per model name, shared by everything in the process
+- Batch token counting (tiktoken's encode_batch when available)
+- Bounded memo of token counts keyed by a content hash of the text, so
+  repeated outputs and prompts are encoded once
+- Vectorized len/4 proxy when tiktoken is not installed
+
+Proxy rule (unchanged from the evaluator): tokens ~= max(1, ceil(len(text)/4)).
+
+Author: Robbie George
+Governed by MRD v1.8 and the Authorship Conservation Rule (ACR).
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+PROXY_IDENTITY = "proxy:len/4"
+
+_ENCODERS: Dict[str, Any] = {}
+
+
+def get_encoder(model: str):
+    """
+    Warm tiktoken encoder for `model`, loaded once per process.
+    Returns None (also cached) when tiktoken or the model is unavailable.
+    """
+    if model not in _ENCODERS:
+        try:
+            import tiktoken  # type: ignore
+            _ENCODERS[model] = tiktoken.encoding_for_model(model)
+        except Exception:
+            _ENCODERS[model] = None
+    return _ENCODERS[model]
+
+
+def proxy_token_count(text: str) -> int:
+    return max(1, (len(text or "") + 3) // 4)
+
+
+def proxy_token_counts(texts: Sequence[str]) -> List[int]:
+    """
+    len/4 proxy over a batch (NumPy arithmetic when installed).
+    """
+    if np is not None and len(texts):
+        lengths = np.fromiter((len(t or "") for t in texts), dtype=np.int64, count=len(texts))
+        return np.maximum(1, (lengths + 3) // 4).tolist()
+    return [proxy_token_count(t) for t in texts]
+
+
+def _digest(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+class TokenCounter:
+    """
+    Memoized, batched token counting for one model.
+
+    With no encoder the len/4 proxy is used and nothing is memoized (the
+    proxy is cheaper than hashing). `model` is kept so process-pool workers
+    can rebuild an equivalent counter from the registry.
+    """
+
+    def __init__(self, model: Optional[str] = None, encoder=None, memo_size: int = 65_536):
+        if memo_size < 0:
+            raise ValueError("memo_size must be >= 0")
+        self.model = model
+        self.encoder = encoder
+        self.memo_size = memo_size
+        self._memo: "OrderedDict[bytes, int]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def for_model(cls, model: Optional[str], memo_size: int = 65_536) -> "TokenCounter":
+        return cls(model, get_encoder(model) if model else None, memo_size)
+
+    @property
+    def identity(self) -> str:
+        """
+        Stable name of the counting rule, for cache keys and reports.
+        """
+        if self.encoder is None:
+            return PROXY_IDENTITY
+        return f"tiktoken:{getattr(self.encoder, 'name', self.model)}"
+
+    def count(self, text: str) -> int:
+        return self.count_batch([text])[0]
+
+    def count_batch(self, texts: Sequence[str]) -> List[int]:
+        texts = [t or "" for t in texts]
+        if self.encoder is None:
+            return proxy_token_counts(texts)
+
+        counts: List[Optional[int]] = [None] * len(texts)
+        missing: Dict[bytes, List[int]] = {}
+        for i, text in enumerate(texts):
+            key = _digest(text)
+            n = self._memo.get(key)
+            if n is not None:
+                self._memo.move_to_end(key)
+                counts[i] = n
+                self.hits += 1
+            else:
+                missing.setdefault(key, []).append(i)
+
+        if missing:
+            keys = list(missing)
+            batch = [texts[missing[k][0]] for k in keys]
+            encode_batch = getattr(self.encoder, "encode_batch", None)
+            encoded = encode_batch(batch) if encode_batch else [self.encoder.encode(t) for t in batch]
+            for key, tokens in zip(keys, encoded):
+                n = len(tokens)
+                for i in missing[key]:
+                    counts[i] = n
+                # Repeats within one batch are encoded once; count them as hits.
+                self.misses += 1
+                self.hits += len(missing[key]) - 1
+                self._remember(key, n)
+
+        return counts  # type: ignore[return-value]
+
+    def _remember(self, key: bytes, n: int) -> None:
+        if not self.memo_size:
+            return
+        self._memo[key] = n
+        if len(self._memo) > self.memo_size:
+            self._memo.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "identity": self.identity,
+            "memo_size": len(self._memo),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+        }
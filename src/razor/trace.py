@@ -0,0 +1,140 @@
+"""
+Razor Run Trace (streaming step records)
+
+Purpose:
+- Emit one StepRecord per resolved (sub-)query from the controller
+- Pluggable sinks: in-memory ring buffer, JSONL file, online scorers
+- Lets run-level metrics (e.g. razor_metrics RDM) be computed live,
+  without buffering whole runs
+
+Step fields follow razor_metrics conventions:
+  embedding, cost, memory_similarity, violations, progress
+
+Author: Robbie George
+Governed by MRD v1.8 and the Authorship Conservation Rule (ACR).
+"""
+
+from __future__ import annotations
+
+import json
+from collections import OrderedDict, deque
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+
+@dataclass
+class StepRecord:
+    run_id: int
+    step: int
+    query: str
+    source: str                       # memory | memo | negative | fallback | solver | budget
+    depth: int
+    cost: float
+    memory_similarity: float
+    violations: int
+    progress: float
+    embedding: Optional[List[float]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class TraceSink:
+    """
+    Base sink. Subclasses override emit(); close() is optional.
+    """
+
+    def emit(self, record: StepRecord) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class RingBufferSink(TraceSink):
+    """
+    Keeps the most recent `capacity` records in memory.
+    """
+
+    def __init__(self, capacity: int = 1_000):
+        if capacity <= 0:
+            raise ValueError("capacity must be > 0")
+        self.capacity = capacity
+        self._records: Deque[StepRecord] = deque(maxlen=capacity)
+
+    def emit(self, record: StepRecord) -> None:
+        self._records.append(record)
+
+    @property
+    def records(self) -> List[StepRecord]:
+        return list(self._records)
+
+
+class JsonlFileSink(TraceSink):
+    """
+    Appends one JSON object per record to a file.
+    """
+
+    def __init__(self, path: str, flush_every: int = 1):
+        if flush_every <= 0:
+            raise ValueError("flush_every must be > 0")
+        self.path = path
+        self.flush_every = flush_every
+        self._f = open(path, "a", encoding="utf-8")
+        self._pending = 0
+
+    def emit(self, record: StepRecord) -> None:
+        self._f.write(json.dumps(record.to_dict()) + "\n")
+        self._pending += 1
+        if self._pending >= self.flush_every:
+            self._f.flush()
+            self._pending = 0
+
+    def close(self) -> None:
+        if not self._f.closed:
+            self._f.close()
+
+
+class RunScorerSink(TraceSink):
+    """
+    Feeds each run's steps into its own online scorer.
+
+    `scorer_factory` builds a fresh scorer per run_id; scorers must expose
+    update(step_dict). Only the most recent `max_runs` scorers are retained.
+    """
+
+    def __init__(self, scorer_factory: Callable[[], Any], max_runs: int = 1_000):
+        if max_runs <= 0:
+            raise ValueError("max_runs must be > 0")
+        self.scorer_factory = scorer_factory
+        self.max_runs = max_runs
+        self._scorers: "OrderedDict[int, Any]" = OrderedDict()
+
+    def emit(self, record: StepRecord) -> None:
+        scorer = self._scorers.get(record.run_id)
+        if scorer is None:
+            scorer = self.scorer_factory()
+            self._scorers[record.run_id] = scorer
+            while len(self._scorers) > self.max_runs:
+                self._scorers.popitem(last=False)
+        scorer.update(record.to_dict())
+
+    def scorer(self, run_id: int) -> Optional[Any]:
+        return self._scorers.get(run_id)
+
+
+class MultiSink(TraceSink):
+    """
+    Fans each record out to several sinks.
+    """
+
+    def __init__(self, *sinks: TraceSink):
+        self.sinks = list(sinks)
+
+    def emit(self, record: StepRecord) -> None:
+        for sink in self.sinks:
+            sink.emit(record)
+
+    def close(self) -> None:
+        for sink in self.sinks:
+            sink.close()
@@ -0,0 +1,332 @@
+"""
+Razor Workload Generators
+
+Purpose:
+- Realistic query streams for memory-gate benchmarks: skewed, bursty and
+  drifting traffic instead of uniform draws
+- Trace replay from attempts.jsonl and other JSONL logs
+
+Every generator returns a NumPy int64 array of query ids in [0, unique)
+(scans and traces may use their own id ranges, documented below); id i
+stands for the query string f"query_{i}". All work is vectorized, so
+100M-query workloads build in seconds.
+
+Generators:
+- uniform            flat draws (the original benchmark workload)
+- zipf               bounded Zipf(alpha) popularity over `unique` ids
+- temporal_locality  with probability `reuse`, repeat a query from the last
+                     `window` requests; otherwise a fresh Zipf draw
+- working_set_shift  Zipf traffic over a working set that moves every phase
+- scan_burst         Zipf background interrupted by sequential one-pass scans
+- diurnal            popularity blends between a "day" and a "night" ranking
+                     along a sinusoidal cycle
+
+Requires NumPy.
+
+Author: Robbie George
+Governed by MRD v1.8 and the Authorship Conservation Rule (ACR).
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Union
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+WORKLOADS = ("uniform", "zipf", "temporal", "shift", "scan", "diurnal")
+
+# Ranks are drawn in blocks so the float buffer stays bounded at any size.
+_BLOCK = 1 << 22
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("workload generators require NumPy")
+
+
+def _check(n: int, unique: int) -> None:
+    _require_numpy()
+    if n < 0:
+        raise ValueError("n must be >= 0")
+    if unique <= 0:
+        raise ValueError("unique must be > 0")
+
+
+def query_names(ids: Iterable[int], prefix: str = "query_") -> List[str]:
+    """
+    Query strings for the memory bank: id i -> f"{prefix}{i}".
+    """
+    return [f"{prefix}{i}" for i in (ids.tolist() if hasattr(ids, "tolist") else ids)]
+
+
+def uniform(n: int, unique: int, seed: int = 0):
+    _check(n, unique)
+    return np.random.default_rng(seed).integers(0, unique, n, dtype=np.int64)
+
+
+def zipf_ranks(n: int, unique: int, alpha: float, rng):
+    """
+    n ranks in [0, unique) with P(rank r) proportional to 1 / (r + 1) ** alpha.
+    Inverse-CDF sampling, so any alpha >= 0 works (numpy's zipf needs alpha > 1
+    and is unbounded).
+    """
+    if alpha < 0:
+        raise ValueError("alpha must be >= 0")
+    cdf = np.cumsum(np.arange(1, unique + 1, dtype=np.float64) ** -alpha)
+    cdf /= cdf[-1]
+    cdf[-1] = np.inf  # every draw in [0, 1) lands on a valid rank
+    # Guide table: guide[k] is the answer for u = k / m, so a draw only has
+    # to walk the few ranks inside its bucket (~1 step on average) instead
+    # of binary-searching the whole CDF with a cache miss per level.
+    m = unique
+    guide = np.searchsorted(cdf, np.arange(m, dtype=np.float64) / m, side="right")
+    out = np.empty(n, dtype=np.int64)
+    for start in range(0, n, _BLOCK):
+        stop = min(n, start + _BLOCK)
+        u = rng.random(stop - start)
+        idx = guide[(u * m).astype(np.int64)]
+        pending = np.flatnonzero(cdf[idx] <= u)
+        while pending.size:
+            idx[pending] += 1
+            pending = pending[cdf[idx[pending]] <= u[pending]]
+        out[start:stop] = idx
+    return out
+
+
+def zipf(n: int, unique: int, alpha: float = 1.0, seed: int = 0):
+    """
+    Zipf(alpha) popularity; the rank -> id mapping is a random permutation,
+    so popular queries are not simply the low ids.
+    """
+    _check(n, unique)
+    rng = np.random.default_rng(seed)
+    perm = rng.permutation(unique).astype(np.int64)
+    return perm[zipf_ranks(n, unique, alpha, rng)]
+
+
+def temporal_locality(
+    n: int,
+    unique: int,
+    reuse: float = 0.5,
+    window: int = 100,
+    alpha: float = 0.8,
+    seed: int = 0,
+):
+    """
+    With probability `reuse`, request i repeats request i - d for d uniform
+    in [1, window]; otherwise it is a fresh Zipf(alpha) draw. Chains of
+    repeats are resolved with pointer jumping (O(n log chain length)).
+    """
+    _check(n, unique)
+    if not 0.0 <= reuse <= 1.0:
+        raise ValueError("reuse must be in [0, 1]")
+    if window < 1:
+        raise ValueError("window must be >= 1")
+    rng = np.random.default_rng(seed)
+    fresh = zipf(n, unique, alpha, seed=int(rng.integers(2 ** 63)))
+    src = np.arange(n, dtype=np.int64)
+    repeat = rng.random(n) < reuse
+    back = src - rng.integers(1, window + 1, n)
+    repeat &= back >= 0
+    src[repeat] = back[repeat]
+    while True:
+        nxt = src[src]
+        if np.array_equal(nxt, src):
+            break
+        src = nxt
+    return fresh[src]
+
+
+def working_set_shift(
+    n: int,
+    unique: int,
+    working_set: Optional[int] = None,
+    phases: int = 10,
+    overlap: float = 0.5,
+    alpha: float = 0.8,
+    seed: int = 0,
+):
+    """
+    Zipf(alpha) traffic confined to `working_set` ids (default: a tenth of
+    `unique`) that move every phase; consecutive phases share `overlap` of
+    their ids.
+    """
+    _check(n, unique)
+    if working_set is None:
+        working_set = max(1, unique // 10)
+    if not 0 < working_set <= unique:
+        raise ValueError("working_set must be in [1, unique]")
+    if phases < 1:
+        raise ValueError("phases must be >= 1")
+    if not 0.0 <= overlap <= 1.0:
+        raise ValueError("overlap must be in [0, 1]")
+    rng = np.random.default_rng(seed)
+    perm = rng.permutation(unique).astype(np.int64)
+    step = max(1, round(working_set * (1.0 - overlap))) if overlap < 1.0 else 0
+    ranks = zipf_ranks(n, working_set, alpha, rng)
+    phase = np.arange(n, dtype=np.int64) * phases // max(n, 1)
+    return perm[(ranks + phase * step) % unique]
+
+
+def scan_burst(
+    n: int,
+    unique: int,
+    scan_length: int = 1_000,
+    scan_every: int = 10_000,
+    alpha: float = 0.8,
+    seed: int = 0,
+):
+    """
+    Zipf(alpha) background over [0, unique); every `scan_every` requests a
+    scan of `scan_length` consecutive never-repeated ids starting at `unique`
+    (one-hit wonders that pollute an LRU).
+    """
+    _check(n, unique)
+    if scan_length < 0 or scan_every < 1:
+        raise ValueError("scan_length must be >= 0 and scan_every >= 1")
+    out = zipf(n, unique, alpha, seed)
+    pos = np.arange(n, dtype=np.int64)
+    in_scan = pos % (scan_every + scan_length) >= scan_every
+    # Scanned ids are numbered in order across all scans.
+    out[in_scan] = unique + np.arange(int(in_scan.sum()), dtype=np.int64)
+    return out
+
+
+def diurnal(
+    n: int,
+    unique: int,
+    period: int = 100_000,
+    amplitude: float = 1.0,
+    alpha: float = 0.8,
+    seed: int = 0,
+):
+    """
+    Two Zipf(alpha) popularity rankings ("day" and "night") over the same ids;
+    request i uses the night ranking with probability
+    (1 - amplitude * cos(2 pi i / period)) / 2, so the hot set turns over
+    once per `period` requests.
+    """
+    _check(n, unique)
+    if period < 1:
+        raise ValueError("period must be >= 1")
+    if not 0.0 <= amplitude <= 1.0:
+        raise ValueError("amplitude must be in [0, 1]")
+    rng = np.random.default_rng(seed)
+    day = rng.permutation(unique).astype(np.int64)
+    night = rng.permutation(unique).astype(np.int64)
+    ranks = zipf_ranks(n, unique, alpha, rng)
+    phase = 2.0 * np.pi * np.arange(n, dtype=np.float64) / period
+    use_night = rng.random(n) < (1.0 - amplitude * np.cos(phase)) / 2.0
+    return np.where(use_night, night[ranks], day[ranks])
+
+
+_GENERATORS: Dict[str, Callable[..., Any]] = {
+    "uniform": uniform,
+    "zipf": zipf,
+    "temporal": temporal_locality,
+    "shift": working_set_shift,
+    "scan": scan_burst,
+    "diurnal": diurnal,
+}
+
+
+def generate(kind: str, n: int, unique: int, seed: int = 0, **params: Any):
+    """
+    Dispatch by name (see WORKLOADS); `params` go to the generator.
+    """
+    fn = _GENERATORS.get(kind)
+    if fn is None:
+        raise ValueError(f"unknown workload: {kind!r} (expected one of {', '.join(WORKLOADS)})")
+    return fn(n, unique, seed=seed, **params)
+
+
+# -----------------------------
+# Trace replay
+# -----------------------------
+
+TraceKey = Union[str, Sequence[str], Callable[[Dict[str, Any]], Any]]
+
+
+@dataclass
+class Trace:
+    ids: Any          # np.ndarray of int64, one per request, in log order
+    keys: List[str]   # id -> original key
+
+    @property
+    def unique(self) -> int:
+        return len(self.keys)
+
+    def replay(self, n: Optional[int] = None):
+        """
+        The request ids, looped or truncated to `n` requests (all when None).
+        """
+        if n is None or n == len(self.ids):
+            return self.ids
+        if not len(self.ids):
+            raise ValueError("cannot replay an empty trace")
+        return np.resize(self.ids, n)
+
+
+def _key_fn(key: TraceKey) -> Callable[[Dict[str, Any]], Any]:
+    if callable(key):
+        return key
+    if isinstance(key, str):
+        return lambda record: record.get(key)
+
+    fields = tuple(key)
+
+    def composite(record: Dict[str, Any]) -> Any:
+        values = [record.get(f) for f in fields]
+        return None if any(v is None for v in values) else "/".join(str(v) for v in values)
+
+    return composite
+
+
+def trace_from_records(
+    records: Iterable[Dict[str, Any]],
+    key: TraceKey = "caseId",
+    where: Optional[Callable[[Dict[str, Any]], bool]] = None,
+) -> Trace:
+    """
+    Intern each record's key (a field name, a tuple of fields joined with
+    "/", or a function) into dense ids in first-seen order. Records without
+    the key, or rejected by `where`, are skipped.
+    """
+    _require_numpy()
+    get_key = _key_fn(key)
+    index: Dict[str, int] = {}
+
+    def ids() -> Iterable[int]:
+        for record in records:
+            if where is not None and not where(record):
+                continue
+            k = get_key(record)
+            if k is None:
+                continue
+            yield index.setdefault(str(k), len(index))
+
+    arr = np.fromiter(ids(), dtype=np.int64)
+    return Trace(arr, list(index))
+
+
+def load_trace(
+    path: str,
+    key: TraceKey = "caseId",
+    where: Optional[Callable[[Dict[str, Any]], bool]] = None,
+) -> Trace:
+    """
+    Replay a JSONL log (e.g. a run's raw/attempts.jsonl, keyed by caseId or
+    ("requestedModel", "caseId")) as a workload.
+    """
+    def records() -> Iterable[Dict[str, Any]]:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    return trace_from_records(records(), key, where)
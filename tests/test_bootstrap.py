@@ -0,0 +1,107 @@
+import random
+import unittest
+
+from src.razor.bootstrap import (
+    bootstrap_ci,
+    cluster_columns,
+    columns_from_results,
+    metric_columns,
+    paired_bootstrap,
+    resample_sums,
+)
+
+try:
+    import numpy as np
+    HAVE_NUMPY = True
+except ImportError:
+    HAVE_NUMPY = False
+
+
+def synthetic_rows(n, p_correct, seed):
+    rng = random.Random(seed)
+    return [
+        {"correct": rng.random() < p_correct, "tokens": rng.randint(1, 8), "target_max_tokens": rng.choice([None, 4])}
+        for _ in range(n)
+    ]
+
+
+@unittest.skipUnless(HAVE_NUMPY, "numpy not installed")
+class TestBootstrap(unittest.TestCase):
+    def test_point_estimates_match_summary_metrics(self):
+        cols = metric_columns([True, False, True], [4, 12, 6], [10, 10, None])
+        ci = bootstrap_ci(cols, resamples=500)
+        self.assertAlmostEqual(ci["accuracy"]["estimate"], 2 / 3)
+        self.assertEqual(ci["tpca"]["estimate"], 5.0)
+        self.assertEqual(ci["expression_overrun_rate"]["estimate"], 0.5)
+        for m in ci.values():
+            self.assertLessEqual(m["low"], m["high"])
+
+    def test_matches_naive_index_bootstrap(self):
+        cols = columns_from_results(synthetic_rows(400, 0.6, seed=1))
+        fast = bootstrap_ci(cols, resamples=4000, seed=2)["accuracy"]
+
+        rng = np.random.default_rng(3)
+        idx = rng.integers(0, len(cols), (4000, len(cols)))
+        sums = cols[idx].sum(axis=1)
+        low, high = np.quantile(sums[:, 1] / sums[:, 0], [0.025, 0.975])
+        self.assertAlmostEqual(fast["low"], low, delta=0.01)
+        self.assertAlmostEqual(fast["high"], high, delta=0.01)
+
+    def test_both_sampling_paths_agree_in_distribution(self):
+        # All-distinct rows take the index-draw path; duplicated rows the multinomial one.
+        distinct = np.stack([np.ones(300), np.arange(300) % 2, np.arange(300), np.zeros(300), np.zeros(300)], axis=1)
+        repeated = np.repeat(distinct[:30], 10, axis=0)
+        a = resample_sums(distinct.astype(np.int64), 3000, seed=4)
+        b = resample_sums(repeated.astype(np.int64), 3000, seed=4)
+        self.assertAlmostEqual(a[:, 1].mean(), 150, delta=1.0)
+        self.assertAlmostEqual(b[:, 1].mean(), 150, delta=1.0)
+        self.assertTrue(np.all(a[:, 0] == 300) and np.all(b[:, 0] == 300))
+
+    def test_deterministic_under_seed(self):
+        cols = columns_from_results(synthetic_rows(200, 0.5, seed=5))
+        self.assertEqual(bootstrap_ci(cols, 300, seed=9), bootstrap_ci(cols, 300, seed=9))
+
+    def test_undefined_metrics_are_none(self):
+        ci = bootstrap_ci(metric_columns([False, False], [3, 4], [None, None]), resamples=100)
+        self.assertIsNone(ci["tpca"]["estimate"])
+        self.assertIsNone(ci["expression_overrun_rate"]["low"])
+
+    def test_paired_difference(self):
+        base = synthetic_rows(300, 0.5, seed=6)
+        better = [dict(r, correct=True) for r in base]
+        cols_a, cols_b = columns_from_results(base), columns_from_results(better)
+
+        same = paired_bootstrap(cols_a, cols_a, resamples=500)["accuracy"]
+        self.assertEqual((same["estimate"], same["low"], same["high"]), (0.0, 0.0, 0.0))
+
+        diff = paired_bootstrap(cols_a, cols_b, resamples=2000)["accuracy"]
+        self.assertGreater(diff["low"], 0.0)
+        self.assertEqual(diff["share_positive"], 1.0)
+
+        with self.assertRaises(ValueError):
+            paired_bootstrap(cols_a, cols_b[:10])
+
+    def test_cluster_columns_sum_repetitions(self):
+        cols = metric_columns([True, False, True, True], [4, 9, 6, 2], [5, 5, None, 5])
+        labels, summed = cluster_columns(cols, ["b", "a", "b", "a"])
+        self.assertEqual(labels, ["a", "b"])
+        self.assertEqual(summed.tolist(), [[2, 1, 2, 2, 1], [2, 2, 10, 1, 0]])
+        with self.assertRaises(ValueError):
+            cluster_columns(cols, ["a"])
+
+    def test_cluster_intervals_account_for_repetitions(self):
+        # Five identical repetitions per case carry no more information than one.
+        once = columns_from_results(synthetic_rows(200, 0.5, seed=7))
+        repeated = np.repeat(once, 5, axis=0)
+        _, clustered = cluster_columns(repeated, np.repeat(np.arange(200), 5))
+
+        def width(cols):
+            ci = bootstrap_ci(cols, resamples=3000, seed=8)["accuracy"]
+            return ci["high"] - ci["low"]
+
+        self.assertAlmostEqual(width(clustered), width(once), delta=0.01)
+        self.assertGreater(width(clustered), 2 * width(repeated))
+
+
+if __name__ == "__main__":
+    unittest.main()
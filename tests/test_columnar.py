@@ -0,0 +1,80 @@
+import os
+import tempfile
+import unittest
+
+from src.razor import columnar
+from src.razor.columnar import ColumnarFile, write_columnar
+
+
+COLUMNS = {
+    "id": ("string", ["a-1", "b-2", "ü-3", ""]),
+    "category": ("category", ["Math", "Text", "Math", "Code"]),
+    "tokens": ("int64", [3, 12, 7, 2 ** 40]),
+    "correct": ("bool", [True, False, True, False]),
+    "target_max_tokens": ("opt_int64", [10, None, 0, None]),
+}
+
+
+class TestColumnarFile(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "t.rzc")
+        write_columnar(self.path, COLUMNS, meta={"summary": {"accuracy": 0.5}})
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        with ColumnarFile(self.path) as f:
+            self.assertEqual(f.rows, 4)
+            self.assertEqual(f.meta, {"summary": {"accuracy": 0.5}})
+            self.assertEqual(f.columns, list(COLUMNS))
+            for name, (_, values) in COLUMNS.items():
+                self.assertEqual(f.column(name), values)
+            self.assertEqual(f.dictionary("category"), ["Math", "Text", "Code"])
+            self.assertEqual(list(f.raw("tokens")), [3, 12, 7, 2 ** 40])
+
+    def test_filtered_reads(self):
+        with ColumnarFile(self.path) as f:
+            self.assertEqual(f.indices({"category": "Math"}), [0, 2])
+            self.assertEqual(f.indices({"category": ["Text", "Code"], "correct": False}), [1, 3])
+            self.assertEqual(f.indices({"target_max_tokens": None}), [1, 3])
+            self.assertEqual(f.indices({"category": "Missing"}), [])
+            self.assertEqual(f.indices({"id": "ü-3"}), [2])
+            self.assertEqual(
+                f.select(["id", "tokens"], where={"correct": True}),
+                {"id": ["a-1", "ü-3"], "tokens": [3, 7]},
+            )
+            rows = list(f.iter_rows({"tokens": 12}))
+            self.assertEqual(rows, [{"id": "b-2", "category": "Text", "tokens": 12, "correct": False,
+                                     "target_max_tokens": None}])
+
+    def test_filtered_reads_without_numpy(self):
+        saved = columnar.np
+        columnar.np = None
+        try:
+            with ColumnarFile(self.path) as f:
+                self.assertEqual(f.indices({"category": ["Text", "Code"], "correct": False}), [1, 3])
+                self.assertEqual(f.column("target_max_tokens"), [10, None, 0, None])
+                self.assertEqual(f.column("id", [2]), ["ü-3"])
+        finally:
+            columnar.np = saved
+
+    def test_empty_table_and_bad_input(self):
+        path = os.path.join(self.tmp.name, "empty.rzc")
+        write_columnar(path, {"tokens": ("int64", [])})
+        with ColumnarFile(path) as f:
+            self.assertEqual(f.rows, 0)
+            self.assertEqual(f.column("tokens"), [])
+        with self.assertRaises(ValueError):
+            write_columnar(path, {"a": ("int64", [1]), "b": ("int64", [1, 2])})
+        with self.assertRaises(ValueError):
+            write_columnar(path, {"a": ("float", [1.0])})
+        with open(path, "wb") as fh:
+            fh.write(b"{}" * 16)
+        with self.assertRaises(ValueError):
+            ColumnarFile(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+
+from benchmarks.benchmark_memory_gate_savings import generate_workload, run_benchmark
+from src.razor import confidence
+
+
+class TestConfidenceModels(unittest.TestCase):
+    def test_models(self):
+        self.assertEqual(confidence.sample_confidences(3, "fixed", value=0.9), [0.9, 0.9, 0.9])
+        beta = confidence.sample_confidences(20_000, "beta", seed=1, a=8.0, b=2.0)
+        self.assertAlmostEqual(sum(beta) / len(beta), 0.8, delta=0.01)
+        self.assertEqual(beta[:5], confidence.sample_confidences(5, "beta", seed=1, a=8.0, b=2.0))
+
+        bimodal = confidence.sample_confidences(20_000, "bimodal", seed=2, high_share=0.6)
+        self.assertAlmostEqual(sum(c > 0.8 for c in bimodal) / len(bimodal), 0.6, delta=0.03)
+
+        classes = confidence.parse_classes("easy=3:50:1, hard=1:1:1")
+        self.assertEqual([c.name for c in classes], ["easy", "hard"])
+        mixed = confidence.sample_confidences(20_000, "classes", seed=3, classes=classes)
+        self.assertAlmostEqual(sum(mixed) / len(mixed), 0.75 * 50 / 51 + 0.25 * 0.5, delta=0.01)
+
+        conf = confidence.assign_confidences(["b", "a", "b"], "beta", seed=4)
+        self.assertEqual(list(conf), ["b", "a"])
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            confidence.sample_confidences(1, "gaussian")
+        with self.assertRaises(ValueError):
+            confidence.sample_confidences(1, "classes")
+        with self.assertRaises(ValueError):
+            confidence.parse_classes("easy=0.5:1")
+        with self.assertRaises(ValueError):
+            confidence.parse_classes("easy=0:1:1")
+        self.assertEqual(confidence.threshold_grid(0.5, 0.9, 5), [0.5, 0.6, 0.7, 0.8, 0.9])
+
+
+class TestThresholdSweep(unittest.TestCase):
+    def test_matches_memory_bank_runs(self):
+        queries = generate_workload(4_000, 300, seed=9)
+        conf = confidence.assign_confidences(queries, "bimodal", seed=9)
+        thresholds = [0.3, 0.8, 0.95, 0.999]
+        for capacity in (None, 1_000, 60):
+            rows = confidence.threshold_sweep(queries, conf, thresholds, 100, 10.0, capacity=capacity)
+            for row in rows:
+                t = row["stability_threshold"]
+                single = run_benchmark(4_000, 300, capacity or 10_000, t, 100, 10, seed=9, workload=queries, confidences=conf)
+                self.assertEqual(row["memory_hits"], single["memory_hits"], (capacity, t))
+                self.assertEqual(row["razor_inferences"], single["razor_inferences"], (capacity, t))
+                self.assertEqual(row["token_savings"], single["token_savings"], (capacity, t))
+                # Admitted results are the stored ones; the rest were rejected.
+                admitted = round(row["admitted_fraction"] * row["razor_inferences"])
+                self.assertEqual(row["razor_inferences"] - admitted, single["rejected_results"], (capacity, t))
+
+    def test_risk_falls_with_threshold(self):
+        queries = [f"q{i % 40}" for i in range(2_000)]
+        conf = confidence.assign_confidences(queries, "beta", seed=5, a=4.0, b=1.0)
+        rows = confidence.threshold_sweep(queries, conf, confidence.threshold_grid(0.0, 1.0, 11), 1, 1.0)
+        hits = [r["memory_hits"] for r in rows]
+        errors = [r["memory_error_rate"] for r in rows if r["memory_hits"]]
+        self.assertEqual(hits, sorted(hits, reverse=True))
+        self.assertEqual(hits[0], 2_000 - 40)
+        self.assertEqual(errors, sorted(errors, reverse=True))
+        expected = sum((50 - 1) * (1 - c) for c in conf.values())
+        self.assertAlmostEqual(rows[0]["expected_wrong_hits"], expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,256 @@
+import unittest
+
+from src.razor.controller import (
+    BudgetTracker,
+    PhaseBudget,
+    RazorController,
+    SolveResult,
+)
+from src.razor.memory_bank import NegativeCache, RazorMemoryBank
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_solver(tokens=10, confidence=0.99, calls=None):
+    def solver(query, sub_results, cancel):
+        if calls is not None:
+            calls.append(query)
+        return SolveResult(solution=f"ans({query})", confidence=confidence, tokens=tokens)
+    return solver
+
+
+def chain_decomposer(query):
+    # Unbounded chain: "q" -> "q/" -> "q//" -> ...
+    return [query + "/"]
+
+
+class TestRazorController(unittest.TestCase):
+    def test_second_request_served_from_memory(self):
+        calls = []
+        ctl = RazorController(make_solver(calls=calls), memory_bank=RazorMemoryBank(capacity=10))
+
+        first = ctl.run("What is  17 x 23?")
+        second = ctl.run("what is 17 x 23?")
+
+        self.assertFalse(first.from_memory)
+        self.assertTrue(second.from_memory)
+        self.assertEqual(first.solution, second.solution)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(second.phase_usage["expression"]["tokens"], 0)
+
+    def test_usage_reported_per_phase(self):
+        ctl = RazorController(make_solver(tokens=7))
+        r = ctl.run("q")
+
+        self.assertFalse(r.terminated_early)
+        self.assertEqual(set(r.phase_usage), {"compression", "expression", "memory", "recursion"})
+        self.assertEqual(r.phase_usage["expression"]["tokens"], 7)
+        self.assertEqual(r.phase_usage["expression"]["calls"], 1)
+        self.assertIsNone(r.phase_usage["expression"]["budget"])
+
+    def test_depth_throttle_stops_runaway_recursion(self):
+        calls = []
+        ctl = RazorController(
+            make_solver(calls=calls),
+            decomposer=chain_decomposer,
+            budgets={"recursion": PhaseBudget(max_depth=3)},
+        )
+        r = ctl.run("q")
+
+        self.assertFalse(r.terminated_early)
+        self.assertEqual(r.phase_usage["recursion"]["max_depth"], 3)
+        self.assertEqual(r.phase_usage["recursion"]["throttled"], 1)
+        self.assertEqual(len(calls), 4)  # q, q/, q//, q///
+
+    def test_token_budget_cancels_request(self):
+        calls = []
+        ctl = RazorController(
+            make_solver(tokens=10, calls=calls),
+            decomposer=chain_decomposer,
+            budgets={"recursion": PhaseBudget(max_depth=50, max_tokens=25)},
+        )
+        r = ctl.run("q")
+
+        self.assertTrue(r.terminated_early)
+        self.assertEqual(r.stop_reason, "recursion.max_tokens")
+        self.assertIsNone(r.solution)
+        self.assertEqual(r.phase_usage["recursion"]["exhausted"], "max_tokens")
+        # Third sub-solve pushes recursion to 30 > 25 and stops the chain.
+        self.assertEqual(len(calls), 3)
+
+    def test_exhausted_budget_skips_solver(self):
+        calls = []
+        ctl = RazorController(
+            make_solver(tokens=5, calls=calls),
+            budgets={"expression": PhaseBudget(max_tokens=0)},
+        )
+        r = ctl.run("q")
+
+        self.assertTrue(r.terminated_early)
+        self.assertEqual(r.stop_reason, "expression.max_tokens")
+        self.assertEqual(calls, [])
+
+    def test_wall_clock_budget_cancels_cooperatively(self):
+        clock = FakeClock()
+        solver_calls = []
+
+        def slow_decomposer(query):
+            clock.now += 0.5  # 500 ms per decomposition
+            return [query + "/"]
+
+        ctl = RazorController(
+            make_solver(calls=solver_calls),
+            decomposer=slow_decomposer,
+            budgets={"recursion": PhaseBudget(max_wall_ms=1200)},
+            clock=clock,
+        )
+        r = ctl.run("q")
+
+        self.assertTrue(r.terminated_early)
+        self.assertEqual(r.stop_reason, "recursion.max_wall_ms")
+        self.assertEqual(solver_calls, [])
+        self.assertAlmostEqual(r.phase_usage["recursion"]["wall_ms"], 1500.0)
+
+    def test_polling_solver_cancelled_mid_call(self):
+        clock = FakeClock()
+        polls = []
+
+        def slow_solver(query, sub_results, cancel):
+            # 100 ms of work per step; stops as soon as the token reports cancellation.
+            for _ in range(100):
+                if cancel.cancelled:
+                    break
+                polls.append(clock.now)
+                clock.now += 0.1
+            cancel.check()
+            return SolveResult(solution="late", confidence=0.99, tokens=1)
+
+        ctl = RazorController(
+            slow_solver,
+            budgets={"expression": PhaseBudget(max_wall_ms=350)},
+            clock=clock,
+        )
+        r = ctl.run("q")
+
+        self.assertTrue(r.terminated_early)
+        self.assertEqual(r.stop_reason, "expression.max_wall_ms")
+        self.assertEqual(len(polls), 4)  # 0, 100, 200, 300 ms; cancelled past 350 ms
+        self.assertEqual(r.phase_usage["expression"]["exhausted"], "max_wall_ms")
+        self.assertIsNone(r.solution)
+        self.assertEqual(ctl.memory_bank.get_stats()["size"], 0)
+
+    def test_call_budget(self):
+        ctl = RazorController(
+            make_solver(),
+            decomposer=lambda q: [q + "/a", q + "/b", q + "/c"] if q.count("/") < 1 else [],
+            budgets={"expression": PhaseBudget(max_calls=2)},
+        )
+        r = ctl.run("q")
+
+        self.assertTrue(r.terminated_early)
+        self.assertEqual(r.stop_reason, "expression.max_calls")
+
+    def test_shared_subproblems_reused_across_requests(self):
+        calls = []
+        subs = {"p1": ["s1", "s2"], "p2": ["s2", "s3"]}
+        ctl = RazorController(make_solver(calls=calls), decomposer=lambda q: subs.get(q, []))
+
+        ctl.run("p1")
+        r = ctl.run("p2")
+
+        self.assertEqual(calls, ["s1", "s2", "p1", "s3", "p2"])
+        self.assertEqual(r.phase_usage["recursion"]["reused"], 1)
+        self.assertEqual(r.call_graph.children("p2"), {"s2", "s3"})
+        self.assertEqual(r.call_graph.nodes(), {"p2", "s2", "s3"})
+
+    def test_unverified_subproblem_solved_once_per_request(self):
+        calls = []
+        # Diamond: root -> a, b; a -> shared; b -> shared
+        subs = {"root": ["a", "b"], "a": ["shared"], "b": ["shared"]}
+        ctl = RazorController(
+            make_solver(confidence=0.1, calls=calls),  # below threshold: never stored
+            decomposer=lambda q: subs.get(q, []),
+        )
+        r = ctl.run("root")
+
+        self.assertEqual(calls.count("shared"), 1)
+        self.assertEqual(r.phase_usage["recursion"]["reused"], 1)
+        self.assertEqual(ctl.memory_bank.get_stats()["size"], 0)
+
+    def test_cycle_is_skipped(self):
+        calls = []
+        subs = {"a": ["b"], "b": ["c"], "c": ["a"]}
+        ctl = RazorController(
+            make_solver(confidence=0.1, calls=calls),
+            decomposer=lambda q: subs.get(q, []),
+        )
+        r = ctl.run("a")
+
+        self.assertFalse(r.terminated_early)
+        self.assertEqual(calls, ["c", "b", "a"])
+        self.assertEqual(r.phase_usage["recursion"]["cycles"], 1)
+
+        # The refused edge is not recorded, so the graph stays acyclic.
+        self.assertEqual(r.call_graph.children("c"), set())
+        self.assertFalse(r.call_graph.reaches("c", "a"))
+
+    def test_reverse_edge_in_later_request_is_not_a_cycle(self):
+        # a -> b in one request, b -> a in another: neither request has a cycle.
+        calls = []
+        subs = {"a": ["b"]}
+        ctl = RazorController(make_solver(confidence=0.1, calls=calls), decomposer=lambda q: subs.get(q, []))
+        ctl.run("a")
+        subs.clear()
+        subs["b"] = ["a"]
+        r = ctl.run("b")
+
+        self.assertEqual(r.phase_usage["recursion"]["cycles"], 0)
+        self.assertEqual(calls, ["b", "a", "a", "b"])
+        self.assertEqual(r.call_graph.children("b"), {"a"})
+
+    def test_negative_cache_short_circuits_unverifiable_query(self):
+        calls = []
+        bank = RazorMemoryBank(negative_cache=NegativeCache())
+        ctl = RazorController(make_solver(confidence=0.2, calls=calls), memory_bank=bank)
+
+        first = ctl.run("q")
+        second = ctl.run("q")
+
+        self.assertFalse(first.negative_hit)
+        self.assertTrue(second.negative_hit)
+        self.assertIsNone(second.solution)
+        self.assertEqual(calls, ["q"])
+        self.assertEqual(second.phase_usage["memory"]["negative_hits"], 1)
+        self.assertEqual(bank.get_stats()["negative_hits"], 1)
+
+    def test_negative_hit_routes_to_fallback(self):
+        calls, fallback_calls = [], []
+        bank = RazorMemoryBank(negative_cache=NegativeCache())
+        ctl = RazorController(
+            make_solver(confidence=0.2, calls=calls),
+            memory_bank=bank,
+            decomposer=lambda q: ["sub"] if q == "q" else [],
+            fallback=make_solver(tokens=1, confidence=0.5, calls=fallback_calls),
+        )
+
+        ctl.run("q")
+        r = ctl.run("q")
+
+        self.assertTrue(r.negative_hit)
+        self.assertEqual(r.solution, "ans(q)")
+        self.assertEqual(fallback_calls, ["q"])  # no decomposition on the fallback path
+        self.assertEqual(r.phase_usage["expression"]["tokens"], 1)
+
+    def test_unknown_phase_rejected(self):
+        with self.assertRaises(ValueError):
+            BudgetTracker({"planning": PhaseBudget(max_tokens=1)})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import json
+import os
+import tempfile
+import unittest
+
+from src.razor.cost_model import CostModel, ModelCost
+from src.razor.metrics import FPCAAccumulator
+
+
+class TestCostModel(unittest.TestCase):
+    def setUp(self):
+        self.cm = CostModel(
+            {"tiny": ModelCost(active_params=10.0, prefill_ms_per_token=1.0, decode_ms_per_token=2.0, overhead_ms=5.0)},
+            default="tiny",
+        )
+
+    def test_single_estimate(self):
+        flops, latency = self.cm.estimate("tiny", input_tokens=3, output_tokens=4)
+        self.assertEqual(flops, 2 * 10.0 * 7)
+        self.assertEqual(latency, 5.0 + 3 * 1.0 + 4 * 2.0)
+
+    def test_unknown_model_falls_back_to_default(self):
+        self.assertEqual(self.cm.resolve("gpt-4"), "tiny")
+        self.assertEqual(self.cm.estimate("gpt-4", 1, 1), self.cm.estimate("tiny", 1, 1))
+
+    def test_batch_matches_scalar(self):
+        inp, out = [1, 5, 9], [2, 0, 7]
+        flops, latency = self.cm.estimate_batch("tiny", inp, out)
+        for i, o, f, l in zip(inp, out, flops, latency):
+            self.assertEqual((float(f), float(l)), self.cm.estimate("tiny", i, o))
+
+    def test_accumulate_matches_streaming_updates(self):
+        inp, out, ok = [1, 5, 9, 2], [2, 0, 7, 3], [True, False, True, False]
+        acc = self.cm.accumulate("tiny", inp, out, ok)
+
+        expected = FPCAAccumulator()
+        for i, o, c in zip(inp, out, ok):
+            expected.update(*self.cm.estimate("tiny", i, o), c)
+        self.assertEqual(acc, expected)
+        self.assertEqual(acc.fpca, (60.0 + 320.0) / 2)
+
+    def test_from_json(self):
+        table = {"m": {"active_params": 1e9, "prefill_ms_per_token": 0.1, "decode_ms_per_token": 10.0}}
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "costs.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(table, f)
+            cm = CostModel.from_json(path)
+        self.assertEqual(cm.default, "m")
+        self.assertEqual(cm.estimate("m", 0, 1), (2e9, 10.0))
+
+    def test_bad_default_rejected(self):
+        with self.assertRaises(ValueError):
+            CostModel({}, default="missing")
+
+
+if __name__ == "__main__":
+    unittest.main()
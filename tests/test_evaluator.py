@@ -0,0 +1,483 @@
+import asyncio
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from dataclasses import asdict
+
+from src.razor.tokenizer import TokenCounter
+from benchmarks.evaluator import (
+    Case,
+    GradingPlan,
+    OnlineEvaluator,
+    OnlineEvent,
+    PlanCache,
+    ResultCache,
+    describe_counts,
+    discover_cells,
+    evaluate_matrix,
+    load_cases,
+    evaluate_outputs,
+    load_columnar_report,
+    read_columnar_report,
+    evaluate_stream,
+    follow_attempts,
+    follow_jsonl,
+    grade_case,
+    iter_cases,
+    iter_outputs,
+    plan_key,
+    write_report,
+    write_stream_report,
+)
+
+
+CASES = [
+    Case(id="n1", category="Numeric", prompt="What is 17 * 23?", acceptable_answers=["391"],
+         scoring_mode="numeric", target_max_tokens=10),
+    Case(id="e1", category="Exact", prompt="Capital of France?", acceptable_answers=["Paris"],
+         scoring_mode="exact", target_max_tokens=1),
+    Case(id="c1", category="Contains", prompt="Extract the name.", acceptable_answers=["Jonathan Harker"],
+         scoring_mode="contains", target_max_tokens=6),
+]
+
+
+class TestEvaluator(unittest.TestCase):
+    def test_grading_modes(self):
+        self.assertTrue(grade_case(CASES[0], "The answer is 391."))
+        self.assertTrue(grade_case(CASES[1], "  paris "))
+        self.assertFalse(grade_case(CASES[1], "Paris, France"))
+        self.assertTrue(grade_case(CASES[2], "Signed: Jonathan  Harker."))
+        self.assertFalse(grade_case(CASES[2], "Jonathan Harkers"))
+
+    def test_summary(self):
+        outputs = {"n1": "391", "e1": "Paris is the capital", "c1": "Jonathan Harker"}
+        report = evaluate_outputs(CASES, outputs)
+        s = report["summary"]
+
+        self.assertEqual(s["num_cases"], 3)
+        self.assertEqual(s["num_correct"], 2)
+        self.assertEqual(s["expression_overrun_rate"], 1 / 3)
+        self.assertEqual([r["id"] for r in report["results"]], ["n1", "e1", "c1"])
+
+    def test_fpca_reported_alongside_tpca(self):
+        report = evaluate_outputs(CASES, {"n1": "391"}, model="proxy-1b")
+        s = report["summary"]
+
+        self.assertEqual(s["cost_model"], "proxy-1b")
+        self.assertEqual(s["num_correct"], 1)
+        self.assertGreater(s["fpca"], 0)
+        self.assertGreater(s["total_flops"], s["fpca"])
+
+    def test_grouped_summaries_in_every_mode(self):
+        from benchmarks.benchmark_evaluator_parallel import generate_synthetic_set
+
+        cases, outputs = generate_synthetic_set(120, seed=2)
+        group_by = [["category"], ["scoring_mode", "token_bucket"]]
+        serial = evaluate_outputs(cases, outputs, group_by=group_by)["summary"]
+        parallel = evaluate_outputs(cases, outputs, group_by=group_by, workers=2, chunk_size=16)["summary"]
+        streamed = evaluate_stream(cases, list(outputs.items()), io.StringIO(), group_by=group_by)
+
+        self.assertEqual(serial, parallel)
+        self.assertEqual(serial, streamed)
+        self.assertEqual(set(serial["groups"]), {"category", "scoring_mode+token_bucket"})
+        by_category = serial["groups"]["category"]
+        self.assertEqual(sum(g["num_correct"] for g in by_category.values()), serial["num_correct"])
+        self.assertNotIn("groups", evaluate_outputs(cases, outputs)["summary"])
+
+    def test_scaling_generators_grade_as_labelled(self):
+        from benchmarks.benchmark_evaluator_scaling import generate_pairs, parse_mix, parse_range
+
+        mix = parse_mix("exact=1,contains=2,numeric=1")
+        for share, answers in [(1.0, "1-3"), (0.0, "1-3"), (1.0, "128-130")]:
+            pairs = list(generate_pairs(60, mix, parse_range(answers), correct_share=share, seed=5))
+            cases, outputs = [c for c, _ in pairs], {c.id: o for c, o in pairs}
+            summary = evaluate_outputs(cases, outputs, plans=PlanCache())["summary"]
+            self.assertEqual(summary["num_correct"], 60 if share else 0)
+        self.assertEqual({c.scoring_mode for c, _ in pairs}, {"exact", "contains", "numeric"})
+        with self.assertRaises(ValueError):
+            parse_mix("fuzzy=1")
+
+    def test_token_counter_matches_per_text_encoder(self):
+        class WordEncoder:
+            def encode(self, text):
+                return text.split()
+
+        outputs = {"n1": "391", "e1": "Paris is the capital", "c1": "Jonathan Harker"}
+        direct = evaluate_outputs(CASES, outputs, encoder=WordEncoder(), chunk_size=2)
+        enc = WordEncoder()
+        counted = evaluate_outputs(CASES, outputs, counter=TokenCounter("words", enc))
+        self.assertEqual(direct, counted)
+        self.assertEqual([r["tokens"] for r in direct["results"]], [1, 4, 2])
+
+
+class TestColumnarReports(unittest.TestCase):
+    def test_round_trip_and_filtered_reads(self):
+        from benchmarks.benchmark_evaluator_parallel import generate_synthetic_set
+
+        cases, outputs = generate_synthetic_set(300, seed=4)
+        report = evaluate_outputs(cases, outputs, group_by=[["category"]])
+        with tempfile.TemporaryDirectory() as d:
+            json_path = os.path.join(d, "r.json")
+            columnar_path = os.path.join(d, "r.rzc")
+            write_report(report, json_path)
+            write_report(report, columnar_path, "columnar")
+
+            self.assertEqual(read_columnar_report(columnar_path), report)
+            self.assertLess(os.path.getsize(columnar_path), os.path.getsize(json_path) / 3)
+
+            wrong_numeric = [r for r in report["results"] if r["category"] == "Numeric" and not r["correct"]]
+            filtered = read_columnar_report(columnar_path, where={"category": "Numeric", "correct": False})
+            self.assertEqual(filtered["results"], wrong_numeric)
+            with load_columnar_report(columnar_path) as f:
+                self.assertEqual(f.meta["summary"], report["summary"])
+                self.assertEqual(int(sum(f.raw("tokens"))), sum(r["tokens"] for r in report["results"]))
+
+            with self.assertRaises(ValueError):
+                write_report(report, json_path, "parquet")
+
+
+class TestStreamingEvaluator(unittest.TestCase):
+    OUTPUTS = {"n1": "391", "e1": "Paris is the capital", "c1": "Jonathan Harker"}
+
+    def test_stream_matches_in_memory(self):
+        buf = io.StringIO()
+        summary = evaluate_stream(CASES, self.OUTPUTS.items(), buf)
+        rows = [json.loads(line) for line in buf.getvalue().splitlines()]
+
+        expected = evaluate_outputs(CASES, self.OUTPUTS)
+        self.assertEqual(summary, expected["summary"])
+        self.assertEqual(rows, expected["results"])
+
+    def test_missing_outputs_graded_empty(self):
+        buf = io.StringIO()
+        summary = evaluate_stream(CASES, [("c1", "Jonathan Harker")], buf)
+        self.assertEqual(summary, evaluate_outputs(CASES, {"c1": "Jonathan Harker"})["summary"])
+
+    def test_out_of_order_outputs_rejected(self):
+        with self.assertRaises(ValueError):
+            evaluate_stream(CASES, [("e1", "Paris"), ("n1", "391")], io.StringIO())
+
+    def test_swapped_outputs_stop_grading_at_the_bad_row(self):
+        cases = [Case(id=f"c{i}", category="Exact", prompt="p", acceptable_answers=["a"]) for i in range(10)]
+        outputs = [(f"c{i}", "a") for i in range(10)]
+        outputs[3], outputs[4] = outputs[4], outputs[3]
+        buf = io.StringIO()
+        with self.assertRaisesRegex(ValueError, "'c3'"):
+            evaluate_stream(iter(cases), outputs, buf, chunk_size=1)
+        graded = [json.loads(line)["id"] for line in buf.getvalue().splitlines()]
+        self.assertEqual(graded, ["c0", "c1", "c2", "c3"])
+
+        with tempfile.TemporaryDirectory() as d:
+            report_path = os.path.join(d, "report.jsonl")
+            with self.assertRaises(ValueError):
+                write_stream_report(iter(cases), outputs, report_path, chunk_size=1)
+            self.assertEqual(os.listdir(d), [])
+
+    def test_unknown_output_rejected_before_grading(self):
+        buf = io.StringIO()
+        with self.assertRaisesRegex(ValueError, "matches no case"):
+            evaluate_stream(CASES, [("x9", "391")], buf)
+        self.assertEqual(buf.getvalue(), "")
+
+    def test_jsonl_files_end_to_end(self):
+        with tempfile.TemporaryDirectory() as d:
+            cases_path = os.path.join(d, "cases.jsonl")
+            outputs_path = os.path.join(d, "outputs.jsonl")
+            report_path = os.path.join(d, "report.jsonl")
+            with open(cases_path, "w", encoding="utf-8") as f:
+                for c in CASES:
+                    f.write(json.dumps(asdict(c)) + "\n")
+            with open(outputs_path, "w", encoding="utf-8") as f:
+                for cid, out in self.OUTPUTS.items():
+                    f.write(json.dumps({"id": cid, "output": out}) + "\n")
+
+            summary = write_stream_report(iter_cases(cases_path), iter_outputs(outputs_path), report_path)
+            with open(report_path, encoding="utf-8") as f:
+                lines = [json.loads(line) for line in f]
+
+        self.assertEqual(len(lines), len(CASES) + 1)
+        self.assertEqual(lines[-1], {"summary": summary})
+        self.assertEqual(summary["num_correct"], 2)
+
+
+class TestParallelEvaluator(unittest.TestCase):
+    def test_parallel_report_is_byte_identical(self):
+        from benchmarks.benchmark_evaluator_parallel import generate_synthetic_set
+
+        cases, outputs = generate_synthetic_set(200, seed=5)
+        serial = evaluate_outputs(cases, outputs)
+        parallel = evaluate_outputs(cases, outputs, workers=2, chunk_size=7)
+        self.assertEqual(json.dumps(parallel, indent=2), json.dumps(serial, indent=2))
+
+    def test_parallel_stream_matches_serial_stream(self):
+        serial_buf, parallel_buf = io.StringIO(), io.StringIO()
+        outputs = [("n1", "391"), ("c1", "Jonathan Harker")]
+        s1 = evaluate_stream(CASES, outputs, serial_buf)
+        s2 = evaluate_stream(CASES, outputs, parallel_buf, workers=2, chunk_size=1)
+        self.assertEqual(s1, s2)
+        self.assertEqual(serial_buf.getvalue(), parallel_buf.getvalue())
+
+
+class TestGradingPlans(unittest.TestCase):
+    def test_plans_match_grade_case(self):
+        cases = CASES + [
+            Case(id="m1", category="Contains", prompt="p", acceptable_answers=["new york", "ny", "york"],
+                 scoring_mode="contains"),
+            Case(id="x1", category="Exact", prompt="p", acceptable_answers=["a.b"], scoring_mode="Fuzzy"),
+            Case(id="z1", category="Exact", prompt="p", acceptable_answers=[], scoring_mode="exact"),
+            Case(id="d1", category="Numeric", prompt="p", acceptable_answers=["-3.50", "7"], scoring_mode="numeric"),
+        ]
+        outputs = [
+            "", "391", "The answer is 391.", "  paris ", "Paris, France", "Jonathan Harker.",
+            "Jonathan Harkers", "new yorker", "visit New York", "ny!", "yorkshire", "a.b", "axb",
+            "It is -3.50", "-3.5", "7 or 8", "x7",
+        ]
+        for case in cases:
+            plan = GradingPlan.compile(case)
+            for out in outputs:
+                self.assertEqual(plan.grade(out), grade_case(case, out), (case.id, out))
+
+    def test_many_aliases_use_single_pass_matcher(self):
+        aliases = [f"alias {i}" for i in range(300)] + ["count dracula"]
+        case = Case(id="a1", category="Contains", prompt="p", acceptable_answers=aliases, scoring_mode="contains")
+        plan = GradingPlan.compile(case)
+        for out in ["It was Count  Dracula.", "alias 29", "alias 2999", "aliases 1", ""]:
+            self.assertEqual(plan.grade(out), grade_case(case, out), out)
+
+    def test_plan_cache_persists_across_instances(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "plans.json")
+            cache = PlanCache(path)
+            self.assertTrue(cache.get(CASES[2]).grade("Jonathan Harker"))
+            cache.save()
+
+            reloaded = PlanCache(path)
+            self.assertEqual(len(reloaded._stored), 1)
+            self.assertTrue(reloaded.get(CASES[2]).grade("Jonathan Harker"))
+
+            report = evaluate_outputs(CASES, {"n1": "391"}, plans=reloaded)
+            self.assertEqual(report, evaluate_outputs(CASES, {"n1": "391"}))
+
+    def test_key_does_not_compile(self):
+        cache = PlanCache()
+        self.assertEqual(cache.key(CASES[2]), plan_key(CASES[2]))
+        self.assertEqual(len(cache._plans), 0)
+        self.assertEqual(cache.key(CASES[2]), cache.entry(CASES[2])[0])
+
+    def test_pooled_workers_plans_are_saved(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "plans.json")
+            cache = PlanCache(path)
+            report = evaluate_outputs(CASES, {"n1": "391"}, workers=2, chunk_size=1, plans=cache)
+            cache.save()
+            self.assertEqual(report, evaluate_outputs(CASES, {"n1": "391"}))
+            self.assertEqual(len(PlanCache(path)._stored), len(CASES))
+
+
+class TestResultCache(unittest.TestCase):
+    OUTPUTS = {"n1": "391", "e1": "Paris is the capital", "c1": "Jonathan Harker"}
+
+    def test_rerun_only_regrades_changed_pairs(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "results.bin")
+            cache = ResultCache(path)
+            first = evaluate_outputs(CASES, self.OUTPUTS, result_cache=cache)
+            self.assertEqual(cache.get_stats()["misses"], 3)
+            cache.save()
+
+            changed = dict(self.OUTPUTS, e1="Paris")
+            cache = ResultCache(path)
+            rerun = evaluate_outputs(CASES, changed, result_cache=cache, workers=2, chunk_size=2)
+            self.assertEqual((cache.hits, cache.misses), (2, 1))
+            self.assertEqual(rerun, evaluate_outputs(CASES, changed))
+            self.assertEqual(first["summary"]["num_correct"] + 1, rerun["summary"]["num_correct"])
+
+            cache.save()
+            self.assertEqual(len(ResultCache(path)), 4)
+
+    def test_edited_answers_invalidate_entries(self):
+        cache = ResultCache()
+        evaluate_outputs(CASES, self.OUTPUTS, result_cache=cache)
+        edited = [CASES[0], CASES[1], Case(**dict(asdict(CASES[2]), acceptable_answers=["Harker"]))]
+        evaluate_outputs(edited, self.OUTPUTS, result_cache=cache)
+        self.assertEqual((cache.hits, cache.misses), (2, 4))
+
+    def test_torn_or_foreign_files_are_rewritten(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "results.bin")
+            cache = ResultCache(path)
+            evaluate_outputs(CASES, self.OUTPUTS, result_cache=cache)
+            cache.save()
+            with open(path, "ab") as f:
+                f.write(b"\x01\x02\x03")
+            self.assertEqual(len(ResultCache(path)), 3)
+
+            with open(path, "wb") as f:
+                f.write(b"not a cache")
+            cache = ResultCache(path)
+            self.assertEqual(len(cache), 0)
+            cache.put(b"k" * 16, True, 3, 4)
+            cache.save()
+            self.assertEqual(len(ResultCache(path)), 1)
+
+
+RUN_DIR = os.path.join(
+    os.path.dirname(__file__), "..", "results", "v0.1.0", "runs", "rr-brp-0.1.0-2026-08-17T11-22-19-303Z"
+)
+
+
+class TestMatrixEvaluation(unittest.TestCase):
+    def test_matches_recorded_aggregate_summary(self):
+        cases = load_cases(os.path.join(RUN_DIR, "frozen", "razor_eval_v0.json"))
+        cells = discover_cells(os.path.join(RUN_DIR, "evaluations"))
+        self.assertEqual(len(cells), 18)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            aggregate = evaluate_matrix(cases, cells, tmp)
+            with open(os.path.join(tmp, "gpt-5.6-terra__API-C0__r2.report.json"), encoding="utf-8") as f:
+                cell_report = json.load(f)
+
+        with open(os.path.join(RUN_DIR, "evaluations", "gpt-5.6-terra__API-C0__r2.report.json"), encoding="utf-8") as f:
+            self.assertEqual(cell_report["results"], json.load(f)["results"])
+
+        with open(os.path.join(RUN_DIR, "aggregate-summary.json"), encoding="utf-8") as f:
+            recorded = {(a["model"], a["conditionId"]): a for a in json.load(f)["aggregates"]}
+        self.assertEqual(len(aggregate["aggregates"]), len(recorded))
+        for a in aggregate["aggregates"]:
+            r = recorded[(a["model"], a["conditionId"])]
+            for key in ("observationCount", "correctAnswerCount", "accuracy", "visibleOutputTokens",
+                        "tokensPerCorrectAnswer", "expressionOverrunRate"):
+                self.assertEqual(a[key], r[key], key)
+            self.assertEqual(
+                a["descriptiveStatistics"]["visibleOutputTokensPerObservation"],
+                r["descriptiveStatistics"]["visibleOutputTokensPerObservation"],
+            )
+
+    def test_manifest_and_parallel_grading(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, outputs in [("a.json", {"n1": "391"}), ("b.json", {"e1": "Paris"})]:
+                with open(os.path.join(tmp, name), "w", encoding="utf-8") as f:
+                    json.dump(outputs, f)
+            manifest = os.path.join(tmp, "manifest.json")
+            with open(manifest, "w", encoding="utf-8") as f:
+                json.dump({"cells": [
+                    {"model": "m/x", "condition": "C0", "repetition": 1, "outputs": "a.json"},
+                    {"model": "m/x", "condition": "C0", "repetition": 2, "outputs": "b.json"},
+                ]}, f)
+
+            cells = discover_cells(manifest)
+            self.assertEqual(cells[0].stem, "m_x__C0__r1")
+            serial = evaluate_matrix(CASES, cells, os.path.join(tmp, "s"))
+            parallel = evaluate_matrix(CASES, cells, os.path.join(tmp, "p"), workers=2, chunk_size=2)
+            columnar = evaluate_matrix(CASES, cells, os.path.join(tmp, "c"), report_format="columnar")
+            self.assertTrue(columnar["cells"][0]["reportPath"].endswith("m_x__C0__r1.report.rzc"))
+            self.assertEqual(
+                read_columnar_report(columnar["cells"][0]["reportPath"])["summary"]["num_correct"], 1
+            )
+
+        agg = serial["aggregates"][0]
+        self.assertEqual((agg["repetitionCount"], agg["observationCount"], agg["correctAnswerCount"]), (2, 6, 2))
+        self.assertEqual(serial["aggregates"], parallel["aggregates"])
+
+    def test_bootstrap_comparisons(self):
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            self.skipTest("numpy not installed")
+        cases = load_cases(os.path.join(RUN_DIR, "frozen", "razor_eval_v0.json"))
+        cells = discover_cells(os.path.join(RUN_DIR, "evaluations"))
+        with tempfile.TemporaryDirectory() as tmp:
+            aggregate = evaluate_matrix(cases, cells, tmp, bootstrap=500, baseline_condition="API-C0")
+
+        self.assertIn("confidenceIntervals", aggregate["aggregates"][0])
+        comparisons = {c["model"]: c for c in aggregate["comparisons"]}
+        self.assertEqual(len(comparisons), 3)
+        terra = comparisons["gpt-5.6-terra"]
+        self.assertEqual((terra["conditionId"], terra["pairedCaseCount"]), ("API-R1", 4))
+        self.assertEqual(terra["differences"]["accuracy"]["estimate"], 0.5)
+
+    def test_matrix_groups_merge_across_repetitions(self):
+        cases = load_cases(os.path.join(RUN_DIR, "frozen", "razor_eval_v0.json"))
+        cells = discover_cells(os.path.join(RUN_DIR, "evaluations"))
+        with tempfile.TemporaryDirectory() as tmp:
+            aggregate = evaluate_matrix(cases, cells, tmp, group_by=[["category"]])
+
+        for a in aggregate["aggregates"]:
+            by_category = a["groups"]["category"]
+            self.assertEqual(sum(g["num_cases"] for g in by_category.values()), a["observationCount"])
+            self.assertEqual(sum(g["num_correct"] for g in by_category.values()), a["correctAnswerCount"])
+
+    def test_describe_counts(self):
+        d = describe_counts({1: 2, 3: 1, 4: 1})
+        self.assertEqual((d["median"], d["mean"], d["observedRange"]), (2.0, 2.25, 3))
+        self.assertIsNone(describe_counts({})["median"])
+
+
+class TestOnlineEvaluation(unittest.TestCase):
+    def test_attempts_match_recorded_aggregates(self):
+        cases = load_cases(os.path.join(RUN_DIR, "frozen", "razor_eval_v0.json"))
+        online = OnlineEvaluator(cases)
+        online.consume(follow_attempts(os.path.join(RUN_DIR, "raw", "attempts.jsonl"), idle_timeout=0))
+        snapshot = online.snapshot()
+
+        with open(os.path.join(RUN_DIR, "aggregate-summary.json"), encoding="utf-8") as f:
+            recorded = {(a["model"], a["conditionId"]): a for a in json.load(f)["aggregates"]}
+        self.assertEqual((snapshot["events"], snapshot["unknownCases"]), (72, 0))
+        self.assertEqual(len(snapshot["groups"]), len(recorded))
+        for g in snapshot["groups"]:
+            r, s = recorded[(g["model"], g["conditionId"])], g["summary"]
+            self.assertEqual(
+                (s["num_cases"], s["num_correct"], s["tpca"], s["expression_overrun_rate"]),
+                (r["observationCount"], r["correctAnswerCount"], r["tokensPerCorrectAnswer"],
+                 r["expressionOverrunRate"]),
+            )
+
+    def test_queue_events_and_early_stop(self):
+        online = OnlineEvaluator(CASES)
+
+        async def run():
+            queue = asyncio.Queue()
+            for event in [("n1", "391"), ("zz", "?"), OnlineEvent("e1", "Paris", condition="C1"),
+                          ("c1", "Jonathan Harker"), ("c1", "never graded")]:
+                queue.put_nowait(event)
+            await online.consume_queue(queue, until=lambda ev: ev.summary()["num_cases"] == 2)
+
+        asyncio.run(run())
+        self.assertEqual((online.events, online.unknown_cases), (4, 1))
+        self.assertEqual(online.summary()["num_correct"], 2)
+        self.assertEqual(online.summary(condition="C1")["num_correct"], 1)
+        self.assertIsNone(online.summary(condition="C2"))
+
+        batch = evaluate_outputs(CASES, {"n1": "391", "e1": "nope", "c1": "Jonathan Harker"})["summary"]
+        streamed = OnlineEvaluator(CASES).consume([("n1", "391"), ("e1", "nope"), ("c1", "Jonathan Harker")])
+        self.assertEqual(streamed.summary(), batch)
+
+    def test_follow_picks_up_appended_lines(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "attempts.jsonl")
+            lines = [json.dumps({"n": i}) + "\n" for i in range(5)]
+
+            def writer():
+                time.sleep(0.05)  # file does not exist yet when following starts
+                with open(path, "w", encoding="utf-8") as f:
+                    for line in lines:
+                        half = len(line) // 2
+                        f.write(line[:half])
+                        f.flush()
+                        time.sleep(0.02)
+                        f.write(line[half:])
+                        f.flush()
+
+            t = threading.Thread(target=writer)
+            t.start()
+            records = list(follow_jsonl(path, poll_interval=0.01, idle_timeout=0.5))
+            t.join()
+        self.assertEqual(records, [{"n": i} for i in range(5)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import random
+import re
+import unittest
+
+from src.razor.matching import WordBoundaryMatcher
+
+
+def regex_contains(patterns, text):
+    return any(re.search(rf"\b{re.escape(p)}\b", text) for p in patterns)
+
+
+class TestWordBoundaryMatcher(unittest.TestCase):
+    def test_whole_word_only(self):
+        m = WordBoundaryMatcher(["harker", "jonathan harker", "mina"])
+        self.assertEqual(m.search("signed: jonathan harker."), (8, 23))
+        self.assertFalse(m.matches("harkers and minas"))
+        self.assertTrue(m.matches("mina_ or mina"))
+
+    def test_non_word_edges_follow_regex(self):
+        # \b next to a non-word pattern edge needs a word char on the other side.
+        for pattern, text in [("-3", "x-3"), ("-3", " -3"), ("a.", "a.b"), ("a.", "a. b"), ("", ""), ("", "!")]:
+            self.assertEqual(WordBoundaryMatcher([pattern]).matches(text), regex_contains([pattern], text),
+                             (pattern, text))
+
+    def test_overlapping_patterns_via_fail_links(self):
+        m = WordBoundaryMatcher(["she", "he", "hers", "his"])
+        self.assertTrue(m.matches("ushe he"))
+        self.assertFalse(m.matches("ushers"))
+
+    def test_randomized_equivalence_with_regex(self):
+        rng = random.Random(0)
+        alphabet = "ab _-.é1"
+        for _ in range(5000):
+            patterns = ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 4)))
+                        for _ in range(rng.randint(1, 6))]
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 16)))
+            self.assertEqual(WordBoundaryMatcher(patterns).matches(text), regex_contains(patterns, text),
+                             (patterns, text))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,7 @@
 import unittest
 import time
 
-from src.razor.memory_bank import RazorMemoryBank
+from src.razor.memory_bank import NegativeCache, RazorMemoryBank
 
 
 class TestRazorMemoryBank(unittest.TestCase):
@@ -53,6 +53,19 @@ class TestRazorMemoryBank(unittest.TestCase):
         self.assertIsNone(sol2)
         self.assertEqual(sol1, "s1")
 
+    def test_restore_refreshes_recency(self):
+        self.bank.store("q1", "s1", 0.95)
+        self.bank.store("q2", "s2", 0.95)
+        self.bank.store("q3", "s3", 0.95)
+
+        # Re-storing q1 makes it most recent, so q2 is evicted next
+        self.bank.store("q1", "s1b", 0.95)
+        self.bank.store("q4", "s4", 0.95)
+
+        self.assertIsNone(self.bank.retrieve("q2")[0])
+        self.assertEqual(self.bank.retrieve("q1")[0], "s1b")
+        self.assertEqual(len(self.bank.lru_queue), 3)
+
     def test_timestamp_set(self):
         self.bank.store("q1", "s1", 0.95)
         key = self.bank._hash_query("q1")
@@ -106,7 +119,62 @@ class TestRazorMemoryBank(unittest.TestCase):
 
         self.assertGreater(t2, t1)
 
-if __name__ == "__main__":
-    unittest.main()
+    def test_rejected_counted_in_stats(self):
+        self.bank.store("q1", "s1", confidence=0.50)
+        self.bank.store("q2", "s2", confidence=0.95)
+        stats = self.bank.get_stats()
+        self.assertEqual(stats["rejected"], 1)
+        self.assertEqual(stats["size"], 1)
+
 
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
 
+    def __call__(self):
+        return self.now
+
+
+class TestNegativeCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.neg = NegativeCache(capacity=2, base_ttl=10.0, max_ttl=35.0, clock=self.clock)
+        self.bank = RazorMemoryBank(capacity=3, stability_threshold=0.90, negative_cache=self.neg)
+
+    def test_rejected_result_is_negative_until_ttl(self):
+        self.bank.store("q1", "s1", confidence=0.50)
+        self.assertTrue(self.bank.is_negative("q1"))
+
+        self.clock.now = 10.0
+        self.assertFalse(self.bank.is_negative("q1"))
+
+    def test_exponential_backoff_capped(self):
+        key = "k"
+        ttls = [self.neg.record_failure(key, 0.1) for _ in range(4)]
+        self.assertEqual(ttls, [10.0, 20.0, 35.0, 35.0])
+
+    def test_backoff_survives_expiry(self):
+        self.neg.record_failure("k", 0.1)
+        self.clock.now = 100.0
+        self.assertFalse(self.neg.is_negative("k"))
+        self.assertEqual(self.neg.record_failure("k", 0.1), 20.0)
+
+    def test_verified_store_clears_negative(self):
+        self.bank.store("q1", "s1", confidence=0.50)
+        self.bank.store("q1", "s1", confidence=0.95)
+        self.assertFalse(self.bank.is_negative("q1"))
+
+    def test_bounded_and_stats(self):
+        for q in ["q1", "q2", "q3"]:
+            self.bank.store(q, "s", confidence=0.10)
+        self.assertFalse(self.bank.is_negative("q1"))  # evicted
+        self.assertTrue(self.bank.is_negative("q3"))
+
+        stats = self.bank.get_stats()
+        self.assertEqual(stats["rejected"], 3)
+        self.assertEqual(stats["negative_size"], 2)
+        self.assertEqual(stats["negative_hits"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
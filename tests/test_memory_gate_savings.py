@@ -0,0 +1,87 @@
+import unittest
+
+from benchmarks.benchmark_memory_gate_savings import (
+    generate_hierarchical_workload,
+    resolve_ms_per_inference,
+    generate_workload,
+    run_benchmark,
+    run_capacity_curve,
+    run_hierarchical_benchmark,
+    run_queue_benchmark,
+)
+from src.razor.confidence import assign_confidences
+from src.razor.cost_model import CostModel
+
+
+class TestHierarchicalBenchmark(unittest.TestCase):
+    def test_shared_subproblems_solved_once(self):
+        workload, decomposition = generate_hierarchical_workload(300, 12, 6, 3, seed=4)
+        parents = set(workload)
+        subs = {s for p in parents for s in decomposition[p]}
+
+        r = run_hierarchical_benchmark(300, 12, 6, 3, 1_000, 0.95, 100, 10, seed=4)
+
+        self.assertEqual(r["baseline_inferences"], 300 * 4)
+        self.assertEqual(r["parent_inferences"], len(parents))
+        self.assertEqual(r["subproblem_inferences"], len(subs))
+        self.assertEqual(r["memory_hits"], 300 - len(parents))
+        self.assertEqual(r["subproblem_reuses"], 3 * len(parents) - len(subs))
+        self.assertEqual(r["call_graph_nodes"], len(parents | subs))
+        self.assertEqual(r["token_savings"], (1_200 - len(parents) - len(subs)) * 100)
+
+    def test_nothing_stored_above_simulated_confidence(self):
+        r = run_hierarchical_benchmark(50, 5, 4, 2, 1_000, 0.999, 100, 10, seed=1)
+        self.assertEqual(r["memory_hits"], 0)
+        self.assertEqual(r["parent_inferences"], 50)
+
+
+class TestLatencyPerInference(unittest.TestCase):
+    def run_with_model(self, model, override=None):
+        ms = resolve_ms_per_inference(override, CostModel(), model, 200, 800)
+        return run_benchmark(500, 50, 1_000, 0.95, 800, ms, seed=3)
+
+    def test_reported_ms_follow_the_cost_model(self):
+        small = self.run_with_model("proxy-1b")
+        large = self.run_with_model("proxy-70b")
+        self.assertEqual(small["memory_hits"], large["memory_hits"])
+        self.assertLess(small["assumed_ms_per_inference"], large["assumed_ms_per_inference"])
+        self.assertLess(small["baseline_ms"], large["baseline_ms"])
+        self.assertLess(small["ms_savings"], large["ms_savings"])
+
+        latency = CostModel().estimate("proxy-70b", 200, 800)[1]
+        self.assertAlmostEqual(large["baseline_ms"], 500 * latency)
+        self.assertAlmostEqual(large["ms_savings"], large["memory_hits"] * latency)
+
+    def test_flag_overrides_the_cost_model(self):
+        small = self.run_with_model("proxy-1b", override=600)
+        large = self.run_with_model("proxy-70b", override=600)
+        self.assertEqual(small["baseline_ms"], 500 * 600)
+        self.assertEqual(small["ms_savings"], large["ms_savings"])
+
+
+class TestConfidenceModes(unittest.TestCase):
+    def setUp(self):
+        self.queries = generate_workload(3_000, 200, seed=5)
+        self.confidences = assign_confidences(self.queries, "bimodal", seed=5, high_share=0.6)
+
+    def test_capacity_curve_matches_runs(self):
+        capacities = [10, 50, 200]
+        curve = run_capacity_curve(
+            self.queries, 200, 0.9, 100, 10.0, capacities=capacities, confidences=self.confidences
+        )["curve"]
+        for c, row in zip(capacities, curve):
+            r = run_benchmark(3_000, 200, c, 0.9, 100, 10.0, seed=0, workload=self.queries, confidences=self.confidences)
+            self.assertEqual(row["memory_hits"], r["memory_hits"], c)
+        fixed = run_capacity_curve(self.queries, 200, 0.9, 100, 10.0, capacities=[200])["curve"][0]
+        self.assertLess(curve[-1]["memory_hits"], fixed["memory_hits"])
+
+    def test_queue_uses_confidences(self):
+        def hit_rate(confidences):
+            r = run_queue_benchmark(self.queries, 200, 1_000, 0.9, 4, 5.0, seed=5, confidences=confidences)
+            return r["razor"]["memory_hit_rate"]
+
+        self.assertLess(hit_rate(self.confidences), hit_rate(None))
+
+
+if __name__ == "__main__":
+    unittest.main()
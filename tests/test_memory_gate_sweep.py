@@ -0,0 +1,124 @@
+import copy
+import csv
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+from benchmarks import benchmark_memory_gate_savings, benchmark_memory_gate_sweep
+from benchmarks.benchmark_memory_gate_savings import build_confidences, run_benchmark
+from benchmarks.benchmark_memory_gate_sweep import (
+    SWEEP_COLUMNS,
+    default_workload_params,
+    run_sweep,
+    workload_ids,
+    write_table,
+)
+from src.razor import workloads
+
+try:
+    import numpy  # noqa: F401
+    HAVE_NUMPY = True
+except ImportError:
+    HAVE_NUMPY = False
+
+
+def run_cli(main, argv):
+    out = io.StringIO()
+    with mock.patch.object(sys, "argv", ["prog", *argv]), redirect_stdout(out):
+        main()
+    return json.loads(out.getvalue())
+
+
+class TestMemoryGateSweep(unittest.TestCase):
+    def test_rows_match_single_runs_in_grid_order(self):
+        r = run_sweep(["uniform"], [50, 400], [10, 100], [0.9, 0.995], 2_000, 1_000, 100, seed=7)
+        rows = r["rows"]
+        self.assertEqual(r["points"], 8)
+        keys = [(row["unique_queries"], row["memory_capacity"], row["stability_threshold"]) for row in rows]
+        self.assertEqual(keys, sorted(keys))
+        for row in rows:
+            single = run_benchmark(
+                2_000, row["unique_queries"], row["memory_capacity"], row["stability_threshold"], 1_000, 100, seed=7
+            )
+            self.assertEqual(row, {k: single[k] for k in SWEEP_COLUMNS})
+
+    def test_cli_row_matches_single_run_with_default_costs(self):
+        point = ["--total-queries", "2000", "--unique-queries", "300", "--seed", "5"]
+        sweep = run_cli(
+            benchmark_memory_gate_sweep.main,
+            [*point, "--capacities", "100", "--thresholds", "0.95", "--workers", "1", "--json"],
+        )
+        single = run_cli(benchmark_memory_gate_savings.main, [*point, "--capacity", "100", "--json"])
+        row = sweep["rows"][0]
+        self.assertEqual(row, {k: single[k] for k in SWEEP_COLUMNS})
+        self.assertEqual(sweep["config"]["assumed_ms_per_inference"], single["cost_model_ms_per_inference"])
+
+    @unittest.skipUnless(HAVE_NUMPY, "numpy not installed")
+    def test_thresholds_gate_on_confidence_model(self):
+        params = default_workload_params()
+        params.confidence, params.beta_a, params.beta_b = "beta", 4.0, 1.0
+        grid = (["uniform", "zipf"], [100], [50], [0.5, 0.8, 0.95], 3_000, 800, 10.0)
+        r = run_sweep(*grid, seed=2, params=params)
+        self.assertEqual(r["config"]["confidence"], "beta")
+        for kind in ("uniform", "zipf"):
+            rows = [row for row in r["rows"] if row["workload"] == kind]
+            hits = [row["memory_hits"] for row in rows]
+            self.assertEqual(hits, sorted(hits, reverse=True))
+            self.assertGreater(hits[0], hits[-1])
+
+            ids, unique = workload_ids(kind, 3_000, 100, 2, params)
+            queries = workloads.query_names(ids.tolist() if hasattr(ids, "tolist") else list(ids))
+            ns = copy.copy(params)
+            ns.seed = 2
+            confidences = build_confidences(ns, queries)
+            for row in rows:
+                single = run_benchmark(
+                    3_000, unique, 50, row["stability_threshold"], 800, 10.0, seed=2,
+                    workload=queries, workload_name=kind, confidences=confidences,
+                )
+                self.assertEqual(row, {k: single[k] for k in SWEEP_COLUMNS})
+        self.assertEqual(run_sweep(*grid, seed=2, params=params, workers=2)["rows"], r["rows"])
+
+    @unittest.skipUnless(HAVE_NUMPY, "numpy not installed")
+    def test_deterministic_across_workers(self):
+        grid = (["zipf", "scan"], [100], [10, 50], [0.95], 3_000, 1_000, 100)
+        serial = run_sweep(*grid, seed=3, workers=1)["rows"]
+        parallel = run_sweep(*grid, seed=3, workers=2)["rows"]
+        self.assertEqual(serial, parallel)
+        self.assertNotEqual(serial, run_sweep(*grid, seed=4, workers=1)["rows"])
+
+    @unittest.skipUnless(HAVE_NUMPY, "numpy not installed")
+    def test_scan_counts_scanned_ids_as_unique(self):
+        # 3,000 requests in cycles of 400 background + 100 scanned: 600 scanned ids.
+        params = default_workload_params()
+        params.scan_length, params.scan_every = 100, 400
+        ids, unique = workload_ids("scan", 3_000, 50, 1, params)
+        self.assertEqual(unique, 50 + 600)
+        self.assertGreaterEqual(unique, len(set(ids.tolist())))
+        row = run_sweep(["scan"], [50], [10], [0.95], 3_000, 1_000, 100, seed=1, params=params)["rows"][0]
+        self.assertEqual(row["unique_queries"], 650)
+
+    def test_table_output_and_validation(self):
+        rows = run_sweep(["uniform"], [20], [5], [0.9], 200, 10, 1)["rows"]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "sweep.csv")
+            write_table(rows, path)
+            with open(path, newline="") as f:
+                table = list(csv.DictReader(f))
+            self.assertEqual(list(table[0]), list(SWEEP_COLUMNS))
+            self.assertEqual(int(table[0]["memory_hits"]), rows[0]["memory_hits"])
+            with self.assertRaises(ValueError):
+                write_table(rows, os.path.join(tmp, "sweep.parquet"))
+        with self.assertRaises(ValueError):
+            run_sweep(["hierarchical"], [20], [5], [0.9], 200, 10, 1)
+        with self.assertRaises(ValueError):
+            run_sweep(["uniform"], [], [5], [0.9], 200, 10, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,253 @@
+import math
+import random
+import unittest
+from collections import Counter
+
+from src.razor.metrics import (
+    DriftTracker,
+    FPCAAccumulator,
+    GroupedAccumulator,
+    TPCAAccumulator,
+    answer_fingerprint,
+    merge_all,
+    token_bucket,
+)
+
+
+def random_observations(n, seed=0):
+    rng = random.Random(seed)
+    return [
+        (rng.randint(1, 50), rng.random() < 0.7, rng.choice([None, 10, 20]))
+        for _ in range(n)
+    ]
+
+
+class TestTPCAAccumulator(unittest.TestCase):
+    def test_summary_matches_inline_counts(self):
+        acc = TPCAAccumulator()
+        acc.update(4, True, 10)
+        acc.update(12, False, 10)
+        acc.update(6, True, None)
+
+        s = acc.summary()
+        self.assertEqual(s["num_cases"], 3)
+        self.assertEqual(s["num_correct"], 2)
+        self.assertAlmostEqual(s["accuracy"], 2 / 3)
+        self.assertEqual(s["tpca"], 5.0)
+        self.assertEqual(s["expression_overrun_rate"], 0.5)
+        self.assertEqual(s["total_tokens"], 22)
+
+    def test_empty_summary(self):
+        s = TPCAAccumulator().summary()
+        self.assertEqual(s["accuracy"], 0.0)
+        self.assertIsNone(s["tpca"])
+        self.assertIsNone(s["expression_overrun_rate"])
+
+    def test_sharded_merge_equals_serial(self):
+        obs = random_observations(1000)
+
+        serial = TPCAAccumulator()
+        for o in obs:
+            serial.update(*o)
+
+        shards = [TPCAAccumulator() for _ in range(7)]
+        for i, o in enumerate(obs):
+            shards[i % 7].update(*o)
+
+        self.assertEqual(merge_all(shards, TPCAAccumulator()), serial)
+        # Associative and commutative
+        a, b, c = shards[:3]
+        self.assertEqual((a + b) + c, a + (b + c))
+        self.assertEqual(a + b, b + a)
+
+    def test_serialization_roundtrip(self):
+        acc = TPCAAccumulator()
+        for o in random_observations(100):
+            acc.update(*o)
+
+        data = acc.to_bytes()
+        self.assertEqual(len(data), 49)
+        self.assertEqual(TPCAAccumulator.from_bytes(data), acc)
+        self.assertEqual(TPCAAccumulator.from_dict(acc.to_dict()), acc)
+
+    def test_rejects_unknown_version(self):
+        data = bytearray(TPCAAccumulator().to_bytes())
+        data[0] = 99
+        with self.assertRaises(ValueError):
+            TPCAAccumulator.from_bytes(bytes(data))
+
+
+class TestFPCAAccumulator(unittest.TestCase):
+    def test_fpca_and_merge(self):
+        a, b = FPCAAccumulator(), FPCAAccumulator()
+        a.update(flops=100.0, latency_ms=10.0, correct=True)
+        b.update(flops=300.0, latency_ms=30.0, correct=True)
+        b.update(flops=50.0, latency_ms=5.0, correct=False)
+
+        merged = a + b
+        self.assertEqual(merged.fpca, 200.0)
+        self.assertEqual(merged.latency_per_correct_ms, 20.0)
+        self.assertEqual(merged.total_flops, 450.0)
+        self.assertEqual(FPCAAccumulator.from_bytes(merged.to_bytes()), merged)
+
+    def test_no_correct_answers(self):
+        acc = FPCAAccumulator()
+        acc.update(flops=1.0, latency_ms=1.0, correct=False)
+        self.assertIsNone(acc.fpca)
+
+
+def random_rows(n, seed=0):
+    rng = random.Random(seed)
+    return [
+        {
+            "category": rng.choice(["Numeric", "Exact", "Contains"]),
+            "scoring_mode": rng.choice(["numeric", "exact"]),
+            "tokens": rng.randint(1, 300),
+            "correct": rng.random() < 0.7,
+            "target_max_tokens": rng.choice([None, 10]),
+        }
+        for _ in range(n)
+    ]
+
+
+class TestGroupedAccumulator(unittest.TestCase):
+    def test_token_buckets(self):
+        self.assertEqual([token_bucket(t) for t in (1, 4, 63, 64, 300)], ["0-3", "4-15", "16-63", "64-255", "256+"])
+        self.assertEqual(token_bucket(5, (10,)), "0-9")
+
+    def test_groups_match_filtered_totals(self):
+        rows = random_rows(500)
+        g = GroupedAccumulator(["category"])
+        for r in rows:
+            g.update(r)
+
+        numeric = TPCAAccumulator()
+        for r in rows:
+            if r["category"] == "Numeric":
+                numeric.update(r["tokens"], r["correct"], r["target_max_tokens"])
+        self.assertEqual(g.groups["Numeric"], numeric)
+        self.assertEqual(sum(s["num_cases"] for s in g.summary().values()), 500)
+
+    def test_sharded_merge_equals_serial(self):
+        rows = random_rows(600, seed=1)
+        fields = ["scoring_mode", "token_bucket"]
+        serial = GroupedAccumulator(fields)
+        shards = [GroupedAccumulator(fields) for _ in range(4)]
+        for i, r in enumerate(rows):
+            serial.update(r)
+            shards[i % 4].update(r)
+
+        self.assertEqual(merge_all(shards[1:], shards[0]), serial)
+        self.assertIn("numeric/64-255", serial.summary())
+        self.assertEqual(GroupedAccumulator.from_dict(serial.to_dict()), serial)
+
+    def test_rejects_bad_configuration(self):
+        with self.assertRaises(ValueError):
+            GroupedAccumulator(["prompt"])
+        with self.assertRaises(ValueError):
+            GroupedAccumulator(["category"], token_edges=(16, 4))
+        with self.assertRaises(ValueError):
+            GroupedAccumulator(["category"]).merge(GroupedAccumulator(["scoring_mode"]))
+
+
+class TestDriftTracker(unittest.TestCase):
+    def test_normalized_answers_share_fingerprint(self):
+        self.assertEqual(answer_fingerprint(" Paris\n"), answer_fingerprint("paris"))
+        self.assertNotEqual(answer_fingerprint("Paris"), answer_fingerprint("Lyon"))
+
+    def test_consistent_case(self):
+        t = DriftTracker()
+        for _ in range(3):
+            t.update("m", "C0", "c1", "391")
+        d = t.get("m", "C0", "c1")
+        self.assertEqual(d.inconsistency, 0.0)
+        self.assertEqual(d.flip_rate, 0.0)
+        self.assertEqual(d.entropy_bits, 0.0)
+
+    def test_online_stats_match_batch(self):
+        rng = random.Random(3)
+        answers = [rng.choice(["a", "b", "c", "d"]) for _ in range(200)]
+        t = DriftTracker()
+        for a in answers:
+            t.update("m", "C0", "c1", a)
+        d = t.get("m", "C0", "c1")
+
+        counts = Counter(answers)
+        n = len(answers)
+        entropy = -sum(c / n * math.log2(c / n) for c in counts.values())
+        flips = sum(1 for x, y in zip(answers, answers[1:]) if x != y)
+
+        self.assertAlmostEqual(d.entropy_bits, entropy, places=9)
+        self.assertAlmostEqual(d.inconsistency, 1 - max(counts.values()) / n)
+        self.assertAlmostEqual(d.flip_rate, flips / (n - 1))
+
+    def test_bounded_distinct_answers(self):
+        t = DriftTracker(max_distinct=2)
+        for a in ["a", "b", "c", "d", "a"]:
+            t.update("m", "C0", "c1", a)
+        d = t.get("m", "C0", "c1")
+        self.assertEqual(len(d.counts), 2)
+        self.assertEqual(d.overflow, 2)
+        self.assertEqual(d.modal_count, 2)
+
+    def test_bounded_keys(self):
+        t = DriftTracker(max_keys=2)
+        for case_id in ["c1", "c2", "c3", "c1", "c3"]:
+            t.update("m", "C0", case_id, "391")
+        self.assertEqual(len(t.distributions), 2)
+        self.assertIsNone(t.get("m", "C0", "c3"))
+        self.assertEqual(t.get("m", "C0", "c1").observations, 2)
+        self.assertEqual(t.dropped, 2)
+        with self.assertRaises(ValueError):
+            DriftTracker(max_keys=0)
+
+    def test_cross_condition_drift(self):
+        t = DriftTracker()
+        for condition, answers in [("C0", ["391", "391", "390", "391"]), ("R1", ["390", "390", "391", "390"])]:
+            for a in answers:
+                t.update("m", condition, "c1", a)
+        for condition in ("C0", "R1", "R2"):
+            for _ in range(2):
+                t.update("m", condition, "c2", "Paris")
+        t.update("m", "R2", "c1", "391")
+
+        # c1: {391: 3/4, 390: 1/4} vs {391: 1/4, 390: 3/4} -> TV 1/2.
+        self.assertAlmostEqual(t.condition_drift("m", "c1", "C0", "R1"), 0.5)
+        self.assertEqual(t.condition_drift("m", "c2", "C0", "R1"), 0.0)
+        self.assertIsNone(t.condition_drift("m", "c3", "C0", "R1"))
+
+        s = t.cross_condition_summary()
+        self.assertEqual(set(s), {"m/C0->R1", "m/C0->R2"})
+        r1 = s["m/C0->R1"]
+        self.assertEqual(r1["cases"], 2)
+        self.assertAlmostEqual(r1["total_variation"], 0.25)
+        self.assertEqual(r1["modal_change_share"], 0.5)
+        self.assertEqual(r1["drifted_case_share"], 0.5)
+        r2 = s["m/C0->R2"]
+        self.assertAlmostEqual(r2["total_variation"], 0.25 / 2)
+        self.assertEqual(r2["modal_change_share"], 0.0)
+
+        by_r1 = t.cross_condition_summary(baseline="R1")
+        self.assertAlmostEqual(by_r1["m/R1->C0"]["total_variation"], 0.25)
+        self.assertEqual(t.cross_condition_summary(baseline="X"), {})
+
+    def test_attempt_records_and_summary(self):
+        t = DriftTracker()
+        records = [
+            {"requestedModel": "m", "conditionId": "C0", "caseId": "c1", "visibleOutput": "391"},
+            {"requestedModel": "m", "conditionId": "C0", "caseId": "c1", "visibleOutput": "390"},
+            {"requestedModel": "m", "conditionId": "C0", "caseId": "c2", "visibleOutput": "Paris"},
+            {"requestedModel": "m", "conditionId": "C0", "caseId": "c2", "error": {"code": 500}},
+        ]
+        for r in records:
+            t.update_attempt(r)
+
+        s = t.summary()["m/C0"]
+        self.assertEqual(s["cases"], 2)
+        self.assertEqual(s["observations"], 3)
+        self.assertEqual(s["unstable_case_share"], 0.5)
+        self.assertAlmostEqual(s["inconsistency_rate"], 0.25)
+
+
+if __name__ == "__main__":
+    unittest.main()
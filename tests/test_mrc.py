@@ -0,0 +1,90 @@
+import random
+import unittest
+
+from benchmarks.benchmark_memory_gate_savings import generate_workload, run_benchmark
+from src.razor.mrc import capacity_grid, miss_ratio_curve, savings_curve, shards_sample, stack_distances
+
+try:
+    import numpy as np
+    HAVE_NUMPY = True
+except ImportError:
+    HAVE_NUMPY = False
+
+
+def lru_hits(ids, capacity):
+    # Reference LRU: the stack position of each request, counted the slow way.
+    stack, hits = [], 0
+    for q in ids:
+        if q in stack:
+            if stack.index(q) < capacity:
+                hits += 1
+            stack.remove(q)
+        stack.insert(0, q)
+    return hits
+
+
+class TestStackDistances(unittest.TestCase):
+    def test_distances(self):
+        self.assertEqual(stack_distances(list("abcabac")), [-1, -1, -1, 2, 2, 1, 2])
+        self.assertEqual(stack_distances(["x", "x", "x"]), [-1, 0, 0])
+        self.assertEqual(stack_distances([]), [])
+
+    def test_curve_matches_reference_lru(self):
+        rng = random.Random(3)
+        ids = [int(rng.paretovariate(1.0)) % 60 for _ in range(2_000)]
+        mrc = miss_ratio_curve(ids)
+        self.assertEqual(mrc.references, 2_000)
+        self.assertEqual(mrc.cold_misses, len(set(ids)))
+        for c in (0, 1, 2, 5, 17, 60, 100):
+            self.assertEqual(mrc.hits(c), lru_hits(ids, c), c)
+        self.assertEqual(mrc.hits(mrc.max_useful_capacity), 2_000 - len(set(ids)))
+        self.assertLess(mrc.hits(mrc.max_useful_capacity - 1), mrc.hits(mrc.max_useful_capacity))
+
+    def test_curve_matches_memory_bank_simulation(self):
+        queries = generate_workload(5_000, 800, seed=11)
+        mrc = miss_ratio_curve(queries)
+        for capacity in (1, 50, 400, 799, 800):
+            r = run_benchmark(5_000, 800, capacity, 0.95, 1_000, 100, seed=11)
+            self.assertEqual(mrc.hits(capacity), r["memory_hits"], capacity)
+
+
+class TestSharding(unittest.TestCase):
+    def test_sample_keeps_whole_queries(self):
+        ids = [i % 500 for i in range(20_000)]
+        sampled = shards_sample(ids, 0.1, seed=4)
+        self.assertTrue(0.05 < len(set(sampled)) / 500 < 0.15)
+        self.assertEqual(len(sampled), 40 * len(set(sampled)))
+        self.assertEqual(sampled, shards_sample(ids, 0.1, seed=4))
+        with self.assertRaises(ValueError):
+            shards_sample(ids, 0.0)
+
+    @unittest.skipUnless(HAVE_NUMPY, "numpy not installed")
+    def test_sampled_curve_tracks_exact_curve(self):
+        from src.razor import workloads
+
+        ids = workloads.zipf(200_000, 20_000, alpha=0.9, seed=5)
+        exact = miss_ratio_curve(ids)
+        approx = miss_ratio_curve(ids, sample_rate=0.1, seed=1)
+        # SHARDS is only meaningful above ~10 / rate distinct queries.
+        for c in (1_000, 5_000, 20_000):
+            self.assertAlmostEqual(approx.hit_rate(c), exact.hit_rate(c), delta=0.03)
+
+
+class TestSavingsCurve(unittest.TestCase):
+    def test_grid_and_savings(self):
+        grid = capacity_grid(1_000, 8)
+        self.assertEqual((grid[0], grid[-1]), (1, 1_000))
+        self.assertEqual(grid, sorted(set(grid)))
+        self.assertEqual(capacity_grid(0), [])
+        self.assertEqual(capacity_grid(5, 1), [5])
+
+        mrc = miss_ratio_curve(["a", "b", "a", "b"])
+        rows = savings_curve(mrc, [1, 2], tokens_per_inference=100, ms_per_inference=10)
+        self.assertEqual([r["memory_hits"] for r in rows], [0, 2])
+        self.assertEqual(rows[1]["razor_inferences"], 2)
+        self.assertEqual(rows[1]["token_savings"], 200)
+        self.assertAlmostEqual(rows[1]["latency_reduction"], 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+
+from src.razor import queueing
+from src.razor.memory_bank import RazorMemoryBank
+
+
+class TestArrivalsAndService(unittest.TestCase):
+    def test_rates_and_means(self):
+        for process in queueing.ARRIVALS:
+            t = queueing.arrival_times(50_000, 200.0, process, seed=1, burst_period_ms=500.0)
+            self.assertEqual(t, sorted(t), process)
+            self.assertAlmostEqual(len(t) / t[-1] * 1000.0, 200.0, delta=10.0, msg=process)
+        self.assertEqual(queueing.arrival_times(3, 1000.0, "constant"), [0.0, 1.0, 2.0])
+        self.assertEqual(queueing.arrival_times(100, 5.0, seed=2), queueing.arrival_times(100, 5.0, seed=2))
+
+        for dist in queueing.SERVICES:
+            s = queueing.service_times(50_000, 40.0, dist, cv=2.0, seed=3)
+            self.assertAlmostEqual(sum(s) / len(s), 40.0, delta=2.0, msg=dist)
+
+        with self.assertRaises(ValueError):
+            queueing.arrival_times(10, 1.0, "gaussian")
+        with self.assertRaises(ValueError):
+            queueing.service_times(10, 0.0)
+
+    def test_latency_summary(self):
+        summary = queueing.latency_summary([float(i) for i in range(100, 0, -1)])
+        self.assertEqual((summary["p50"], summary["p95"], summary["p99"], summary["max"]), (50.0, 95.0, 99.0, 100.0))
+        self.assertEqual(queueing.latency_summary([])["p99"], 0.0)
+
+
+class TestSimulation(unittest.TestCase):
+    def test_mm1_mean_wait_matches_theory(self):
+        # M/M/1 at rho = 0.8: mean queueing delay rho / (mu - lambda) = 4 ms.
+        n = 200_000
+        arrivals = queueing.arrival_times(n, 800.0, seed=5)
+        service = queueing.service_times(n, 1.0, "exponential", seed=6)
+        r = queueing.simulate(list(range(n)), arrivals, service, servers=1)
+        self.assertAlmostEqual(r["mean_wait_ms"], 4.0, delta=0.6)
+        self.assertAlmostEqual(r["utilization"], 0.8, delta=0.02)
+        self.assertEqual(r["events"], 3 * n)
+
+    def test_no_queueing_with_enough_servers(self):
+        arrivals = queueing.arrival_times(1_000, 100.0, "constant")
+        r = queueing.simulate(["q"] * 1_000, arrivals, [25.0] * 1_000, servers=3)
+        self.assertEqual(r["mean_wait_ms"], 0.0)
+        self.assertEqual(r["latency_ms"]["p99"], 25.0)
+
+    def test_gate_stores_on_completion(self):
+        bank = RazorMemoryBank(capacity=10, stability_threshold=0.95)
+        # "a" repeats while its first inference is still running, then after it finished.
+        r = queueing.simulate(["a", "a", "a"], [0.0, 5.0, 20.0], [10.0, 10.0, 10.0], 2, bank, gate_ms=0.5)
+        self.assertEqual(r["memory_hits"], 1)
+        self.assertEqual(r["inferences"], 2)
+        self.assertEqual(r["latency_ms"]["max"], 10.5)
+        self.assertEqual(r["latency_ms"]["p50"], 10.5)
+        self.assertEqual(r["latency_ms"]["mean"], (10.5 + 10.5 + 0.5) / 3)
+
+        with self.assertRaises(ValueError):
+            queueing.simulate(["a"], [0.0], [1.0], servers=0)
+
+    def test_per_query_confidences_gate_stores(self):
+        bank = RazorMemoryBank(capacity=10, stability_threshold=0.95)
+        queries = ["sure", "unsure", "sure", "unsure"]
+        confidences = {"sure": 0.99, "unsure": 0.5}
+        r = queueing.simulate(queries, [0.0, 1.0, 20.0, 21.0], [5.0] * 4, 2, bank, confidences=confidences)
+        self.assertEqual(r["memory_hits"], 1)
+        self.assertEqual(r["inferences"], 3)
+        self.assertEqual(bank.get_stats()["rejected"], 1)
+
+    def test_compare_gates_the_same_traffic(self):
+        n = 20_000
+        queries = [f"query_{i % 50}" for i in range(n)]
+        arrivals = queueing.arrival_times(n, 150.0, seed=7)
+        service = queueing.service_times(n, 50.0, "lognormal", cv=1.5, seed=8)
+        bank = RazorMemoryBank(capacity=100, stability_threshold=0.95)
+        r = queueing.compare(queries, arrivals, service, 8, bank, gate_ms=0.002)
+        base, razor = r["baseline"], r["razor"]
+        self.assertEqual(base["memory_hits"], 0)
+        self.assertGreater(razor["memory_hit_rate"], 0.99)
+        self.assertLess(razor["latency_ms"]["p99"], base["latency_ms"]["p99"])
+        self.assertLess(razor["utilization"], base["utilization"])
+        self.assertEqual(r["events"], base["events"] + razor["events"])
+
+
+if __name__ == "__main__":
+    unittest.main()
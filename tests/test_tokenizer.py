@@ -0,0 +1,55 @@
+import unittest
+
+from src.razor.tokenizer import PROXY_IDENTITY, TokenCounter, proxy_token_count, proxy_token_counts
+
+
+class WordEncoder:
+    """Whitespace 'tokenizer' that records how many texts it encoded."""
+
+    name = "words"
+
+    def __init__(self):
+        self.encoded = 0
+
+    def encode(self, text):
+        self.encoded += 1
+        return text.split()
+
+    def encode_batch(self, texts):
+        return [self.encode(t) for t in texts]
+
+
+class TestTokenCounter(unittest.TestCase):
+    def test_proxy_batch_matches_scalar(self):
+        texts = ["", "a", "abcd", "abcde", "x" * 401, None]
+        self.assertEqual(proxy_token_counts(texts), [proxy_token_count(t) for t in texts])
+        self.assertEqual(TokenCounter().count_batch(texts), proxy_token_counts(texts))
+        self.assertEqual(TokenCounter().identity, PROXY_IDENTITY)
+
+    def test_repeated_texts_encoded_once(self):
+        enc = WordEncoder()
+        counter = TokenCounter("words", enc)
+
+        self.assertEqual(counter.count_batch(["a b", "c", "a b"]), [2, 1, 2])
+        self.assertEqual(counter.count_batch(["c", "a b c"]), [1, 3])
+        self.assertEqual(enc.encoded, 3)
+
+        stats = counter.get_stats()
+        self.assertEqual(stats["identity"], "tiktoken:words")
+        self.assertEqual((stats["hits"], stats["misses"]), (2, 3))
+
+    def test_memo_is_bounded(self):
+        enc = WordEncoder()
+        counter = TokenCounter("words", enc, memo_size=2)
+        counter.count_batch(["a", "b", "c"])
+        counter.count("a")
+        self.assertEqual(enc.encoded, 4)
+        self.assertEqual(counter.get_stats()["memo_size"], 2)
+
+    def test_rejects_negative_memo(self):
+        with self.assertRaises(ValueError):
+            TokenCounter(memo_size=-1)
+
+
+if __name__ == "__main__":
+    unittest.main()
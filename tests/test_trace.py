@@ -0,0 +1,125 @@
+import json
+import os
+import random
+import tempfile
+import unittest
+
+from src.razor.controller import PhaseBudget, RazorController, SolveResult
+from src.razor.trace import JsonlFileSink, MultiSink, RingBufferSink, RunScorerSink, StepRecord
+
+try:
+    import numpy  # noqa: F401
+    from razor_metrics.rdm import OnlineRDM, compute_rdm
+    HAVE_NUMPY = True
+except ImportError:
+    HAVE_NUMPY = False
+
+
+def solver(query, sub_results, cancel):
+    return SolveResult(solution=f"ans({query})", confidence=0.99, tokens=len(query))
+
+
+def embedder(query):
+    return [float(len(query)), float(query.count("/")) + 1.0, 1.0]
+
+
+def record(run_id=0, step=0):
+    return StepRecord(
+        run_id=run_id, step=step, query="q", source="solver", depth=0,
+        cost=1.0, memory_similarity=0.0, violations=0, progress=1.0,
+    )
+
+
+class TestTraceSinks(unittest.TestCase):
+    def test_ring_buffer_keeps_latest(self):
+        sink = RingBufferSink(capacity=3)
+        for i in range(5):
+            sink.emit(record(step=i))
+        self.assertEqual([r.step for r in sink.records], [2, 3, 4])
+
+    def test_jsonl_sink_writes_lines(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "trace.jsonl")
+            sink = JsonlFileSink(path)
+            sink.emit(record(step=0))
+            sink.emit(record(step=1))
+            sink.close()
+
+            with open(path, encoding="utf-8") as f:
+                rows = [json.loads(line) for line in f]
+        self.assertEqual([r["step"] for r in rows], [0, 1])
+        self.assertEqual(rows[0]["source"], "solver")
+
+    def test_controller_emits_one_step_per_resolution(self):
+        ring = RingBufferSink()
+        subs = {"p": ["a", "b"]}
+        ctl = RazorController(solver, decomposer=lambda q: subs.get(q, []), trace_sink=ring)
+
+        ctl.run("p")
+        ctl.run("p")
+
+        steps = ring.records
+        self.assertEqual([(r.run_id, r.query, r.source) for r in steps], [
+            (0, "a", "solver"), (0, "b", "solver"), (0, "p", "solver"), (1, "p", "memory"),
+        ])
+        self.assertEqual(steps[2].cost, 1)
+        self.assertEqual(steps[3].cost, 0)
+        self.assertEqual(steps[3].memory_similarity, 1.0)
+        self.assertEqual([r.step for r in steps], [0, 1, 2, 0])
+
+    def test_budget_termination_emits_violation(self):
+        ring = RingBufferSink()
+        ctl = RazorController(
+            solver,
+            budgets={"expression": PhaseBudget(max_tokens=0)},
+            trace_sink=ring,
+        )
+        ctl.run("q")
+        self.assertEqual(len(ring.records), 1)
+        self.assertEqual(ring.records[0].source, "budget")
+        self.assertEqual(ring.records[0].violations, 1)
+
+
+@unittest.skipUnless(HAVE_NUMPY, "numpy not installed")
+class TestOnlineRDM(unittest.TestCase):
+    def test_matches_batch_compute_rdm(self):
+        rng = random.Random(7)
+        steps = [
+            {
+                "embedding": [rng.uniform(-1, 1) for _ in range(8)],
+                "cost": rng.uniform(0, 5),
+                "memory_similarity": rng.random(),
+                "violations": rng.choice([0, 0, 1]),
+                "progress": rng.uniform(-1, 1),
+            }
+            for _ in range(50)
+        ]
+
+        online = OnlineRDM()
+        for s in steps:
+            online.update(dict(s))
+        batch = compute_rdm([dict(s) for s in steps])
+
+        for k, v in batch.items():
+            self.assertAlmostEqual(online.result()[k], v, places=9)
+
+    def test_controller_scores_runs_live(self):
+        scores = RunScorerSink(OnlineRDM)
+        ring = RingBufferSink()
+        subs = {"p": ["a", "a//b", "c"]}
+        ctl = RazorController(
+            solver,
+            decomposer=lambda q: subs.get(q, []),
+            trace_sink=MultiSink(ring, scores),
+            embedder=embedder,
+        )
+        ctl.run("p")
+
+        live = scores.scorer(0).result()
+        batch = compute_rdm([r.to_dict() for r in ring.records])
+        self.assertAlmostEqual(live["RDM"], batch["RDM"])
+        self.assertAlmostEqual(live["C_T"], 4 + 1 + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import unittest
+
+from src.razor import workloads
+
+try:
+    import numpy as np
+    HAVE_NUMPY = True
+except ImportError:
+    HAVE_NUMPY = False
+
+ATTEMPTS = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "results", "v0.1.0", "runs", "rr-brp-0.1.0-2026-08-17T11-22-19-303Z", "raw", "attempts.jsonl",
+)
+
+
+@unittest.skipUnless(HAVE_NUMPY, "numpy not installed")
+class TestGenerators(unittest.TestCase):
+    def test_every_generator_is_deterministic_int64_in_range(self):
+        for kind in workloads.WORKLOADS:
+            a = workloads.generate(kind, 5_000, 300, seed=7)
+            self.assertEqual((a.dtype, a.shape), (np.int64, (5_000,)), kind)
+            self.assertTrue(np.array_equal(a, workloads.generate(kind, 5_000, 300, seed=7)), kind)
+            self.assertGreaterEqual(a.min(), 0, kind)
+            if kind != "scan":
+                self.assertLess(a.max(), 300, kind)
+        with self.assertRaises(ValueError):
+            workloads.generate("bursty", 10, 10)
+
+    def test_zipf_matches_target_distribution(self):
+        ranks = workloads.zipf_ranks(400_000, 100, 1.2, np.random.default_rng(1))
+        p = np.arange(1, 101, dtype=np.float64) ** -1.2
+        p /= p.sum()
+        observed = np.bincount(ranks, minlength=100) / len(ranks)
+        self.assertLess(np.abs(observed - p).max(), 0.005)
+        # alpha = 0 is uniform
+        flat = workloads.zipf_ranks(200_000, 10, 0.0, np.random.default_rng(2))
+        self.assertLess(np.abs(np.bincount(flat) / 200_000 - 0.1).max(), 0.01)
+
+    def test_temporal_locality_repeats_recent_queries(self):
+        a = workloads.temporal_locality(50_000, 10_000, reuse=0.6, window=10, alpha=0.0, seed=3)
+        recent = np.zeros(len(a), dtype=bool)
+        for d in range(1, 11):
+            recent[d:] |= a[d:] == a[:-d]
+        self.assertGreater(recent.mean(), 0.6)
+        b = workloads.temporal_locality(50_000, 10_000, reuse=0.0, window=10, alpha=0.0, seed=3)
+        self.assertLess(np.mean(b[1:] == b[:-1]), 0.01)
+
+    def test_working_set_shift_moves_between_phases(self):
+        a = workloads.working_set_shift(10_000, 5_000, working_set=100, phases=4, overlap=0.25, seed=4)
+        phases = [set(p.tolist()) for p in np.split(a, 4)]
+        self.assertTrue(all(len(p) <= 100 for p in phases))
+        self.assertEqual(len(phases[0] & phases[2]), 0)
+        self.assertGreater(len(phases[0] & phases[1]), 0)
+
+    def test_scans_are_one_hit_wonders(self):
+        a = workloads.scan_burst(2_500, 50, scan_length=100, scan_every=400, seed=5)
+        scanned = a[a >= 50]
+        self.assertEqual(len(scanned), 500)
+        self.assertEqual(len(np.unique(scanned)), 500)
+        self.assertTrue(np.all(a[400:500] >= 50))
+
+    def test_diurnal_hot_set_turns_over(self):
+        a = workloads.diurnal(200_000, 1_000, period=100_000, alpha=1.5, seed=6)
+        day, night = a[:5_000], a[47_500:52_500]
+        top_day = np.bincount(day, minlength=1_000).argmax()
+        top_night = np.bincount(night, minlength=1_000).argmax()
+        self.assertNotEqual(top_day, top_night)
+
+
+@unittest.skipUnless(HAVE_NUMPY, "numpy not installed")
+class TestTraceReplay(unittest.TestCase):
+    def test_attempts_log_replay(self):
+        trace = workloads.load_trace(ATTEMPTS)
+        self.assertEqual((len(trace.ids), trace.unique), (72, 4))
+        self.assertEqual(trace.keys[int(trace.ids[0])], "eval-001-math")
+
+        per_model = workloads.load_trace(ATTEMPTS, key=("requestedModel", "caseId"))
+        self.assertEqual(per_model.unique, 12)
+        looped = per_model.replay(200)
+        self.assertEqual(len(looped), 200)
+        self.assertTrue(np.array_equal(looped[72:144], per_model.ids))
+        self.assertEqual(workloads.query_names(looped[:2]), [f"query_{i}" for i in looped[:2].tolist()])
+
+    def test_records_filter_and_missing_keys(self):
+        records = [{"q": "a"}, {"q": "b", "skip": True}, {"other": 1}, {"q": "a"}, {"q": "c"}]
+        trace = workloads.trace_from_records(records, key="q", where=lambda r: not r.get("skip"))
+        self.assertEqual((trace.ids.tolist(), trace.keys), ([0, 0, 1], ["a", "c"]))
+
+
+if __name__ == "__main__":
+    unittest.main()